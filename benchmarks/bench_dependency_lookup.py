@@ -0,0 +1,93 @@
+"""
+Benchmark: per-dependency Weaviate lookups vs. one bulk lookup per run.
+
+Uses Haystack's InMemoryDocumentStore as a stand-in for Weaviate and counts
+filter_documents round trips. Against a real Weaviate server, each round
+trip also pays network latency, so the difference in wall time is larger
+than what is shown here.
+
+Usage:
+    python -m benchmarks.bench_dependency_lookup --endpoints 400 --deps 4 --services 200
+"""
+
+import argparse
+import random
+import time
+
+from haystack.dataclasses import Document
+from haystack.document_stores.in_memory import InMemoryDocumentStore
+
+from src.utils.weaviate_utils import fetch_by_method_name, fetch_by_method_names
+
+
+class CountingStore:
+    """Wraps a document store and counts filter_documents round trips."""
+
+    def __init__(self, store, latency_ms: float = 0.0):
+        self.store = store
+        self.latency = latency_ms / 1000.0
+        self.round_trips = 0
+
+    def filter_documents(self, filters=None):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.store.filter_documents(filters=filters)
+
+
+def build_store(services: int) -> InMemoryDocumentStore:
+    store = InMemoryDocumentStore()
+    store.write_documents([
+        Document(
+            content=f"Class: Service{i % 20}\nMethod: method{i}\n\nmethod{i}() {{ ... }}",
+            meta={"type": "ast_method", "method_name": f"method{i}", "class_name": f"Service{i % 20}"}
+        )
+        for i in range(services)
+    ])
+    return store
+
+
+def build_endpoints(endpoints: int, deps: int, services: int):
+    rng = random.Random(42)
+    return [
+        [f"service.method{rng.randrange(services)}" for _ in range(deps)]
+        for _ in range(endpoints)
+    ]
+
+
+def per_dependency(store, endpoint_deps):
+    for deps in endpoint_deps:
+        for dep in deps:
+            fetch_by_method_name(store, dep.split(".")[-1])
+
+
+def bulk_memoized(store, endpoint_deps):
+    memo = fetch_by_method_names(store, {dep.split(".")[-1] for deps in endpoint_deps for dep in deps})
+    for deps in endpoint_deps:
+        for dep in deps:
+            memo[dep.split(".")[-1]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=400)
+    parser.add_argument("--deps", type=int, default=4, help="dependencies per endpoint")
+    parser.add_argument("--services", type=int, default=200, help="distinct service methods")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated round-trip latency")
+    args = parser.parse_args()
+
+    store = build_store(args.services)
+    endpoint_deps = build_endpoints(args.endpoints, args.deps, args.services)
+
+    print(f"{args.endpoints} endpoints x {args.deps} deps over {args.services} service methods, "
+          f"{args.latency_ms}ms simulated latency")
+    for name, strategy in (("per-dependency", per_dependency), ("bulk+memo", bulk_memoized)):
+        counting = CountingStore(store, args.latency_ms)
+        start = time.perf_counter()
+        strategy(counting, endpoint_deps)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>15}: {counting.round_trips:6d} round trips  {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: cold (build per query) vs. warm (shared, pre-warmed) RAG query pipeline.
+
+By default the embedder, ranker and generator are replaced with stand-in
+components whose warm_up() sleeps for a model load time and whose run()
+sleeps for an inference time, so the benchmark runs without models,
+Weaviate or an LLM. Pass --real to time the actual RAGService pipeline
+against the configured services instead.
+
+Usage:
+    python -m benchmarks.bench_query_pipeline --queries 20 --load-ms 1500 --infer-ms 20
+    python -m benchmarks.bench_query_pipeline --real --queries 5
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from haystack import Pipeline, component
+from haystack.dataclasses import Document
+
+from src.pipelines.rag import RAGService
+
+
+class SimulatedModel:
+    """Stand-in for a model-backed component: slow warm_up, fixed inference time."""
+
+    def __init__(self, load_ms: float, infer_ms: float):
+        self.load = load_ms / 1000.0
+        self.infer = infer_ms / 1000.0
+        self.loaded = False
+
+    def warm_up(self):
+        if not self.loaded:
+            time.sleep(self.load)
+            self.loaded = True
+
+    def _infer(self):
+        if not self.loaded:
+            self.warm_up()
+        time.sleep(self.infer)
+
+
+@component
+class SimulatedEmbedder(SimulatedModel):
+    @component.output_types(documents=List[Document])
+    def run(self, text: str):
+        self._infer()
+        return {"documents": [Document(content=f"context for {text}")]}
+
+
+@component
+class SimulatedRanker(SimulatedModel):
+    @component.output_types(documents=List[Document])
+    def run(self, query: str, documents: List[Document]):
+        self._infer()
+        return {"documents": documents}
+
+
+@component
+class SimulatedPromptBuilder:
+    @component.output_types(prompt=str)
+    def run(self, query: str, documents: List[Document]):
+        return {"prompt": "\n".join(doc.content for doc in documents) + f"\n{query}"}
+
+
+@component
+class SimulatedGenerator(SimulatedModel):
+    @component.output_types(replies=List[str])
+    def run(self, prompt: str):
+        self._infer()
+        return {"replies": [f"answer to {prompt.splitlines()[-1]}"]}
+
+
+class SimulatedRAGService(RAGService):
+    """RAGService whose query pipeline uses simulated components."""
+
+    def __init__(self, load_ms: float, infer_ms: float):
+        self.load_ms = load_ms
+        self.infer_ms = infer_ms
+
+    def _build_query_pipeline(self) -> Pipeline:
+        pipeline = Pipeline()
+        pipeline.add_component("text_embedder", SimulatedEmbedder(self.load_ms, self.infer_ms))
+        pipeline.add_component("reranker", SimulatedRanker(self.load_ms, self.infer_ms))
+        pipeline.add_component("prompt_builder", SimulatedPromptBuilder())
+        pipeline.add_component("generator", SimulatedGenerator(0, self.infer_ms))
+        pipeline.connect("text_embedder.documents", "reranker.documents")
+        pipeline.connect("reranker.documents", "prompt_builder.documents")
+        pipeline.connect("prompt_builder.prompt", "generator.prompt")
+        return pipeline
+
+
+def time_queries(service: RAGService, queries: List[str], cold: bool) -> List[float]:
+    latencies = []
+    for query in queries:
+        if cold:
+            RAGService.reset_query_pipeline()
+        start = time.perf_counter()
+        service.search_and_generate(query)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: List[float]):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:>18}: p50 {statistics.median(ordered) * 1000:9.1f} ms  p95 {p95 * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4, help="concurrent callers for the warm run")
+    parser.add_argument("--load-ms", type=float, default=1500.0, help="simulated model load time")
+    parser.add_argument("--infer-ms", type=float, default=20.0, help="simulated inference time per component")
+    parser.add_argument("--real", action="store_true", help="benchmark the real RAGService pipeline")
+    args = parser.parse_args()
+
+    service = RAGService() if args.real else SimulatedRAGService(args.load_ms, args.infer_ms)
+    queries = [f"How does endpoint {i} authenticate?" for i in range(args.queries)]
+
+    print(f"{args.queries} queries, {'real services' if args.real else f'{args.load_ms}ms load / {args.infer_ms}ms inference'}")
+    report("cold (per query)", time_queries(service, queries, cold=True))
+
+    RAGService.reset_query_pipeline()
+    start = time.perf_counter()
+    service.get_query_pipeline()
+    print(f"{'one-time warm-up':>18}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+    report("warm (shared)", time_queries(service, queries, cold=False))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(service.search_and_generate, queries))
+    elapsed = time.perf_counter() - start
+    print(f"{'warm, ' + str(args.threads) + ' threads':>18}: {args.queries / elapsed:9.1f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
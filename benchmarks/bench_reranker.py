@@ -0,0 +1,110 @@
+"""
+Benchmark: CPU reranking latency against a latency budget.
+
+Compares reranking every retrieved candidate with BudgetedReranker's
+pre-pruning, int8 and adaptive-budget modes. By default the cross-encoder
+is simulated with a per-forward-pass overhead plus a per-pair cost (int8
+is modelled as a fixed speed-up), so the benchmark runs without torch.
+Pass --real to load the actual cross-encoder on CPU instead (requires
+sentence-transformers).
+
+Usage:
+    python -m benchmarks.bench_reranker --candidates 50 --budget-ms 300
+    python -m benchmarks.bench_reranker --real --queries 10
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from haystack import Document
+
+from src.components.BudgetedReranker import BudgetedReranker
+
+
+class SimulatedCrossEncoder:
+    """Cost model of a cross-encoder on CPU: fixed cost per batch plus cost per pair."""
+
+    def __init__(self, pass_ms: float, pair_ms: float, batch_size: int, speedup: float = 1.0):
+        self.pass_ms = pass_ms
+        self.pair_ms = pair_ms
+        self.batch_size = batch_size
+        self.speedup = speedup
+
+    def run(self, query: str, documents: List[Document], top_k: int):
+        passes = -(-len(documents) // self.batch_size)
+        time.sleep((passes * self.pass_ms + len(documents) * self.pair_ms) / self.speedup / 1000.0)
+        ranked = sorted(documents, key=lambda doc: hash((query, doc.content)))
+        return {"documents": ranked[:top_k]}
+
+
+def build_candidates(n: int, rng: random.Random) -> List[Document]:
+    return [Document(content=f"method{i}() {{ ... }}", score=rng.random()) for i in range(n)]
+
+
+def measure(reranker: BudgetedReranker, queries: int, candidates: int, rng: random.Random) -> List[float]:
+    latencies = []
+    for i in range(queries):
+        documents = build_candidates(candidates, rng)
+        start = time.perf_counter()
+        reranker.run(query=f"query {i}", documents=documents)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: List[float], budget_ms: float):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    verdict = "within budget" if p95 <= budget_ms else "OVER budget"
+    print(f"{name:>24}: p50 {statistics.median(ordered):8.1f} ms  p95 {p95:8.1f} ms  ({verdict})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--candidates", type=int, default=50, help="documents returned by the retriever")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--max-candidates", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--pass-ms", type=float, default=40.0, help="simulated cost per forward pass")
+    parser.add_argument("--pair-ms", type=float, default=12.0, help="simulated cost per (query, document) pair")
+    parser.add_argument("--int8-speedup", type=float, default=1.8, help="simulated int8 speed-up")
+    parser.add_argument("--real", action="store_true", help="use the real cross-encoder on CPU")
+    args = parser.parse_args()
+
+    def make(max_candidates: int, quantize: bool = False, budget: float = 0) -> BudgetedReranker:
+        ranker = None
+        if not args.real:
+            ranker = SimulatedCrossEncoder(
+                args.pass_ms, args.pair_ms, args.batch_size, args.int8_speedup if quantize else 1.0
+            )
+        reranker = BudgetedReranker(
+            device="cpu",
+            top_k=args.top_k,
+            batch_size=args.batch_size,
+            max_candidates=max_candidates,
+            quantize_int8=quantize,
+            latency_budget_ms=budget,
+            ranker=ranker
+        )
+        reranker.warm_up()
+        return reranker
+
+    modes = [
+        ("all candidates", make(args.candidates)),
+        ("pre-pruned", make(args.max_candidates)),
+        ("pre-pruned + int8", make(args.max_candidates, quantize=True)),
+        ("adaptive budget", make(args.candidates, budget=args.budget_ms)),
+    ]
+
+    print(f"{args.queries} queries x {args.candidates} candidates, top_k={args.top_k}, "
+          f"batch={args.batch_size}, budget={args.budget_ms}ms, {'real model' if args.real else 'simulated model'}")
+    for name, reranker in modes:
+        report(name, measure(reranker, args.queries, args.candidates, random.Random(7)), args.budget_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: embedded LocalDocumentStore (exact and IVF) vs. Weaviate, recall@k and query latency.
+
+Generates clustered synthetic embeddings (MiniLM-sized by default) and
+measures recall against exact cosine search together with p50/p95 query
+latency. Pass --weaviate-url to also load the same vectors into a scratch
+Weaviate collection and measure it; the collection is dropped afterwards.
+
+Usage:
+    python -m benchmarks.bench_vector_store --docs 50000 --dim 384
+    python -m benchmarks.bench_vector_store --docs 20000 --weaviate-url http://127.0.0.1:8080
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+import numpy as np
+from haystack import Document
+from haystack.document_stores.types import DuplicatePolicy
+
+from src.utils.local_document_store import LocalDocumentStore
+
+
+def build_vectors(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.35 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def build_documents(vectors: np.ndarray) -> List[Document]:
+    return [
+        Document(id=f"d{i}", content=f"method{i}() {{ ... }}", meta={"type": "ast_method"}, embedding=v.tolist())
+        for i, v in enumerate(vectors)
+    ]
+
+
+def load(store, documents: List[Document], batch: int = 1000) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(documents), batch):
+        store.write_documents(documents[i:i + batch], policy=DuplicatePolicy.OVERWRITE)
+    return time.perf_counter() - start
+
+
+def run_queries(search: Callable[[List[float]], List[Document]], queries: np.ndarray, truth: List[set], k: int):
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        hits = search(query.tolist())
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len({d.id for d in hits[:k]} & expected) / k)
+    return latencies, recalls
+
+
+def report(name: str, latencies: List[float], recalls: List[float], load_seconds: float):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:>14}: recall {statistics.mean(recalls):.3f}  p50 {statistics.median(ordered):7.2f} ms  "
+          f"p95 {p95:7.2f} ms  load {load_seconds:6.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--weaviate-url", default=None, help="also benchmark a Weaviate server")
+    args = parser.parse_args()
+
+    vectors = build_vectors(args.docs, args.dim, args.clusters)
+    documents = build_documents(vectors)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, args.docs, args.queries)] + 0.1 * rng.normal(size=(args.queries, args.dim))
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    truth = [
+        {f"d{i}" for i in np.argsort(-(normed @ (q / np.linalg.norm(q))))[:args.top_k]}
+        for q in queries
+    ]
+
+    print(f"{args.docs} docs x {args.dim} dims, {args.queries} queries, recall@{args.top_k}")
+    with tempfile.TemporaryDirectory() as exact_dir, tempfile.TemporaryDirectory() as ivf_dir:
+        exact = LocalDocumentStore(exact_dir, ivf_min_rows=args.docs + 1)
+        load_seconds = load(exact, documents)
+        report("local exact", *run_queries(
+            lambda q: exact._embedding_retrieval(q, top_k=args.top_k), queries, truth, args.top_k), load_seconds)
+
+        ivf = LocalDocumentStore(ivf_dir, nprobe=args.nprobe, ivf_min_rows=0)
+        load_seconds = load(ivf, documents)
+        start = time.perf_counter()
+        ivf.build_index()
+        load_seconds += time.perf_counter() - start
+        report(f"local ivf/{args.nprobe}", *run_queries(
+            lambda q: ivf._embedding_retrieval(q, top_k=args.top_k), queries, truth, args.top_k), load_seconds)
+
+    if args.weaviate_url:
+        from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
+
+        collection = "DocGenVectorBench"
+        store = WeaviateDocumentStore(url=args.weaviate_url, collection_settings={"class": collection})
+        try:
+            load_seconds = load(store, documents)
+            report("weaviate", *run_queries(
+                lambda q: store._embedding_retrieval(q, top_k=args.top_k), queries, truth, args.top_k), load_seconds)
+        finally:
+            store.client.collections.delete(collection)
+
+
+if __name__ == "__main__":
+    main()
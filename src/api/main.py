@@ -1,131 +1,170 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import json
+import time
+import uuid
 import uvicorn
 
-from src.services.input_handler import InputHandler
 from src.services.framework_detector import FrameworkDetector
 # from src.pipelines.rag import RAGService
 from src.services.generator import DocGenerator
-from src.core.config import settings
+from src.core.config import settings, get_app_config
 # from src.utils.ast_extractor import process_directory
-from src.components.extractor.ast_extractor import ASTExtractor
-from src.components.CodeMapper import CodeMapper
-import yaml
-import os
-import json
+from src.services.job_queue import JobQueue, QueueFullError, TERMINAL_STATUSES
+from src.services.worker_pool import WorkerPool, job_queue_from_config
+from src.services.result_cache import request_key, result_cache_from_config
+from src.services.git_mirror import is_valid_ref
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs run in worker processes so heavy extraction never blocks the API
+    pool = None
+    config = get_app_config()
+    if config.get('jobs.embedded_workers', True):
+        pool = WorkerPool(config=config)
+        pool.start()
+    try:
+        yield
+    finally:
+        if pool is not None:
+            pool.stop()
+
 
-app = FastAPI(title="DocGen RAG Service")
+app = FastAPI(title="DocGen RAG Service", lifespan=lifespan)
 
 class GenerateRequest(BaseModel):
     source_type: str # 'git' or 'local'
     path: str
     credentials: Optional[str] = None
+    base_commit: Optional[str] = None # previously processed commit SHA, enables incremental mode (git only)
+    ref: Optional[str] = None # branch, tag or commit to document (git only), default: remote HEAD
+    priority: int = 0 # higher runs first
 
-from typing import Dict, Any
-import uuid
+# Durable job queue shared with the worker processes, opened once per API process
+_job_queue: Optional[JobQueue] = None
 
-# In-memory job store
-job_store: Dict[str, Dict[str, Any]] = {}
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = job_queue_from_config(get_app_config())
+    return _job_queue
 
 @app.post("/generate")
-async def trigger_generation(request: GenerateRequest, background_tasks: BackgroundTasks):
+def trigger_generation(request: GenerateRequest):
     """
-    Triggers the documentation process in the background.
+    Queues the documentation process for a worker.
     Returns a job_id to track the status.
+
+    Identical requests (same source, revision, base commit and config) share
+    one job: they attach to the one already queued or running, or are
+    answered from the result cache once it completed.
     """
-    job_id = str(uuid.uuid4())
-    job_store[job_id] = {"status": "processing", "message": "Documentation is being generated."}
-    
-    background_tasks.add_task(process_documentation, request.source_type, request.path, request.credentials, job_id)
-    return {"job_id": job_id, "status": "processing", "message": "Documentation generation started."}
+    if request.ref is not None and not is_valid_ref(request.ref):
+        raise HTTPException(status_code=400, detail=f"Invalid git ref: {request.ref}")
+
+    config = get_app_config()
+    payload = {
+        "source_type": request.source_type,
+        "path": request.path,
+        "credentials": request.credentials,
+        "base_commit": request.base_commit,
+        "ref": request.ref
+    }
+    queue = get_job_queue()
+
+    dedup_key = None
+    if config.get('jobs.coalesce', True):
+        resolved = request_key(
+            request.source_type, request.path, request.credentials, request.base_commit, config, ref=request.ref
+        )
+        if resolved:
+            dedup_key, payload["revision"] = resolved
+            payload["dedup_key"] = dedup_key
+            cached = result_cache_from_config(config).get(dedup_key)
+            if cached:
+                job_id = queue.add_completed(payload, {**cached, "cached": True}, dedup_key=dedup_key)
+                return {"job_id": job_id, "status": "completed", "message": "Served from the result cache."}
+
+    new_job_id = str(uuid.uuid4())
+    try:
+        job_id = queue.enqueue(payload, priority=request.priority, job_id=new_job_id, dedup_key=dedup_key)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    if job_id != new_job_id:
+        return {"job_id": job_id, "status": "coalesced", "message": "Attached to an identical job in progress."}
+    return {"job_id": job_id, "status": "queued", "message": "Documentation generation queued."}
 
 @app.get("/status/{job_id}")
-async def get_job_status(job_id: str):
+def get_job_status(job_id: str):
     """
     Returns the current status of the documentation generation job.
     """
-    if job_id not in job_store:
+    status = get_job_queue().get(job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job_store[job_id]
-
-def process_documentation(source_type: str, path: str, credentials: Optional[str], job_id: str):
-    print(f"Starting processing for {path} (Job ID: {job_id})")
-    input_handler = InputHandler()
-    working_dir = None
-    
-    # Load config
-    with open("config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-    
-    try:
-        # 1. Input Handling
-        if source_type == "git":
-            working_dir = input_handler.process_git_repo(path, credentials)
-        elif source_type == "local":
-            working_dir = input_handler.process_local_folder(path)
-        else:
-            job_store[job_id] = {"status": "failed", "error": "Invalid source type"}
+    return status
+
+async def _job_events(job_id: str, status: dict, interval: float, keepalive: float):
+    """Yield a Server-Sent Event whenever the job's status changes, until it finishes."""
+    event_id = 0
+    last_payload = None
+    last_sent = time.monotonic()
+    while True:
+        payload = json.dumps(status, sort_keys=True, default=str)
+        if payload != last_payload:
+            event_id += 1
+            state = status.get("status")
+            event = state if state in TERMINAL_STATUSES else "progress"
+            yield f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+            last_payload, last_sent = payload, time.monotonic()
+            if state in TERMINAL_STATUSES:
+                return
+        elif time.monotonic() - last_sent >= keepalive:
+            # Comment line, keeps proxies from closing an idle stream
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+
+        await asyncio.sleep(interval)
+        status = await asyncio.to_thread(get_job_queue().get, job_id)
+        if status is None:
+            yield f"event: failed\ndata: {json.dumps({'status': 'failed', 'error': 'Job was removed'})}\n\n"
             return
 
-        if not working_dir:
-             job_store[job_id] = {"status": "failed", "error": "Could not determine working directory"}
-             return
-
-        # 2. AST Extraction
-        print(f"Extracting AST from {working_dir}...")
-        extractor = ASTExtractor()
-        all_ast_data = []
-
-        # Walk through directory
-        for root, dirs, files in os.walk(working_dir):
-            # Ignore common exclude dirs
-            if 'node_modules' in dirs: dirs.remove('node_modules')
-            if '.git' in dirs: dirs.remove('.git')
-            if '__pycache__' in dirs: dirs.remove('__pycache__')
-            if '.venv' in dirs: dirs.remove('.venv')
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                try:
-                    chunks = extractor.extract_by_query(file_path)
-                    if chunks:
-                        all_ast_data.extend(chunks)
-                except Exception as e:
-                     print(f"Error extracting from {file}: {e}")
-
-        if not all_ast_data:
-            print("No suitable files found for AST extraction.")
-            job_store[job_id] = {"status": "completed", "warning": "No AST data found"}
-            return
+@app.get("/status/{job_id}/stream")
+def stream_job_status(job_id: str):
+    """
+    Streams the job's status as Server-Sent Events: a "progress" event on
+    every stage transition or counter update, then "completed" or "failed".
+    """
+    status = get_job_queue().get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        # 3. Code Mapping
-        print(f"Mapping {len(all_ast_data)} AST chunks...")
-        mapper = CodeMapper()
-        mapped_data = mapper.run(all_ast_data)
-
-        # 4. Save Output
-        # output_file = "mapped_ast.json" 
-        # Or use a config value if available, e.g. config.get('mapper_output_path', 'mapped_ast.json')
-        output_file = config.get('mapper_output_path', 'mapped_ast.json')
-        
-        with open(output_file, "w") as f:
-            json.dump(mapped_data, f, indent=2)
-            
-        print(f"Mapping complete. Results saved to {output_file}")
-        
-        job_store[job_id] = {
-            "status": "completed", 
-            "message": "Documentation generation successful.",
-            "results_file": output_file
-        }
-
-    except Exception as e:
-        print(f"Error during processing: {e}")
-        job_store[job_id] = {"status": "failed", "error": str(e)}
-    finally:
-        input_handler.cleanup()
+    config = get_app_config()
+    return StreamingResponse(
+        _job_events(
+            job_id,
+            status,
+            interval=float(config.get('jobs.stream_interval', 0.5)),
+            keepalive=float(config.get('jobs.stream_keepalive', 15.0))
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/queue")
+def get_queue_stats():
+    """
+    Returns the number of queued, running and finished jobs.
+    """
+    return get_job_queue().stats()
           
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+BudgetedReranker - cross-encoder reranking that stays fast on CPU-only nodes.
+
+Wraps SentenceTransformersSimilarityRanker with:
+- automatic device selection (cuda / mps / cpu) instead of a hardcoded device
+- a bounded inference batch size
+- pre-pruning of candidates by retriever score before the cross-encoder runs
+- optional int8 dynamic quantization of the model's linear layers on CPU
+- skipping the cross-encoder entirely when the candidate set is small
+- a latency budget: when a rerank overshoots it, fewer candidates are sent
+  next time; when there is headroom, the cap grows back
+"""
+
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from haystack import component, Document
+from haystack.components.rankers import SentenceTransformersSimilarityRanker
+from haystack.utils import ComponentDevice
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_device(preference: Optional[str] = "auto") -> ComponentDevice:
+    """
+    Resolve a device setting to a ComponentDevice.
+
+    Args:
+        preference: "auto" (or empty) picks the best available device; anything
+            else is parsed as a device string such as "cpu", "cuda:0" or "mps"
+
+    Returns:
+        ComponentDevice for the component
+    """
+    if not preference or preference == "auto":
+        return ComponentDevice.resolve_device(None)
+    return ComponentDevice.from_str(preference)
+
+
+@component
+class BudgetedReranker:
+    """
+    Drop-in replacement for SentenceTransformersSimilarityRanker in the query pipeline.
+
+    Usage:
+        reranker = BudgetedReranker(model="cross-encoder/ms-marco-MiniLM-L-6-v2", max_candidates=20)
+        reranker.warm_up()
+        docs = reranker.run(query=query, documents=retrieved)["documents"]
+    """
+
+    def __init__(
+        self,
+        model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        device: Optional[str] = "auto",
+        top_k: int = 5,
+        batch_size: int = 16,
+        max_candidates: int = 20,
+        skip_below: int = 0,
+        quantize_int8: bool = False,
+        latency_budget_ms: float = 0,
+        ranker: Optional[Any] = None
+    ):
+        """
+        Args:
+            model: Cross-encoder model name
+            device: "auto" or an explicit device string
+            top_k: Number of documents returned
+            batch_size: Maximum number of (query, document) pairs scored per forward pass
+            max_candidates: Highest-scoring retriever candidates sent to the cross-encoder
+            skip_below: Skip the cross-encoder when at most this many candidates were retrieved
+            quantize_int8: Quantize linear layers to int8 after loading (CPU + torch backend only)
+            latency_budget_ms: Target rerank latency; 0 disables candidate adaptation
+            ranker: Pre-built ranker to wrap instead of creating one (used by tests and benchmarks)
+        """
+        self.device = resolve_device(device)
+        self.on_cpu = self.device.to_torch_str() == "cpu"
+        self.top_k = top_k
+        self.max_candidates = max(top_k, max_candidates)
+        self.skip_below = skip_below
+        self.quantize_int8 = quantize_int8
+        self.latency_budget_ms = latency_budget_ms
+        self.candidate_limit = self.max_candidates
+        self.last_latency_ms = 0.0
+        self.ranker = ranker or SentenceTransformersSimilarityRanker(
+            model=model,
+            top_k=top_k,
+            device=self.device,
+            batch_size=max(1, batch_size)
+        )
+        self._quantized = False
+
+    def warm_up(self):
+        if hasattr(self.ranker, "warm_up"):
+            self.ranker.warm_up()
+        if self.quantize_int8 and not self._quantized:
+            self._quantize()
+
+    def _quantize(self):
+        self._quantized = True
+        if not self.on_cpu:
+            logger.info("Skipping int8 quantization: reranker is not running on CPU")
+            return
+        cross_encoder = getattr(self.ranker, "_cross_encoder", None)
+        if cross_encoder is None or not hasattr(cross_encoder, "model"):
+            logger.warning("Skipping int8 quantization: cross-encoder model is not available")
+            return
+        try:
+            import torch
+            cross_encoder.model = torch.quantization.quantize_dynamic(
+                cross_encoder.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("Reranker linear layers quantized to int8")
+        except Exception as e:
+            logger.warning(f"int8 quantization failed, keeping full-precision weights: {e}")
+
+    @staticmethod
+    def _by_retriever_score(documents: List[Document]) -> List[Document]:
+        return sorted(documents, key=lambda doc: doc.score if doc.score is not None else float("-inf"), reverse=True)
+
+    def _adapt(self, elapsed_ms: float, top_k: int):
+        if not self.latency_budget_ms:
+            return
+        if elapsed_ms > self.latency_budget_ms and self.candidate_limit > top_k:
+            self.candidate_limit = max(top_k, (self.candidate_limit * 3) // 4)
+            logger.info(
+                f"Rerank took {elapsed_ms:.0f}ms (budget {self.latency_budget_ms:.0f}ms), "
+                f"lowering candidate cap to {self.candidate_limit}"
+            )
+        elif elapsed_ms < self.latency_budget_ms / 2 and self.candidate_limit < self.max_candidates:
+            self.candidate_limit += 1
+
+    @component.output_types(documents=List[Document])
+    def run(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> Dict[str, List[Document]]:
+        top_k = top_k or self.top_k
+        if not documents:
+            return {"documents": []}
+
+        candidates = self._by_retriever_score(documents)
+        if len(candidates) <= self.skip_below:
+            # Too few candidates for the cross-encoder to be worth its latency
+            self.last_latency_ms = 0.0
+            return {"documents": candidates[:top_k]}
+
+        candidates = candidates[:max(top_k, self.candidate_limit)]
+        start = time.perf_counter()
+        ranked = self.ranker.run(query=query, documents=candidates, top_k=top_k)["documents"]
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        self._adapt(self.last_latency_ms, top_k)
+        return {"documents": ranked}
@@ -1,7 +1,14 @@
 from haystack import component, Document
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+from src.core.config import AppConfig, get_app_config
 from src.utils.modelGenerator import ModelGenerator
 from src.utils.llm_json_handler import LLMJsonHandler
+from src.utils.llm_cache import generate, remember
+from src.components.extractor.call_graph import StaticDependencyResolver
+from src.services.checkpoint import StageCheckpoint, fingerprint
 import logging
 from string import Template
 from datetime import datetime
@@ -9,26 +16,7 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
-@component
-class CodeMapper:
-
-    """
-        Check out methods dependencies and map them to each other
-        input: ast_data_list
-        output: mapped_ast_data_list
-
-        This will use a small LLM to check out methods dependencies and map them to each other
-
-    """
-
-
-    def __init__(self):
-       self.generator = ModelGenerator("code_mapper").get_generator()
-
-    @component.output_types(mapped_ast_data_list=dict)
-    def run(self, ast_data_list: List[dict]):
-        all_docs = []
-        prompt_template = Template("""### ROLE
+MAPPER_PROMPT = Template("""### ROLE
         You are a Static Code Analysis Engine. Your task is to identify internal method dependencies within a given class.
 
         ### TASK
@@ -67,59 +55,347 @@ class CodeMapper:
 
         ### RESPONSE""")
 
-        try:
 
-            output = {}
-            start_time = datetime.now()
-
-            for ast_data in ast_data_list:
-                query = ""
-
-                query+=f"className: {ast_data['class_name']}\n"
-                
-                logger.info("Mapping data for class: ", ast_data['class_name'])
-                
-                # Build lookup for is_api_route per method
-                api_route_lookup = {}
-                defenitions = []
-                for method in ast_data['methods']:
-                    defenitions.append(method['method_definition'])
-                    method_name = method.get('method_name', '')
-                    api_route_lookup[method_name] = method.get('is_api_route', False)
-                
-                query+=f"methods: {defenitions}\n"
-
-                # run the generator and get the first generated response
-                full_prompt = prompt_template.substitute(query_data=query)
-                response = self.generator.run(full_prompt)['replies'][0]
-
-                # parse the response to json with repair and retry logic
-                json_output = LLMJsonHandler.parse_with_retry(
-                    response, 
-                    generator=self.generator, 
-                    prompt=full_prompt,
-                    max_retries=2
-                )
-
-                # Merge is_api_route into each method's output
-                for method_info in json_output.get('methods', []):
-                    method_name = method_info.get('method', '')
-                    method_info['is_api_route'] = api_route_lookup.get(method_name, False)
-
-                output[ast_data['class_name']] = json_output
-            
-            end_time = datetime.now()
-            
-            logger.info(f"Mapping data for class: {ast_data['class_name']} took {end_time - start_time}")
+BATCH_MAPPER_PROMPT = Template("""### ROLE
+        You are a Static Code Analysis Engine. Your task is to identify internal method dependencies within each of the given classes.
+
+        ### TASK
+        Analyze every class below. For each class, map each method to the internal services or methods it calls.
+
+        ### CONSTRAINTS
+        1. **Dependencies Only**: List only internal service calls (e.g., `service.method`).
+        2. **Exclude External Libraries**: Do not include calls to standard libraries or third-party utilities (e.g., bcrypt, math, lodash, or native language APIs).
+        3. **Internal Context**: If a method is called on `this` or `self`, include it.
+        4. **Keyed Output**: Return ONE JSON object with one key per class name, exactly as given after `className:`.
+        5. **Strict Output**: Return ONLY a raw JSON object.
+        6. **No Markdown**: Do not wrap the output in ```json blocks. Do not include any conversational text, explanations, or notes.
+
+        ### SCHEMA EXAMPLE
+        Input:
+        className: AuthController
+        methods: ['public void login() { authService.verify(); }']
+
+        className: AuthService
+        methods: ['public void verify() { tokenStore.check(); }']
+
+        ### Output:
+
+            {
+            "AuthController": {
+                "methods": [
+                    { "method": "login", "dependencies": ["authService.verify"] }
+                ]
+            },
+            "AuthService": {
+                "methods": [
+                    { "method": "verify", "dependencies": ["tokenStore.check"] }
+                ]
+            }
+            }
+
+        ### DATA TO ANALYZE
+        $query_data
+
+        ### RESPONSE""")
+
+# Rough characters-per-token ratio used to size batches without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+@component
+class CodeMapper:
+
+    """
+        Check out methods dependencies and map them to each other
+        input: ast_data_list
+        output: mapped_ast_data_list
+
+        This will use a small LLM to check out methods dependencies and map them to each other
+
+        Classes are mapped independently: a class whose LLM call fails is logged,
+        recorded in self.failures and left out of the output instead of aborting the run.
+        With code_mapper.max_concurrency > 1, up to that many LLM calls are in flight at once.
+
+        With code_mapper.static_analysis enabled, calls are first resolved from the
+        tree-sitter syntax tree (see StaticDependencyResolver); only classes whose
+        calls cannot be resolved statically are sent to the LLM.
+
+        With code_mapper.batch_token_budget > 0, small classes are packed into one
+        prompt (up to that many estimated tokens of class data, at most
+        code_mapper.batch_max_classes) and the keyed reply is split per class. If a
+        batch reply does not parse, or misses a class, those classes are retried
+        with the single-class prompt.
+
+        With a checkpoint, every class the LLM maps is persisted as soon as its
+        prompt completes; a restarted run reuses them while the class's method
+        definitions are unchanged, and only prompts for the rest.
+
+    """
+
+
+    def __init__(self, config: Optional[AppConfig] = None, checkpoint: Optional[StageCheckpoint] = None):
+       self.config = config or get_app_config()
+       self.checkpoint = checkpoint
+       self.generator = ModelGenerator("code_mapper", config=self.config).get_generator()
+       self.max_concurrency = max(1, int(self.config.get("code_mapper.max_concurrency", 1)))
+       self.static_analysis = bool(self.config.get("code_mapper.static_analysis", True))
+       self.batch_token_budget = int(self.config.get("code_mapper.batch_token_budget", 0))
+       self.batch_max_classes = max(1, int(self.config.get("code_mapper.batch_max_classes", 8)))
+       self.failures: Dict[str, str] = {}
+       self.stats: Dict[str, int] = {"static": 0, "llm": 0, "resumed": 0, "batches": 0}
+       # Progress counter of the current run, see _progress_reporter
+       self._progress: Optional[Callable[..., None]] = None
+
+    def _class_query(self, ast_data: dict) -> Tuple[str, Dict[str, bool]]:
+        """Format one class for a prompt and build its is_api_route lookup."""
+        query = ""
+
+        query+=f"className: {ast_data['class_name']}\n"
         
+        # Build lookup for is_api_route per method
+        api_route_lookup = {}
+        defenitions = []
+        for method in ast_data['methods']:
+            defenitions.append(method['method_definition'])
+            method_name = method.get('method_name', '')
+            api_route_lookup[method_name] = method.get('is_api_route', False)
+        
+        query+=f"methods: {defenitions}\n"
+
+        return query, api_route_lookup
+
+    def _build_prompt(self, ast_data: dict) -> Tuple[str, Dict[str, bool]]:
+        """Build the mapping prompt for a class and its is_api_route lookup."""
+        query, api_route_lookup = self._class_query(ast_data)
+        return MAPPER_PROMPT.substitute(query_data=query), api_route_lookup
+
+    @staticmethod
+    def _merge_api_routes(json_output: dict, api_route_lookup: Dict[str, bool]) -> dict:
+        for method_info in json_output.get('methods', []):
+            method_name = method_info.get('method', '')
+            method_info['is_api_route'] = api_route_lookup.get(method_name, False)
+        return json_output
+
+    def _map_class(self, ast_data: dict) -> dict:
+        """Run the LLM for a single class and return its parsed mapping."""
+        logger.info(f"Mapping data for class: {ast_data['class_name']}")
+
+        full_prompt, api_route_lookup = self._build_prompt(ast_data)
+
+        # run the generator and get the first generated response
+        response = generate(self.generator, full_prompt)
+
+        # parse the response to json with repair and retry logic
+        json_output = LLMJsonHandler.parse_with_retry(
+            response, 
+            generator=self.generator, 
+            prompt=full_prompt,
+            max_retries=2
+        )
+        # Only a usable mapping is cached
+        if isinstance(json_output, dict):
+            remember(self.generator, full_prompt, json.dumps(json_output))
+
+        # Merge is_api_route into each method's output
+        return self._merge_api_routes(json_output, api_route_lookup)
+
+    def _safe_map_class(self, ast_data: dict) -> Tuple[Optional[dict], Optional[str]]:
+        try:
+            return self._map_class(ast_data), None
         except Exception as e:
-            logger.error(f"Failed to generate Code mapping: {e}")
-            raise RuntimeError(f"Could not generate Code mapping.") from e
+            logger.error(f"Failed to map class {ast_data.get('class_name')}: {e}")
+            return None, str(e)
 
-        return output
+    def _pack_batches(self, ast_data_list: List[dict]) -> List[List[dict]]:
+        """
+        Group classes, in input order, into batches that fit the token budget.
 
+        A class that alone exceeds the budget gets a batch of its own and is
+        mapped with the single-class prompt. Classes sharing a name always go
+        to separate batches since the reply is keyed by class name.
+        """
+        if self.batch_token_budget <= 0:
+            return [[ast_data] for ast_data in ast_data_list]
 
-                
+        batches, current, current_tokens = [], [], 0
+        for ast_data in ast_data_list:
+            tokens = len(self._class_query(ast_data)[0]) // CHARS_PER_TOKEN + 1
+            names = {cls['class_name'] for cls in current}
+            if current and (
+                current_tokens + tokens > self.batch_token_budget
+                or len(current) >= self.batch_max_classes
+                or ast_data['class_name'] in names
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(ast_data)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
 
+    def _map_batch(self, batch: List[dict]) -> List[Tuple[Optional[dict], Optional[str]]]:
+        """Map a batch with one keyed prompt; classes the reply misses are retried alone."""
+        if len(batch) == 1:
+            return [self._safe_map_class(batch[0])]
 
-            
\ No newline at end of file
+        class_names = [ast_data['class_name'] for ast_data in batch]
+        logger.info(f"Mapping batch of {len(batch)} classes: {', '.join(class_names)}")
+
+        queries, lookups = zip(*(self._class_query(ast_data) for ast_data in batch))
+        full_prompt = BATCH_MAPPER_PROMPT.substitute(query_data="\n".join(queries))
+        try:
+            response = generate(self.generator, full_prompt)
+            keyed_output = LLMJsonHandler.parse_with_retry(
+                response,
+                generator=self.generator,
+                prompt=full_prompt,
+                max_retries=1
+            )
+        except Exception as e:
+            logger.warning(f"Batch reply for {class_names} could not be used, mapping classes one by one: {e}")
+            keyed_output = {}
+
+        results, complete = [], True
+        for ast_data, api_route_lookup in zip(batch, lookups):
+            json_output = keyed_output.get(ast_data['class_name']) if isinstance(keyed_output, dict) else None
+            if isinstance(json_output, dict) and isinstance(json_output.get('methods'), list):
+                results.append((self._merge_api_routes(json_output, api_route_lookup), None))
+            else:
+                complete = False
+                results.append(self._safe_map_class(ast_data))
+        # Only a reply that covered every class is cached
+        if complete:
+            remember(self.generator, full_prompt, json.dumps(keyed_output))
+        return results
+
+    def _class_fingerprint(self, ast_data: dict) -> str:
+        return fingerprint(self._class_query(ast_data)[0])
+
+    def _map_batch_with_checkpoint(self, batch: List[dict]) -> List[Tuple[Optional[dict], Optional[str]]]:
+        """Map a batch, checkpoint its classes and report progress as soon as the batch completes."""
+        results = self._map_batch(batch)
+        if self.checkpoint is not None:
+            for ast_data, (json_output, error) in zip(batch, results):
+                if error is None:
+                    self.checkpoint.put(ast_data['class_name'], self._class_fingerprint(ast_data), json_output)
+        if self._progress is not None:
+            self._progress(len(results), sum(1 for _, error in results if error is not None))
+        return results
+
+    def _progress_reporter(self, total: int, progress_callback: Optional[Callable[[Dict[str, Any]], None]]):
+        """Return a thread-safe counter that forwards running counts to progress_callback."""
+        lock = threading.Lock()
+        counts = {"completed": 0, "failed": 0}
+        start_time = datetime.now()
+
+        def progress(completed: int, failed: int = 0):
+            with lock:
+                counts["completed"] += completed
+                counts["failed"] += failed
+                elapsed = (datetime.now() - start_time).total_seconds()
+                done = counts["completed"]
+                if progress_callback:
+                    progress_callback({
+                        "completed": done,
+                        "total": total,
+                        "failed": counts["failed"],
+                        "elapsed_seconds": elapsed,
+                        "eta_seconds": elapsed / done * (total - done) if done else None
+                    })
+        return progress
+
+    def _resume(self, llm_classes: List[dict]) -> Tuple[Dict[str, dict], List[dict]]:
+        """Split classes into ones mapped by an earlier attempt and ones still to map."""
+        if self.checkpoint is None:
+            return {}, llm_classes
+
+        resumed, remaining = {}, []
+        for ast_data in llm_classes:
+            json_output = self.checkpoint.get(ast_data['class_name'], self._class_fingerprint(ast_data))
+            if json_output is None:
+                remaining.append(ast_data)
+            else:
+                resumed[ast_data['class_name']] = json_output
+        if resumed:
+            logger.info(f"Resuming: {len(resumed)} classes already mapped by an earlier attempt")
+        return resumed, remaining
+
+    def _static_pass(self, ast_data_list: List[dict], known_classes: Optional[List[dict]]) -> Tuple[Dict[str, dict], List[dict]]:
+        """Resolve what the syntax tree can; return (mapped, classes left for the LLM)."""
+        if not self.static_analysis:
+            return {}, ast_data_list
+        try:
+            resolver = StaticDependencyResolver(known_classes=known_classes or ast_data_list, config=self.config)
+            return resolver.resolve(ast_data_list)
+        except Exception as e:
+            logger.warning(f"Static dependency pass failed, mapping every class with the LLM: {e}")
+            return {}, ast_data_list
+
+    @component.output_types(mapped_ast_data_list=dict)
+    def run(
+        self,
+        ast_data_list: List[dict],
+        known_classes: Optional[List[dict]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Args:
+            ast_data_list: Classes to map
+            known_classes: Every class of the project; lets the static pass tell
+                internal calls from external ones when only a subset is mapped
+            progress_callback: Optional callable receiving a progress dict
+                (completed, total, failed, elapsed_seconds, eta_seconds) after the
+                static pass and after every LLM prompt.
+        """
+        self.failures = {}
+        start_time = datetime.now()
+
+        static_mappings, llm_classes = self._static_pass(ast_data_list, known_classes)
+        llm_mappings, pending = self._resume(llm_classes)
+        batches = self._pack_batches(pending)
+        self._progress = self._progress_reporter(len(ast_data_list), progress_callback)
+        self._progress(len(static_mappings) + len(llm_mappings))
+
+        if self.max_concurrency > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                # map() returns results in input order, so merging stays deterministic
+                batch_results = list(pool.map(self._map_batch_with_checkpoint, batches))
+        else:
+            batch_results = [self._map_batch_with_checkpoint(batch) for batch in batches]
+        results = [result for batch_result in batch_results for result in batch_result]
+        batched_classes = [ast_data for batch in batches for ast_data in batch]
+
+        for ast_data, (json_output, error) in zip(batched_classes, results):
+            if error is not None:
+                self.failures[ast_data['class_name']] = error
+                continue
+            llm_mappings[ast_data['class_name']] = json_output
+
+        # Keep the input order regardless of which path mapped a class
+        output = {}
+        for ast_data in ast_data_list:
+            class_name = ast_data['class_name']
+            if class_name in static_mappings:
+                output[class_name] = static_mappings[class_name]
+            elif class_name in llm_mappings:
+                output[class_name] = llm_mappings[class_name]
+        self.stats = {
+            "static": len(static_mappings),
+            "llm": len(pending),
+            "resumed": len(llm_classes) - len(pending),
+            "batches": len(batches)
+        }
+
+        end_time = datetime.now()
+        logger.info(
+            f"Mapped {len(output)} classes ({len(static_mappings)} statically, "
+            f"{len(pending)} via LLM in {len(batches)} prompts, {len(llm_classes) - len(pending)} resumed, "
+            f"{len(self.failures)} failed) in {end_time - start_time} with concurrency {self.max_concurrency}"
+        )
+
+        if ast_data_list and not output:
+            logger.error(f"Failed to generate Code mapping: {self.failures}")
+            raise RuntimeError(f"Could not generate Code mapping.")
+
+        return output
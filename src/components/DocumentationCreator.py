@@ -6,17 +6,23 @@ and uses LLM to generate comprehensive API documentation in Postman and Swagger
 """
 
 from haystack import component
-from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
+import time
 import logging
 from string import Template
 
+from src.core.config import AppConfig, get_app_config
 from src.utils.modelGenerator import ModelGenerator
 from src.utils.json_loader import load_json_folder, load_json_file
-from src.utils.weaviate_utils import fetch_by_method_name
+from src.utils.weaviate_utils import fetch_by_method_names
 from src.utils.llm_json_handler import LLMJsonHandler
+from src.utils.llm_cache import generate, remember
+from src.utils.rate_limiter import RateLimiter, is_rate_limit_error
+from src.utils.document_store import get_document_store
+from src.services.checkpoint import StageCheckpoint, fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -70,28 +76,34 @@ class DocumentationCreator:
     
     Processes mapped_ast.json and AST files to create Postman and Swagger documentation
     for each API endpoint.
+
+    With a checkpoint, every endpoint documented by the LLM is recorded as soon as
+    its files are written. A restarted run keeps those files as long as the
+    endpoint's prompt (definition and dependency context) is unchanged; endpoints
+    that only got fallback documentation are retried.
     """
     
     def __init__(
         self,
         weaviate_url: str = "http://127.0.0.1:8080",
-        config_path: str = "config.yaml"
+        config_path: str = "config.yaml",
+        config: Optional[AppConfig] = None,
+        checkpoint: Optional[StageCheckpoint] = None
     ):
-        self.generator = ModelGenerator("doc_creator", config_path).get_generator()
-        self.config = self._load_config(config_path)
-        self.output_dir = self.config.get("doc_creator", {}).get("output_dir", "output")
+        self.config = config or get_app_config(config_path)
+        self.checkpoint = checkpoint
+        self.generator = ModelGenerator("doc_creator", config=self.config).get_generator()
+        self.output_dir = self.config.get("doc_creator.output_dir", "output")
+        self.max_concurrency = max(1, int(self.config.get("doc_creator.max_concurrency", 1)))
+        self.rate_limiter = RateLimiter(self.config.get("doc_creator.requests_per_minute", 0))
         
-        # Initialize Weaviate document store
-        self.document_store = WeaviateDocumentStore(url=weaviate_url)
-    
-    def _load_config(self, path: str) -> Dict[str, Any]:
-        import yaml
-        try:
-            with open(path, "r") as f:
-                return yaml.safe_load(f)
-        except Exception as e:
-            logger.warning(f"Could not load config: {e}")
-            return {}
+        # Initialize document store (Weaviate or the embedded local store, per config)
+        self.document_store = get_document_store(self.config, weaviate_url=weaviate_url)
+        
+        # Dependency documents resolved during the current run, keyed by method name
+        self._dependency_docs: Dict[str, List[Any]] = {}
+        # Endpoints whose checkpointed output was reused in the current run
+        self._resumed: Set[str] = set()
     
     def _get_api_methods(self, mapped_ast: Dict) -> List[Dict]:
         """Filter methods where is_api_route=true from mapped_ast."""
@@ -122,6 +134,24 @@ class DocumentationCreator:
                 return method_info.get("dependencies", [])
         return []
     
+    @staticmethod
+    def _dependency_method_name(dep: str) -> str:
+        # Extract method name from dependency (e.g., "postService.findAll" -> "findAll")
+        parts = dep.split(".")
+        return parts[-1] if parts else dep
+    
+    def _prefetch_dependencies(self, api_methods: List[Dict]):
+        """Resolve every dependency of the run in bulk and memoize the documents."""
+        self._dependency_docs = {}
+        names = {
+            self._dependency_method_name(dep)
+            for method in api_methods
+            for dep in method.get("dependencies", [])
+        }
+        if names:
+            self._dependency_docs = fetch_by_method_names(self.document_store, names)
+            logger.info(f"Prefetched dependency context for {len(names)} methods")
+    
     def _fetch_dependency_context(self, dependencies: List[str]) -> str:
         """Fetch dependency information from Weaviate and format as context."""
         if not dependencies:
@@ -129,12 +159,13 @@ class DocumentationCreator:
         
         context_parts = []
         for dep in dependencies:
-            # Extract method name from dependency (e.g., "postService.findAll" -> "findAll")
-            parts = dep.split(".")
-            method_name = parts[-1] if parts else dep
+            method_name = self._dependency_method_name(dep)
             
-            # Fetch from Weaviate
-            docs = fetch_by_method_name(self.document_store, method_name)
+            # Served from the run's prefetch; only unseen names hit Weaviate.
+            # A failed lookup is not memoized, so the next endpoint retries it.
+            if method_name not in self._dependency_docs:
+                self._dependency_docs.update(fetch_by_method_names(self.document_store, [method_name]))
+            docs = self._dependency_docs.get(method_name, [])
             
             if docs:
                 doc = docs[0]
@@ -165,6 +196,8 @@ class DocumentationCreator:
         full_path = f"{base_path.rstrip('/')}/{path.lstrip('/')}" if path else base_path
         
         return {
+            # Marks fallback output so it is never checkpointed as done
+            "fallback": True,
             "postman": {
                 "name": method_name,
                 "request": {
@@ -192,11 +225,14 @@ class DocumentationCreator:
         
         for attempt in range(max_retries):
             try:
-                response = self.generator.run(prompt)["replies"][0]
+                # Retries skip the response cache so they reach the model; only
+                # calls that do reach it count against the rate limit
+                response = generate(self.generator, prompt, attempt, before_call=self.rate_limiter.acquire)
                 result = LLMJsonHandler.parse(response)
                 
                 # Validate structure
                 if "postman" in result or "swagger" in result:
+                    remember(self.generator, prompt, response)
                     return result
                 else:
                     logger.warning(f"Attempt {attempt + 1}: Missing postman/swagger keys, retrying...")
@@ -207,6 +243,9 @@ class DocumentationCreator:
                     continue
             except Exception as e:
                 logger.warning(f"Attempt {attempt + 1}: Error: {e}")
+                if is_rate_limit_error(e):
+                    # Throttled: slow every worker down, not just this one
+                    self.rate_limiter.backoff(2 ** (attempt + 1))
                 if attempt < max_retries - 1:
                     continue
         
@@ -214,11 +253,61 @@ class DocumentationCreator:
         logger.warning(f"Using fallback documentation for {method.get('method_name')}")
         return self._create_fallback_documentation(method)
 
+    def _process_method(self, method: Dict, method_details: Dict[str, Dict]) -> Tuple[str, Optional[Dict[str, str]]]:
+        """
+        Document a single API method end to end.
+
+        Returns:
+            ("Class.method" key, saved output files), with None instead of files on failure
+        """
+        method_name = method.get("method_name", "unknown")
+        class_name = method.get("class_name", "Unknown")
+        
+        logger.info(f"Processing: {class_name}.{method_name}")
+        
+        try:
+            # Get dependencies already included in method from _get_api_methods
+            dependencies = method.get("dependencies", [])
+            
+            # Enrich method with details from AST
+            key = f"{class_name}.{method_name}"
+            if key in method_details:
+                method.update(method_details[key])
+            
+            # Fetch dependency context from Weaviate
+            dep_context = self._fetch_dependency_context(dependencies)
+            
+            # Build prompt and generate documentation
+            prompt = self._build_prompt(method, dep_context)
+
+            prompt_fingerprint = fingerprint(prompt) if self.checkpoint is not None else None
+            if self.checkpoint is not None:
+                saved = self.checkpoint.get(key, prompt_fingerprint)
+                if saved and all(os.path.exists(path) for path in saved.values()):
+                    logger.info(f"Resuming: {key} already documented")
+                    self._resumed.add(key)
+                    return key, saved
+
+            documentation = self._generate_documentation(prompt, method)
+            
+            if documentation:
+                # Save output files
+                saved = self._save_outputs(key, documentation)
+                if self.checkpoint is not None and not documentation.get("fallback"):
+                    self.checkpoint.put(key, prompt_fingerprint, saved)
+                return key, saved
+
+            logger.error(f"Failed to generate docs for {key}")
+            return key, None
+                
+        except Exception as e:
+            logger.error(f"Error processing {class_name}.{method_name}: {e}")
+            return f"{class_name}.{method_name}", None
     
-    def _save_outputs(self, method_name: str, documentation: Dict) -> Dict[str, str]:
-        """Save Postman and Swagger JSON files to output directory."""
-        # Create method-specific output directory
-        method_dir = os.path.join(self.output_dir, method_name)
+    def _save_outputs(self, endpoint: str, documentation: Dict) -> Dict[str, str]:
+        """Save Postman and Swagger JSON files to output_dir/<Class.method>/."""
+        # Keyed by class too: two controllers may both define e.g. findAll
+        method_dir = os.path.join(self.output_dir, endpoint)
         os.makedirs(method_dir, exist_ok=True)
         
         saved_files = {}
@@ -237,18 +326,22 @@ class DocumentationCreator:
             json.dump(swagger_data, f, indent=2)
         saved_files["swagger"] = swagger_path
         
-        logger.info(f"Saved documentation for {method_name} to {method_dir}")
+        logger.info(f"Saved documentation for {endpoint} to {method_dir}")
         return saved_files
     
     @component.output_types(
         methods_processed=int,
         methods_failed=int,
+        methods_skipped=int,
+        methods_resumed=int,
         output_files=Dict[str, Dict[str, str]]
     )
     def run(
         self,
         mapped_ast_path: str,
-        ast_folder: str = None
+        ast_folder: str = None,
+        endpoints: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Process mapped AST and generate API documentation.
@@ -256,9 +349,15 @@ class DocumentationCreator:
         Args:
             mapped_ast_path: Path to mapped_ast.json file
             ast_folder: Optional, path to AST folder (used for additional context)
+            endpoints: Optional "Class.method" keys to (re)generate. Other endpoints
+                are skipped and keep their previously generated output files.
+            progress_callback: Optional callable receiving a progress dict
+                (completed, total, failed, method, elapsed_seconds, eta_seconds)
+                after every endpoint.
             
         Returns:
-            Dictionary with processing results
+            Dictionary with processing results; output_files maps each
+            "Class.method" endpoint to its saved postman/swagger paths
         """
         logger.info(f"Starting DocumentationCreator: mapped_ast={mapped_ast_path}")
         
@@ -286,59 +385,86 @@ class DocumentationCreator:
         
         # Get API methods from mapped_ast
         api_methods = self._get_api_methods(mapped_ast)
+        methods_skipped = 0
+        if endpoints is not None:
+            wanted = set(endpoints)
+            selected = [m for m in api_methods if f"{m['class_name']}.{m['method_name']}" in wanted]
+            methods_skipped = len(api_methods) - len(selected)
+            api_methods = selected
+            logger.info(f"Regenerating {len(api_methods)} changed endpoints, reusing {methods_skipped}")
         
         if not api_methods:
             logger.warning("No API methods found to document")
             return {
                 "methods_processed": 0,
                 "methods_failed": 0,
+                "methods_skipped": methods_skipped,
+                "methods_resumed": 0,
                 "output_files": {}
             }
         
+        # One bulk lookup instead of a Weaviate query per dependency per endpoint
+        self._prefetch_dependencies(api_methods)
+        
         methods_processed = 0
         methods_failed = 0
         output_files = {}
-        
-        for method in api_methods:
-            method_name = method.get("method_name", "unknown")
-            class_name = method.get("class_name", "Unknown")
-            
-            logger.info(f"Processing: {class_name}.{method_name}")
-            
-            try:
-                # Get dependencies already included in method from _get_api_methods
-                dependencies = method.get("dependencies", [])
-                
-                # Enrich method with details from AST
-                key = f"{class_name}.{method_name}"
-                if key in method_details:
-                    method.update(method_details[key])
-                
-                # Fetch dependency context from Weaviate
-                dep_context = self._fetch_dependency_context(dependencies)
-                
-                # Build prompt and generate documentation
-                prompt = self._build_prompt(method, dep_context)
-                documentation = self._generate_documentation(prompt, method)
-                
-                if documentation:
-                    # Save output files
-                    saved = self._save_outputs(method_name, documentation)
-                    output_files[method_name] = saved
-                    methods_processed += 1
-                else:
-                    logger.error(f"Failed to generate docs for {method_name}")
-                    methods_failed += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing {class_name}.{method_name}: {e}")
+        self._resumed = set()
+        results: List[Optional[Tuple[str, Optional[Dict[str, str]]]]] = [None] * len(api_methods)
+        total = len(api_methods)
+        start_time = time.monotonic()
+
+        def report(index: int):
+            nonlocal methods_processed, methods_failed
+            endpoint, saved = results[index]
+            if saved is None:
                 methods_failed += 1
+            else:
+                methods_processed += 1
+            completed = methods_processed + methods_failed
+            elapsed = time.monotonic() - start_time
+            eta = elapsed / completed * (total - completed)
+            logger.info(f"[{completed}/{total}] Documented {endpoint} (eta {eta:.0f}s)")
+            if progress_callback:
+                progress_callback({
+                    "completed": completed,
+                    "total": total,
+                    "failed": methods_failed,
+                    "method": endpoint,
+                    "elapsed_seconds": elapsed,
+                    "eta_seconds": eta
+                })
+
+        if self.max_concurrency > 1 and total > 1:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                futures = {
+                    pool.submit(self._process_method, method, method_details): index
+                    for index, method in enumerate(api_methods)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    report(index)
+        else:
+            for index, method in enumerate(api_methods):
+                results[index] = self._process_method(method, method_details)
+                report(index)
+
+        # Merge in endpoint order so the output does not depend on completion order
+        for endpoint, saved in results:
+            if saved is not None:
+                output_files[endpoint] = saved
         
         result = {
             "methods_processed": methods_processed,
             "methods_failed": methods_failed,
+            "methods_skipped": methods_skipped,
+            "methods_resumed": len(self._resumed),
             "output_files": output_files
         }
         
-        logger.info(f"DocumentationCreator complete: {methods_processed} processed, {methods_failed} failed")
+        logger.info(
+            f"DocumentationCreator complete: {methods_processed} processed "
+            f"({len(self._resumed)} resumed), {methods_failed} failed"
+        )
         return result
@@ -0,0 +1,99 @@
+"""
+HybridRetriever - vector similarity fused with identifier-aware keyword search.
+
+Runs the embedding retriever and an IdentifierIndex (BM25 over method names,
+class names and code) side by side and merges the two rankings with
+reciprocal-rank fusion. Queries naming exact identifiers ("authService.verify")
+surface the right method even when its embedding is not a close match, so a
+smaller top_k reaches the reranker with better hits.
+
+The keyword index is built from the document store and rebuilt whenever the
+shared index version changes, i.e. after WeaviateCodeWriter or the indexing
+pipeline write.
+"""
+
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from haystack import component, Document
+from haystack.utils.filters import document_matches_filter
+
+from src.utils.identifier_index import IdentifierIndex, reciprocal_rank_fusion
+from src.utils.query_cache import IndexVersion
+
+logger = logging.getLogger(__name__)
+
+
+@component
+class HybridRetriever:
+    """
+    Drop-in replacement for an embedding retriever that also takes the query text.
+
+    Usage:
+        retriever = HybridRetriever(vector_retriever, document_store, IndexVersion(path), top_k=10)
+        docs = retriever.run(query="authService.verify", query_embedding=embedding)["documents"]
+    """
+
+    def __init__(
+        self,
+        vector_retriever: Any,
+        document_store: Any,
+        index_version: IndexVersion,
+        top_k: int = 10,
+        keyword_top_k: Optional[int] = None,
+        rrf_k: int = 60
+    ):
+        """
+        Args:
+            vector_retriever: Embedding retriever (optionally wrapped in CachedRetriever)
+            document_store: Store the keyword index is built from
+            index_version: Shared index version; a change triggers a keyword index rebuild
+            top_k: Number of fused documents returned
+            keyword_top_k: Keyword hits fed into fusion (defaults to top_k)
+            rrf_k: Reciprocal-rank fusion constant; higher flattens rank differences
+        """
+        self.vector_retriever = vector_retriever
+        self.document_store = document_store
+        self.index_version = index_version
+        self.top_k = top_k
+        self.keyword_top_k = keyword_top_k
+        self.rrf_k = rrf_k
+        self.index = IdentifierIndex()
+        self._built_version: Optional[str] = None
+        self._build_lock = threading.Lock()
+
+    def _ensure_index(self):
+        version = self.index_version.current()
+        if version == self._built_version:
+            return
+        with self._build_lock:
+            if version == self._built_version:
+                return
+            documents = self.document_store.filter_documents()
+            self.index.build(documents)
+            self._built_version = version
+            logger.info(f"Built identifier index over {len(self.index)} documents")
+
+    def warm_up(self):
+        if hasattr(self.vector_retriever, "warm_up"):
+            self.vector_retriever.warm_up()
+        self._ensure_index()
+
+    @component.output_types(documents=List[Document])
+    def run(
+        self,
+        query: str,
+        query_embedding: List[float],
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
+    ):
+        top_k = top_k or self.top_k
+        kwargs = {"filters": filters} if filters else {}
+        vector_hits = self.vector_retriever.run(query_embedding=query_embedding, top_k=top_k, **kwargs)["documents"]
+
+        self._ensure_index()
+        doc_filter = (lambda doc: document_matches_filter(filters, doc)) if filters else None
+        keyword_hits = [doc for doc, _ in self.index.search(query, self.keyword_top_k or top_k, doc_filter)]
+
+        return {"documents": reciprocal_rank_fusion([vector_hits, keyword_hits], k=self.rrf_k, top_k=top_k)}
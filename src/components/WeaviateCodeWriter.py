@@ -6,19 +6,37 @@ the data in Weaviate for semantic search and retrieval.
 
 The AST data is saved exactly as extracted by the base_extractor,
 which already includes file_name, class_name, and trimmed method_definition.
+
+Documents are produced lazily and embedded/written in fixed-size batches,
+so memory stays bounded and every finished batch is already stored in
+Weaviate if the run is interrupted. Embeddings are served from a persistent
+EmbeddingCache, so only new or changed methods reach the embedding model.
+
+Every document gets a stable id derived from (repo, file_name, class_name,
+method_name, type) and a hash of its content, metadata and embedding model. Re-indexing a repository diffs
+against what is already stored: unchanged documents are skipped, changed
+ones are upserted and documents that vanished from the code are deleted.
 """
 
 from haystack import component, Document
 from haystack.components.writers import DocumentWriter
+from haystack.document_stores.types import DuplicatePolicy
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder
-from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Set
+from itertools import chain, islice
 import logging
 
-from src.utils.json_loader import load_json_folder, load_json_file, flatten_ast_methods
+from src.utils.json_loader import iter_json_folder, load_json_file, flatten_ast_methods
+from src.utils.embedding_cache import EmbeddingCache, CachedDocumentEmbedder
+from src.utils.weaviate_utils import document_id, content_hash, fetch_content_hashes, delete_by_ids
+from src.utils.query_cache import IndexVersion
+from src.utils.document_store import get_document_store
+from src.core.config import AppConfig, get_app_config
 
 logger = logging.getLogger(__name__)
 
+DOCUMENT_TYPES = ("ast_method", "code_mapper")
+
 
 @component
 class WeaviateCodeWriter:
@@ -30,7 +48,8 @@ class WeaviateCodeWriter:
         writer = WeaviateCodeWriter(weaviate_url="http://localhost:8080")
         result = writer.run(
             ast_folder="./ast",
-            mapped_ast_path="./mapped_ast.json"
+            mapped_ast_path="./mapped_ast.json",
+            repo="https://github.com/org/repo"
         )
     """
     
@@ -38,7 +57,11 @@ class WeaviateCodeWriter:
         self,
         weaviate_url: str = "http://127.0.0.1:8080",
         embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
-        additional_headers: Optional[Dict[str, str]] = None
+        additional_headers: Optional[Dict[str, str]] = None,
+        batch_size: int = 256,
+        embedding_cache_dir: Optional[str] = None,
+        index_version_path: Optional[str] = ".docgen_cache/index_version",
+        config: Optional[AppConfig] = None
     ):
         """
         Initialize the WeaviateCodeWriter component.
@@ -47,70 +70,101 @@ class WeaviateCodeWriter:
             weaviate_url: URL of the Weaviate instance
             embedding_model: Model to use for generating embeddings
             additional_headers: Optional headers for Weaviate (e.g., API keys)
+            batch_size: Number of documents embedded and written per batch
+            embedding_cache_dir: Directory of the persistent embedding cache; None uses
+                rag.embedding_cache.path, or no cache if rag.embedding_cache.enabled is false
+            index_version_path: Index version file bumped after writes to invalidate RAG retrieval caches
+            config: Pipeline config; `document_store.backend` selects Weaviate or the embedded store
         """
         self.weaviate_url = weaviate_url
         self.embedding_model = embedding_model
         self.additional_headers = additional_headers or {}
+        self.batch_size = max(1, batch_size)
+        config = config or get_app_config()
+        if embedding_cache_dir is None and config.get("rag.embedding_cache.enabled", True):
+            embedding_cache_dir = config.get("rag.embedding_cache.path", ".docgen_cache/embeddings")
         
         # Initialize document store
-        self.document_store = WeaviateDocumentStore(
-            url=weaviate_url,
+        self.document_store = get_document_store(
+            config,
+            weaviate_url=weaviate_url,
             additional_headers=self.additional_headers
         )
         
-        # Initialize embedder
+        # Initialize embedder; with a cache the model is only loaded on a cache miss
         self.embedder = SentenceTransformersDocumentEmbedder(model=embedding_model)
-        self.embedder.warm_up()
+        if embedding_cache_dir:
+            self.embedder = CachedDocumentEmbedder(self.embedder, EmbeddingCache(embedding_cache_dir, embedding_model))
+        else:
+            self.embedder.warm_up()
+        
+        self.index_version = IndexVersion(index_version_path) if index_version_path else None
         
-        # Initialize writer
-        self.writer = DocumentWriter(document_store=self.document_store)
+        # Initialize writer; stable ids make every write an upsert
+        self.writer = DocumentWriter(document_store=self.document_store, policy=DuplicatePolicy.OVERWRITE)
     
-    def _ast_methods_to_documents(self, ast_data: List[Dict[str, Any]]) -> List[Document]:
+    def _identified_document(self, content: str, meta: Dict[str, Any], repo: str, seen: Dict[str, int]) -> Document:
+        """Build a Document with its stable id, repo, embedding model and content hash."""
+        # The model is part of the hash, so switching models re-embeds everything
+        meta = {**meta, 'repo': repo, 'embedding_model': self.embedding_model}
+        base_id = document_id(
+            repo,
+            meta.get('file_name', ''),
+            meta.get('class_name', ''),
+            meta.get('method_name', ''),
+            meta.get('type', '')
+        )
+        # Overloads share a name; number repeats in encounter order to keep ids unique
+        occurrence = seen.get(base_id, 0)
+        seen[base_id] = occurrence + 1
+        doc_id = base_id if occurrence == 0 else document_id(repo, base_id, str(occurrence), '', '')
+        meta['content_hash'] = content_hash(content, meta)
+        return Document(id=doc_id, content=content, meta=meta)
+    
+    def _iter_ast_documents(self, ast_files: Iterable[Dict[str, Any]], repo: str = "") -> Iterator[Document]:
         """
-        Convert flattened AST methods to Haystack Documents.
+        Lazily convert AST file infos to Haystack Documents, one method at a time.
         
         Args:
-            ast_data: List of file info dicts from load_json_folder
+            ast_files: Iterable of file info dicts (as yielded by iter_json_folder)
+            repo: Repository identifier used for document ids
             
-        Returns:
-            List of Haystack Document objects
+        Yields:
+            Haystack Document objects
         """
-        methods = flatten_ast_methods(ast_data)
-        documents = []
-        
-        for method in methods:
-            # Create document content - the method code with context
-            class_name = method.get('class_name', 'Unknown')
-            method_name = method.get('method_name', 'unknown')
-            method_definition = method.get('method_definition', '')
-            
-            content = f"Class: {class_name}\nMethod: {method_name}\n\n{method_definition}"
-            
-            # Create document with all method metadata
-            doc = Document(
-                content=content,
-                meta={
-                    'type': 'ast_method',
-                    **method  # Include all fields from the method
-                }
-            )
-            documents.append(doc)
-        
-        logger.info(f"Created {len(documents)} documents from AST methods")
-        return documents
+        seen: Dict[str, int] = {}
+        for file_info in ast_files:
+            for method in flatten_ast_methods([file_info]):
+                # Create document content - the method code with context
+                class_name = method.get('class_name', 'Unknown')
+                method_name = method.get('method_name', 'unknown')
+                method_definition = method.get('method_definition', '')
+                
+                content = f"Class: {class_name}\nMethod: {method_name}\n\n{method_definition}"
+                
+                # Create document with all method metadata
+                yield self._identified_document(
+                    content,
+                    {
+                        'type': 'ast_method',
+                        **method  # Include all fields from the method
+                    },
+                    repo,
+                    seen
+                )
     
-    def _mapped_ast_to_documents(self, mapped_ast: Dict[str, Any]) -> List[Document]:
+    def _iter_mapper_documents(self, mapped_ast: Dict[str, Any], repo: str = "") -> Iterator[Document]:
         """
-        Convert mapped_ast.json to Haystack Documents.
+        Lazily convert mapped_ast.json to Haystack Documents.
         
         Args:
             mapped_ast: Dictionary from mapped_ast.json
+            repo: Repository identifier used for document ids
             
-        Returns:
-            List of Haystack Document objects
+        Yields:
+            Haystack Document objects
         """
-        documents = []
-        
+        seen: Dict[str, int] = {}
         for class_name, class_data in mapped_ast.items():
             methods = class_data.get('methods', [])
             
@@ -123,75 +177,164 @@ class WeaviateCodeWriter:
                 content = f"Class: {class_name}\nMethod: {method_name}\nDependencies: {deps_str}"
                 
                 # Create document with metadata
-                doc = Document(
-                    content=content,
-                    meta={
+                yield self._identified_document(
+                    content,
+                    {
                         'type': 'code_mapper',
                         'class_name': class_name,
                         'method_name': method_name,
                         'dependencies': dependencies,
                         'dependency_count': len(dependencies)
-                    }
+                    },
+                    repo,
+                    seen
                 )
-                documents.append(doc)
+    
+    def _ast_methods_to_documents(self, ast_data: List[Dict[str, Any]]) -> List[Document]:
+        """
+        Convert flattened AST methods to Haystack Documents.
+        
+        Args:
+            ast_data: List of file info dicts from load_json_folder
+            
+        Returns:
+            List of Haystack Document objects
+        """
+        documents = list(self._iter_ast_documents(ast_data))
+        logger.info(f"Created {len(documents)} documents from AST methods")
+        return documents
+    
+    def _mapped_ast_to_documents(self, mapped_ast: Dict[str, Any]) -> List[Document]:
+        """
+        Convert mapped_ast.json to Haystack Documents.
         
+        Args:
+            mapped_ast: Dictionary from mapped_ast.json
+            
+        Returns:
+            List of Haystack Document objects
+        """
+        documents = list(self._iter_mapper_documents(mapped_ast))
         logger.info(f"Created {len(documents)} documents from code mapper")
         return documents
     
+    @staticmethod
+    def _batches(documents: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def _bump_index_version(self):
+        if self.index_version is not None:
+            self.index_version.bump()
+    
+    def _load_stored_hashes(self, repo: str) -> Optional[Dict[str, str]]:
+        stored = fetch_content_hashes(self.document_store, repo, DOCUMENT_TYPES)
+        if stored is None:
+            logger.warning("Could not read stored documents; rewriting everything and skipping deletes")
+        return stored
+    
     @component.output_types(
         ast_documents_written=int,
         mapper_documents_written=int,
-        total_documents=int
+        total_documents=int,
+        documents_unchanged=int,
+        documents_deleted=int
     )
     def run(
         self,
         ast_folder: str,
-        mapped_ast_path: str
+        mapped_ast_path: str,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        repo: str = ""
     ) -> Dict[str, int]:
         """
-        Process AST files and mapped_ast.json and write to Weaviate.
+        Process AST files and mapped_ast.json and sync them to Weaviate.
+        
+        Documents are generated lazily and compared with the content hashes
+        already stored for the repository. Only new or changed documents are
+        embedded (in batches of self.batch_size) and upserted; once every
+        document has been seen, stored documents that no longer exist in the
+        code are deleted.
         
         Args:
             ast_folder: Path to folder containing AST JSON files
             mapped_ast_path: Path to mapped_ast.json file
+            progress_callback: Optional callable receiving the running counts after each batch
+            repo: Repository identifier (e.g. its URL) that scopes document ids and deletes
             
         Returns:
-            Dictionary with counts of documents written
+            Dictionary with counts of documents written, left unchanged and deleted
         """
         logger.info(f"Starting WeaviateCodeWriter with ast_folder={ast_folder}, mapped_ast_path={mapped_ast_path}")
         
-        # Load data using shared utility
-        ast_files = load_json_folder(ast_folder)
+        stored = self._load_stored_hashes(repo)
+        seen_ids: Set[str] = set()
+        
         mapped_ast = load_json_file(mapped_ast_path) or {}
+        documents = chain(
+            self._iter_ast_documents(iter_json_folder(ast_folder), repo),
+            self._iter_mapper_documents(mapped_ast, repo)
+        )
         
-        # Process to documents
-        ast_documents = self._ast_methods_to_documents(ast_files)
-        mapper_documents = self._mapped_ast_to_documents(mapped_ast)
+        result = {
+            "ast_documents_written": 0,
+            "mapper_documents_written": 0,
+            "total_documents": 0,
+            "documents_unchanged": 0,
+            "documents_deleted": 0
+        }
         
-        # Combine all documents
-        all_documents = ast_documents + mapper_documents
+        def changed_documents() -> Iterator[Document]:
+            for doc in documents:
+                seen_ids.add(doc.id)
+                if stored is not None and stored.get(doc.id) == doc.meta['content_hash']:
+                    result["documents_unchanged"] += 1
+                    continue
+                yield doc
         
-        if not all_documents:
-            logger.warning("No documents to write")
-            return {
-                "ast_documents_written": 0,
-                "mapper_documents_written": 0,
-                "total_documents": 0
-            }
+        batches = 0
+        try:
+            for batch in self._batches(changed_documents(), self.batch_size):
+                # Generate embeddings and write this batch before producing the next one
+                embedded_docs = self.embedder.run(documents=batch)
+                self.writer.run(documents=embedded_docs['documents'])
+                
+                batches += 1
+                for doc in batch:
+                    if doc.meta.get('type') == 'ast_method':
+                        result["ast_documents_written"] += 1
+                    else:
+                        result["mapper_documents_written"] += 1
+                result["total_documents"] += len(batch)
+                
+                logger.info(f"Batch {batches}: wrote {result['total_documents']} documents so far")
+                if progress_callback:
+                    progress_callback({**result, "batches": batches})
+        except BaseException:
+            # Completed batches are already stored; nothing is deleted until a run completes
+            logger.error(f"Indexing interrupted after {batches} batches ({result['total_documents']} documents written)")
+            if batches:
+                self._bump_index_version()
+            raise
         
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(all_documents)} documents...")
-        embedded_docs = self.embedder.run(documents=all_documents)
+        if stored:
+            vanished = set(stored) - seen_ids
+            if vanished:
+                result["documents_deleted"] = delete_by_ids(self.document_store, vanished)
         
-        # Write to Weaviate
-        logger.info("Writing documents to Weaviate...")
-        self.writer.run(documents=embedded_docs['documents'])
+        if result["total_documents"] or result["documents_deleted"]:
+            self._bump_index_version()
         
-        result = {
-            "ast_documents_written": len(ast_documents),
-            "mapper_documents_written": len(mapper_documents),
-            "total_documents": len(all_documents)
-        }
+        if not result["total_documents"] and not result["documents_deleted"]:
+            logger.info(f"Weaviate is up to date ({result['documents_unchanged']} documents unchanged)")
+            return result
         
-        logger.info(f"Successfully wrote {result['total_documents']} documents to Weaviate")
+        logger.info(
+            f"Synced Weaviate: {result['total_documents']} written, "
+            f"{result['documents_unchanged']} unchanged, {result['documents_deleted']} deleted"
+        )
         return result
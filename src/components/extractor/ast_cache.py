@@ -0,0 +1,155 @@
+"""
+ASTCache - persistent on-disk cache of language extractor output.
+
+Entries are keyed by (file content hash, language, query file hash,
+extractor version), so a file is only re-parsed by tree-sitter when its
+bytes, its query or the extractor logic change. The cache directory is
+bounded in size; least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extractor output changes shape so stale entries stop matching
+EXTRACTOR_VERSION = "1"
+
+
+class ASTCache:
+    """
+    Content-addressed cache for extracted class/method dicts.
+
+    Usage:
+        cache = ASTCache(".docgen_cache/ast", max_size_mb=512)
+        key = cache.make_key(code_bytes, "java", query_path)
+        chunks = cache.get(key)
+        if chunks is None:
+            chunks = extractor.extract(file_path)
+            cache.put(key, chunks)
+    """
+
+    def __init__(self, cache_dir: str = ".docgen_cache/ast", max_size_mb: float = 512):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._query_hashes: Dict[str, str] = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cache entry."""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _query_hash(self, query_path: str) -> str:
+        if query_path not in self._query_hashes:
+            try:
+                with open(query_path, "rb") as f:
+                    self._query_hashes[query_path] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                self._query_hashes[query_path] = ""
+        return self._query_hashes[query_path]
+
+    def make_key(self, code_bytes: bytes, language: str, query_path: str) -> str:
+        """Build the cache key for a file's content under a given query."""
+        digest = hashlib.sha256()
+        for part in (
+            hashlib.sha256(code_bytes).hexdigest(),
+            language,
+            self._query_hash(query_path),
+            EXTRACTOR_VERSION,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached chunks for a key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                chunks = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Refresh mtime so eviction treats this entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return chunks
+
+    def put(self, key: str, chunks: List[Dict[str, Any]]):
+        """Store chunks for a key, evicting old entries if over the size limit."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = json.dumps(chunks).encode("utf-8")
+
+        # Write atomically so concurrent workers never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write AST cache entry {key}: {e}")
+            return
+
+        self._size += len(payload)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache is under 90% of its limit."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        for path, _, _ in list(self._entries()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size_bytes": self._size,
+        }
@@ -4,34 +4,75 @@ from typing import List, Dict, Any, Optional
 
 from src.components.LanguageFinder import LanguageFinder
 from src.services.framework_detector import FrameworkDetector
+from src.core.config import AppConfig, get_app_config
 
 from .java_extractor import JavaASTExtractor
 from .typescript_extractor import TypeScriptASTExtractor
 from .python_extractor import PythonASTExtractor
 from .csharp_extractor import CSharpASTExtractor
+from .ast_cache import ASTCache
+
+# Language name (as reported by LanguageFinder) -> extractor class
+EXTRACTOR_CLASSES = {
+    'java': JavaASTExtractor,
+    'typescript': TypeScriptASTExtractor,
+    'python': PythonASTExtractor,
+    'c_sharp': CSharpASTExtractor,
+}
 
 class ASTExtractor:
     """
     Facade class that routes to the appropriate language extractor.
     """
-    def __init__(self, language_finder: Optional[LanguageFinder] = None):
+    def __init__(
+        self,
+        language_finder: Optional[LanguageFinder] = None,
+        config: Optional[AppConfig] = None,
+        cache: Optional[ASTCache] = None
+    ):
         self._language_finder = language_finder or LanguageFinder()
+        self.config = config or get_app_config()
         self._extractors = {
-            'java': JavaASTExtractor(),
-            'typescript': TypeScriptASTExtractor(),
-            'python': PythonASTExtractor(),
-            'c_sharp': CSharpASTExtractor(),
+            language: extractor_cls(config=self.config)
+            for language, extractor_cls in EXTRACTOR_CLASSES.items()
         }
 
+        # Content-hash cache of extractor output; unchanged files skip tree-sitter
+        self.cache = cache
+        if self.cache is None and self.config.get('ast_cache.enabled', False):
+            self.cache = ASTCache(
+                cache_dir=self.config.get('ast_cache.path', '.docgen_cache/ast'),
+                max_size_mb=self.config.get('ast_cache.max_size_mb', 512)
+            )
+
     def extract_by_query(self, file_path: str) -> List[Dict[str, Any]]:
         language = self._language_finder.detect(file_path)
         if language == 'unknown':
             return []
         
-        if language in self._extractors:
-            return self._extractors[language].extract(file_path)
-        
-        return []
+        if language not in self._extractors:
+            return []
+
+        extractor = self._extractors[language]
+        if self.cache is None or not extractor.query_path:
+            return extractor.extract(file_path)
+
+        try:
+            with open(file_path, 'rb') as f:
+                code_bytes = f.read()
+        except OSError:
+            return extractor.extract(file_path)
+
+        key = self.cache.make_key(code_bytes, language, extractor.query_path)
+        chunks = self.cache.get(key)
+        if chunks is not None:
+            # Re-run output handling so file_name and saved AST match this path
+            extractor.handle_extractor_output(chunks, file_path)
+            return chunks
+
+        chunks = extractor.extract(file_path)
+        self.cache.put(key, chunks)
+        return chunks
 
 
 def main():
@@ -4,20 +4,23 @@ import os
 import re
 from tree_sitter import Language, Parser, Tree, Query
 from tree_sitter_language_pack import get_language
-import yaml
 import json
 
+from src.core.config import AppConfig, get_app_config
 
 
 class BaseASTExtractor(ABC):
     """
     Abstract Base Class for language-specific AST extraction.
     """
-    def __init__(self, language_name: str):
+    def __init__(self, language_name: str, config: Optional[AppConfig] = None):
         self.language_name = language_name
+        self.config = config or get_app_config()
         self.language = self._load_language()
         self.parser = Parser(self.language) if self.language else None
         self.query_cache: Dict[str, Query] = {}
+        # Path of the .scm query used by extract(); set by subclasses
+        self.query_path: Optional[str] = None
 
     def _load_language(self) -> Optional[Language]:
         try:
@@ -106,9 +109,7 @@ class BaseASTExtractor(ABC):
         return chunks
 
     def handle_extractor_output(self, chunks: List[Dict[str, Any]], file_path: str) -> List[Dict[str, Any]]:
-        # read from config.yaml
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        config = self.config
 
         # Extract file name from path
         file_name = file_path.split('/')[-1] + '.json'
@@ -116,22 +117,22 @@ class BaseASTExtractor(ABC):
         # Enrich chunks with file_name and class_name, and trim newlines
         chunks = self._enrich_chunks(chunks, file_name)
 
-        if config['verbose']:
+        if config.verbose:
             print(json.dumps(chunks, indent=2))
         
-        if config['save_ast']:
+        if config.save_ast:
             # create directory if not exists
-            if not os.path.exists(config['save_ast_path']):
-                os.makedirs(config['save_ast_path'])
+            if not os.path.exists(config.save_ast_path):
+                os.makedirs(config.save_ast_path)
 
             if not chunks:
                 print(f"No chunks found for {file_name}")
                 return []
             
-            with open(config['save_ast_path'] + "/" + file_name, 'w') as f:
+            with open(config.save_ast_path + "/" + file_name, 'w') as f:
                 json.dump(chunks, f, indent=2)
                 
-            print(f"Saved AST to {config['save_ast_path'] + '/' + file_name}")
+            print(f"Saved AST to {config.save_ast_path + '/' + file_name}")
         return chunks
     
     @abstractmethod
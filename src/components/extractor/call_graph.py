@@ -0,0 +1,292 @@
+"""
+Static call-graph extraction for the code mapping stage.
+
+CallGraphExtractor runs the tree-sitter queries in queries/calls over method
+definitions and returns the calls they make (receiver, method name) together
+with the declared types of parameters and locals.
+
+StaticDependencyResolver turns those calls into CodeMapper's
+{"methods": [{"method", "dependencies"}]} structure without an LLM. A call is
+kept as a dependency when it resolves to a method of a project class: calls on
+this/self, on a receiver whose declared type is a project class, or on a field
+named after one (authService -> AuthService, _userService -> UserService).
+Calls to names no project class defines and calls on locals declared with a
+non-project type are treated as external and dropped. Anything in between - a
+project method name called on a receiver that cannot be resolved (even a
+container-like name such as get or put: users.get(id) may be UserService.get
+on an undeclared field), or a method that does not parse - makes the class
+ambiguous, and such classes are left for the LLM.
+"""
+
+import os
+import re
+import logging
+from typing import List, Dict, Any, Optional, Tuple, Set
+from tree_sitter import QueryCursor
+
+from src.components.LanguageFinder import LanguageFinder
+from src.core.config import AppConfig
+
+from .base_extractor import BaseASTExtractor
+
+logger = logging.getLogger(__name__)
+
+QUERIES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'extractor', 'queries'
+)
+
+# LanguageFinder name -> (tree-sitter language, call query file, snippet wrapper)
+CALL_GRAPH_LANGUAGES = {
+    'java': ('java', 'java.scm', ("class _ {\n", "\n}")),
+    'typescript': ('typescript', 'typescript.scm', ("class _ {\n", "\n}")),
+    'python': ('python', 'python.scm', ("class _:\n    ", "\n")),
+    'c_sharp': ('csharp', 'c_sharp.scm', ("class _ {\n", "\n}")),
+}
+
+SELF_RECEIVERS = {'this', 'self', 'base', 'super'}
+IDENTIFIER_RE = re.compile(r'^[A-Za-z_$][A-Za-z0-9_$]*$')
+GENERIC_RE = re.compile(r'[<\[].*$')
+
+# Call site: (receiver text or None for a bare call, called method name)
+Call = Tuple[Optional[str], str]
+
+
+class CallGraphExtractor(BaseASTExtractor):
+    """
+    Extracts the calls made inside method bodies for one language.
+
+    Usage:
+        extractor = CallGraphExtractor('java')
+        calls, declared_types = extractor.method_calls(method['method_definition'])
+    """
+
+    def __init__(self, language: str, config: Optional[AppConfig] = None):
+        ts_language, query_file, wrapper = CALL_GRAPH_LANGUAGES[language]
+        super().__init__(ts_language, config)
+        self.query_path = os.path.join(QUERIES_DIR, 'calls', query_file)
+        self._prefix, self._suffix = wrapper
+
+    def _collect(self, root_node, code_bytes: bytes) -> Tuple[List[Call], Dict[str, str]]:
+        query = self._load_query(self.query_path)
+        if not query:
+            return [], {}
+
+        calls: List[Call] = []
+        declared_types: Dict[str, str] = {}
+        for _, captures in QueryCursor(query).matches(root_node):
+            if "callee" in captures:
+                receiver = captures["receiver"][0] if "receiver" in captures else None
+                callee = GENERIC_RE.sub('', self._get_text(captures["callee"][0], code_bytes))
+                calls.append((self._get_text(receiver, code_bytes) if receiver else None, callee))
+            elif "decl_name" in captures:
+                name = self._get_text(captures["decl_name"][0], code_bytes)
+                declared_types[name] = self._get_text(captures["decl_type"][0], code_bytes)
+        return calls, declared_types
+
+    def method_calls(self, method_definition: str) -> Optional[Tuple[List[Call], Dict[str, str]]]:
+        """
+        Return (calls, declared_types) for one method definition.
+
+        The definition is wrapped in a dummy class so it parses as a member.
+        Returns None when the language is unavailable or the code does not
+        parse cleanly, i.e. when the result could not be trusted.
+        """
+        if not self.parser:
+            return None
+        code_bytes = f"{self._prefix}{method_definition}{self._suffix}".encode('utf8')
+        tree = self.parser.parse(code_bytes)
+        if tree.root_node.has_error:
+            return None
+        return self._collect(tree.root_node, code_bytes)
+
+    def extract(self, file_path: str) -> List[Dict[str, Any]]:
+        """Return every call in a source file as {"receiver", "method", "line"}."""
+        tree, code_bytes = self.parse_file(file_path)
+        if not tree or not code_bytes:
+            return []
+
+        query = self._load_query(self.query_path)
+        if not query:
+            return []
+        results = []
+        for _, captures in QueryCursor(query).matches(tree.root_node):
+            if "callee" not in captures:
+                continue
+            receiver = captures["receiver"][0] if "receiver" in captures else None
+            results.append({
+                "receiver": self._get_text(receiver, code_bytes) if receiver else None,
+                "method": GENERIC_RE.sub('', self._get_text(captures["callee"][0], code_bytes)),
+                "line": captures["call"][0].start_point[0] + 1,
+            })
+        return results
+
+
+class StaticDependencyResolver:
+    """
+    Maps classes to their internal dependencies from the syntax tree alone.
+
+    Usage:
+        resolver = StaticDependencyResolver(known_classes=all_ast_data)
+        mapped, ambiguous = resolver.resolve(ast_data_list)
+        # mapped: {class_name: {"methods": [...]}}, ambiguous: classes for the LLM
+    """
+
+    def __init__(
+        self,
+        known_classes: Optional[List[dict]] = None,
+        config: Optional[AppConfig] = None,
+        language_finder: Optional[LanguageFinder] = None
+    ):
+        """
+        Args:
+            known_classes: Every class of the project, used to tell internal
+                calls from external ones. Defaults to the classes being resolved.
+            config: Shared app config passed to the extractors
+            language_finder: Detects a class's language from its file name
+        """
+        self.config = config
+        self._language_finder = language_finder or LanguageFinder()
+        self._extractors: Dict[str, Optional[CallGraphExtractor]] = {}
+        self._methods_by_class: Dict[str, Set[str]] = {}
+        self._class_keys: Dict[str, str] = {}
+        self._project_methods: Set[str] = set()
+        if known_classes is not None:
+            self.index_project(known_classes)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        # authService, auth_service, _authService -> authservice
+        return name.replace('_', '').lower()
+
+    def index_project(self, classes: List[dict]):
+        """Record the project's classes and method names."""
+        for cls in classes:
+            class_name = cls.get('class_name')
+            if not class_name:
+                continue
+            methods = {m.get('method_name') for m in cls.get('methods', []) if m.get('method_name')}
+            self._methods_by_class.setdefault(class_name, set()).update(methods)
+            self._class_keys.setdefault(self._key(class_name), class_name)
+            self._project_methods.update(methods)
+
+    def _extractor(self, ast_data: dict) -> Optional[CallGraphExtractor]:
+        file_name = ast_data.get('file_name', '')
+        if file_name.endswith('.json'):
+            file_name = file_name[:-len('.json')]
+        language = self._language_finder.detect(file_name)
+        if language not in CALL_GRAPH_LANGUAGES:
+            return None
+        if language not in self._extractors:
+            self._extractors[language] = CallGraphExtractor(language, config=self.config)
+        return self._extractors[language]
+
+    def _project_class(self, type_name: str) -> Optional[str]:
+        """Return the project class a declared type refers to, if any."""
+        base = GENERIC_RE.sub('', type_name).strip().rstrip('?').split('.')[-1]
+        if base in self._methods_by_class:
+            return base
+        # C# interfaces: IUserService -> UserService
+        if len(base) > 2 and base[0] == 'I' and base[1].isupper() and base[1:] in self._methods_by_class:
+            return base[1:]
+        return None
+
+    def _resolve_call(
+        self,
+        call: Call,
+        class_name: str,
+        declared_types: Dict[str, str]
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Classify one call site.
+
+        Returns:
+            (dependency or None, ambiguous)
+        """
+        receiver, callee = call
+        known_callee = callee in self._project_methods
+
+        if receiver is None:
+            if callee in self._methods_by_class.get(class_name, ()):
+                return f"this.{callee}", False
+            return None, known_callee
+
+        if receiver in SELF_RECEIVERS:
+            return f"{receiver}.{callee}", False
+
+        # this.authService / self.auth_service -> the field name
+        head, _, field = receiver.partition('.')
+        if head in SELF_RECEIVERS and IDENTIFIER_RE.match(field):
+            receiver = field
+        elif not IDENTIFIER_RE.match(receiver):
+            return None, known_callee
+
+        if receiver in declared_types:
+            target = self._project_class(declared_types[receiver])
+            if target is None:
+                # Declared with a library type (Map, string, Request, ...)
+                return None, False
+        else:
+            target = self._class_keys.get(self._key(receiver)) or self._project_class(receiver)
+
+        if target is not None:
+            if callee in self._methods_by_class[target]:
+                return f"{receiver}.{callee}", False
+            # Inherited or interface method of a project class
+            return None, True
+        return None, known_callee
+
+    def resolve_class(self, ast_data: dict) -> Optional[dict]:
+        """
+        Map one class statically.
+
+        Returns:
+            {"methods": [{"method", "dependencies", "is_api_route"}]} or None
+            when the class has to go to the LLM.
+        """
+        extractor = self._extractor(ast_data)
+        if extractor is None:
+            return None
+
+        class_name = ast_data['class_name']
+        methods = []
+        for method in ast_data.get('methods', []):
+            parsed = extractor.method_calls(method.get('method_definition', ''))
+            if parsed is None:
+                return None
+            calls, declared_types = parsed
+
+            dependencies = []
+            for call in calls:
+                dependency, ambiguous = self._resolve_call(call, class_name, declared_types)
+                if ambiguous:
+                    logger.debug(f"{class_name}.{method.get('method_name')}: cannot resolve {call}")
+                    return None
+                if dependency and dependency not in dependencies:
+                    dependencies.append(dependency)
+
+            methods.append({
+                "method": method.get('method_name', ''),
+                "dependencies": dependencies,
+                "is_api_route": method.get('is_api_route', False)
+            })
+        return {"methods": methods}
+
+    def resolve(self, ast_data_list: List[dict]) -> Tuple[Dict[str, dict], List[dict]]:
+        """
+        Split classes into statically mapped ones and ambiguous ones.
+
+        Returns:
+            (mapped {class_name: mapping}, ambiguous classes in input order)
+        """
+        if not self._methods_by_class:
+            self.index_project(ast_data_list)
+
+        mapped, ambiguous = {}, []
+        for ast_data in ast_data_list:
+            mapping = self.resolve_class(ast_data)
+            if mapping is None:
+                ambiguous.append(ast_data)
+            else:
+                mapped[ast_data['class_name']] = mapping
+        return mapped, ambiguous
@@ -1,24 +1,24 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from tree_sitter import QueryCursor
 
+from src.core.config import AppConfig
+
 from .base_extractor import BaseASTExtractor
 
 class CSharpASTExtractor(BaseASTExtractor):
-    def __init__(self):
-        super().__init__('csharp')
+    def __init__(self, config: Optional[AppConfig] = None):
+        super().__init__('csharp', config)
 
         self.language = self._load_language()
-        
-    def extract(self, file_path: str) -> List[Dict[str, Any]]:
-        
-        # Re-verify query path
-        query_path = os.path.join(
+        self.query_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)),
             'extractor', 'queries', 'controllers', 'c_sharp.scm'
         )
         
-        query = self._load_query(query_path)
+    def extract(self, file_path: str) -> List[Dict[str, Any]]:
+        
+        query = self._load_query(self.query_path)
         if not query: 
             return []
 
@@ -1,7 +1,9 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from tree_sitter import QueryCursor
 
+from src.core.config import AppConfig
+
 from .base_extractor import BaseASTExtractor
 
 # Assuming QUERIES_DIR is available or passed. 
@@ -12,12 +14,12 @@ QUERIES_DIR = os.path.join(
 )
 
 class JavaASTExtractor(BaseASTExtractor):
-    def __init__(self):
-        super().__init__('java')
+    def __init__(self, config: Optional[AppConfig] = None):
+        super().__init__('java', config)
+        self.query_path = os.path.join(QUERIES_DIR, 'controllers', 'java.scm')
 
     def extract(self, file_path: str) -> List[Dict[str, Any]]:
-        query_path = os.path.join(QUERIES_DIR, 'controllers', 'java.scm')
-        query = self._load_query(query_path)
+        query = self._load_query(self.query_path)
         if not query: return []
 
         tree, code_bytes = self.parse_file(file_path)
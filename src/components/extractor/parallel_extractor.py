@@ -0,0 +1,113 @@
+"""
+ParallelASTExtractor - runs ASTExtractor over many files on a process pool.
+
+Each worker process builds its own ASTExtractor (and therefore its own
+tree-sitter parsers and compiled queries) exactly once, then extracts the
+files it is handed. Results are yielded in the same order as the input
+file list, so the output is identical to the serial path regardless of
+the number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from src.components.LanguageFinder import LanguageFinder
+from src.core.config import AppConfig, get_app_config
+
+from .ast_extractor import ASTExtractor, EXTRACTOR_CLASSES
+
+# Per-process extractor, created once by the pool initializer
+_worker_extractor: Optional[ASTExtractor] = None
+
+
+def _init_worker(config: AppConfig):
+    global _worker_extractor
+    _worker_extractor = ASTExtractor(config=config)
+
+
+def _extract_file(extractor: ASTExtractor, file_path: str) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Extract one file, returning (chunks, cache_hits, cache_misses)."""
+    cache = extractor.cache
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    try:
+        chunks = extractor.extract_by_query(file_path) or []
+    except Exception as e:
+        print(f"Error extracting from {os.path.basename(file_path)}: {e}")
+        chunks = []
+    if cache:
+        return chunks, cache.hits - hits, cache.misses - misses
+    return chunks, 0, 0
+
+
+def _extract_in_worker(file_path: str) -> Tuple[List[Dict[str, Any]], int, int]:
+    return _extract_file(_worker_extractor, file_path)
+
+
+class ParallelASTExtractor:
+    """
+    Extracts class/method dicts from a list of files, optionally in parallel.
+
+    Usage:
+        extractor = ParallelASTExtractor(workers=8)
+        all_ast_data = extractor.extract(file_paths)
+    """
+
+    def __init__(self, workers: int = 0, chunksize: int = 16, config: Optional[AppConfig] = None):
+        """
+        Args:
+            workers: Number of worker processes. 0 uses os.cpu_count(),
+                1 runs serially in the current process.
+            chunksize: Number of files sent to a worker per task.
+            config: Pipeline config handed to every worker's extractor
+        """
+        self.config = config or get_app_config()
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunksize = max(1, chunksize)
+        self._language_finder = LanguageFinder()
+        # AST cache counters summed over every process of the last run
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def _supported(self, file_path: str) -> bool:
+        return self._language_finder.detect(file_path) in EXTRACTOR_CLASSES
+
+    def supported_paths(self, file_paths: Iterable[str]) -> List[str]:
+        """Return the files iter_extract would extract, in input order."""
+        return [p for p in file_paths if self._supported(p)]
+
+    def iter_extract(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Yield (file_path, chunks) for every supported file, in input order.
+
+        Unsupported files are filtered out before being sent to a worker.
+        """
+        self.cache_stats = {"hits": 0, "misses": 0}
+        paths = self.supported_paths(file_paths)
+        if not paths:
+            return
+
+        if self.workers == 1 or len(paths) == 1:
+            extractor = ASTExtractor(config=self.config)
+            results = (_extract_file(extractor, path) for path in paths)
+            pool = None
+        else:
+            workers = min(self.workers, len(paths))
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.config,))
+            # Executor.map preserves input order while workers run ahead
+            results = pool.map(_extract_in_worker, paths, chunksize=self.chunksize)
+
+        try:
+            for path, (chunks, hits, misses) in zip(paths, results):
+                self.cache_stats["hits"] += hits
+                self.cache_stats["misses"] += misses
+                yield path, chunks
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def extract(self, file_paths: Iterable[str]) -> List[Dict[str, Any]]:
+        """Extract all files and return the concatenated class dicts."""
+        all_ast_data = []
+        for _, chunks in self.iter_extract(file_paths):
+            all_ast_data.extend(chunks)
+        return all_ast_data
@@ -0,0 +1,23 @@
+; C# calls and typed locals, used by the static dependency pass
+(invocation_expression
+  function: [
+    (member_access_expression
+      expression: (_) @receiver
+      name: (_) @callee
+    )
+    (identifier) @callee
+    (generic_name) @callee
+  ]
+) @call
+
+(parameter
+  type: (_) @decl_type
+  name: (identifier) @decl_name
+)
+
+(variable_declaration
+  type: (_) @decl_type
+  (variable_declarator
+    name: (identifier) @decl_name
+  )
+)
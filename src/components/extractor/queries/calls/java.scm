@@ -0,0 +1,17 @@
+; Java calls and typed locals, used by the static dependency pass
+(method_invocation
+  object: (_)? @receiver
+  name: (identifier) @callee
+) @call
+
+(formal_parameter
+  type: (_) @decl_type
+  name: (identifier) @decl_name
+)
+
+(local_variable_declaration
+  type: (_) @decl_type
+  declarator: (variable_declarator
+    name: (identifier) @decl_name
+  )
+)
@@ -0,0 +1,25 @@
+; Python calls and annotated locals, used by the static dependency pass
+(call
+  function: [
+    (attribute
+      object: (_) @receiver
+      attribute: (identifier) @callee
+    )
+    (identifier) @callee
+  ]
+) @call
+
+(typed_parameter
+  (identifier) @decl_name
+  type: (type) @decl_type
+)
+
+(typed_default_parameter
+  name: (identifier) @decl_name
+  type: (type) @decl_type
+)
+
+(assignment
+  left: (identifier) @decl_name
+  type: (type) @decl_type
+)
@@ -0,0 +1,31 @@
+; TypeScript calls and typed locals, used by the static dependency pass
+(call_expression
+  function: [
+    (member_expression
+      object: (_) @receiver
+      property: (property_identifier) @callee
+    )
+    (identifier) @callee
+  ]
+) @call
+
+(required_parameter
+  pattern: (identifier) @decl_name
+  type: (type_annotation
+    (_) @decl_type
+  )
+)
+
+(optional_parameter
+  pattern: (identifier) @decl_name
+  type: (type_annotation
+    (_) @decl_type
+  )
+)
+
+(variable_declarator
+  name: (identifier) @decl_name
+  type: (type_annotation
+    (_) @decl_type
+  )
+)
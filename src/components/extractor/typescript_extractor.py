@@ -1,7 +1,9 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from tree_sitter import QueryCursor
 
+from src.core.config import AppConfig
+
 from .base_extractor import BaseASTExtractor
 
 QUERIES_DIR = os.path.join(
@@ -10,12 +12,12 @@ QUERIES_DIR = os.path.join(
 )
 
 class TypeScriptASTExtractor(BaseASTExtractor):
-    def __init__(self):
-        super().__init__('typescript')
+    def __init__(self, config: Optional[AppConfig] = None):
+        super().__init__('typescript', config)
+        self.query_path = os.path.join(QUERIES_DIR, 'controllers', 'typescript.scm')
 
     def extract(self, file_path: str) -> List[Dict[str, Any]]:
-        query_path = os.path.join(QUERIES_DIR, 'controllers', 'typescript.scm')
-        query = self._load_query(query_path)
+        query = self._load_query(self.query_path)
         if not query: return []
 
         tree, code_bytes = self.parse_file(file_path)
@@ -1,7 +1,23 @@
 import os
+import logging
+import threading
 import yaml
 from typing import Any, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+
+def _get_nested(config: Dict[str, Any], path: str, default=None):
+    keys = path.split(".")
+    val = config
+    for k in keys:
+        if isinstance(val, dict):
+            val = val.get(k)
+        else:
+            return default
+    return val if val is not None else default
+
+
 class Settings:
     _instance = None
 
@@ -11,11 +27,42 @@ class Settings:
                 "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
                 "top_k_retriever": 10,
                 "top_k_reranker": 5,
-                "chunk_size": 500
+                "chunk_size": 500,
+                "embedding_cache": {
+                    "enabled": True,
+                    "path": ".docgen_cache/embeddings"
+                },
+                "allow_reset": False,
+                "retrieval": {
+                    "mode": "hybrid",
+                    "keyword_top_k": 10,
+                    "rrf_k": 60
+                },
+                "reranker": {
+                    "model": "cross-encoder/ms-marco-MiniLM-L-6-v2",
+                    "device": "auto",
+                    "batch_size": 16,
+                    "max_candidates": 20,
+                    "skip_below": 5,
+                    "quantize_int8": False,
+                    "latency_budget_ms": 300
+                },
+                "query_cache": {
+                    "enabled": True,
+                    "embedding_entries": 1024,
+                    "retrieval_entries": 512,
+                    "version_path": ".docgen_cache/index_version"
+                }
             },
             "app": {
                 "environment": "development"
             },
+            "document_store": {
+                "backend": "weaviate",
+                "path": ".docgen_cache/vector_store",
+                "nprobe": 8,
+                "ivf_min_rows": 4096
+            },
             # Core/Env vars
             "WEAVIATE_URL": os.getenv("WEAVIATE_URL", "http://127.0.0.1:8080"),
             "WEAVIATE_API_KEY": os.getenv("WEAVIATE_API_KEY", None),
@@ -43,14 +90,7 @@ class Settings:
                 d[k] = v
 
     def get(self, path: str, default=None):
-        keys = path.split(".")
-        val = self.config
-        for k in keys:
-            if isinstance(val, dict):
-                val = val.get(k)
-            else:
-                return default
-        return val if val is not None else default
+        return _get_nested(self.config, path, default)
 
     # Shortcuts for code readability
     @property
@@ -66,6 +106,102 @@ class Settings:
     @property
     def EMBEDDING_MODEL(self): return self.config["rag"]["embedding_model"]
     @property
-    def RERANKER_MODEL(self): return "cross-encoder/ms-marco-MiniLM-L-6-v2" # Hardcoded backup or from yaml
+    def RERANKER_MODEL(self): return self.get("rag.reranker.model", "cross-encoder/ms-marco-MiniLM-L-6-v2")
 
 settings = Settings()
+
+
+class AppConfig:
+    """
+    Typed, cached view of the pipeline config file (config.yaml).
+
+    The YAML is parsed once and shared by every extractor, mapper and creator
+    that receives this object. Long-running processes call reload_if_changed()
+    to pick up edits; it only re-reads the file when its mtime has moved.
+    """
+
+    def __init__(self, path: str = "config.yaml"):
+        self.path = path
+        self.config: Dict[str, Any] = {}
+        self._mtime: Optional[float] = None
+        self.load()
+
+    @property
+    def exists(self) -> bool:
+        return self._mtime is not None
+
+    def load(self):
+        """
+        (Re)load the YAML file. A missing file yields an empty config.
+
+        Raises:
+            ValueError: If the file is not valid YAML
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self.config, self._mtime = {}, None
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                self.config = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Error parsing YAML in {self.path}: {e}")
+        self._mtime = mtime
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the file if its mtime changed since the last load.
+
+        Returns:
+            True if the config was reloaded
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+
+        try:
+            self.load()
+        except ValueError as e:
+            # Keep serving the last good config rather than failing callers
+            logger.warning(f"Ignoring invalid config edit: {e}")
+            return False
+        logger.info(f"Reloaded config from {self.path}")
+        return True
+
+    def get(self, path: str, default=None):
+        return _get_nested(self.config, path, default)
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """Return a top-level mapping, or an empty dict if missing."""
+        value = self.config.get(name)
+        return value if isinstance(value, dict) else {}
+
+    # Typed shortcuts for the keys read on hot paths
+    @property
+    def verbose(self) -> bool: return bool(self.config.get("verbose", False))
+    @property
+    def save_ast(self) -> bool: return bool(self.config.get("save_ast", False))
+    @property
+    def save_ast_path(self) -> str: return self.config.get("save_ast_path") or "ast"
+    @property
+    def mapper_output_path(self) -> str: return self.config.get("mapper_output_path") or "mapped_ast.json"
+
+
+_app_configs: Dict[str, AppConfig] = {}
+_app_configs_lock = threading.Lock()
+
+
+def get_app_config(path: str = "config.yaml") -> AppConfig:
+    """
+    Return the process-wide AppConfig for a config file, loading it on first use.
+    """
+    key = os.path.abspath(path)
+    with _app_configs_lock:
+        if key not in _app_configs:
+            _app_configs[key] = AppConfig(key)
+        return _app_configs[key]
@@ -1,4 +1,5 @@
 import os
+import threading
 from src.utils.logging import configure_logging
 
 configure_logging()
@@ -10,23 +11,28 @@ from haystack import Pipeline
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder, SentenceTransformersTextEmbedder
 
 from src.components.ASTOutputChunker import ASTOutputChunker
+from src.components.BudgetedReranker import BudgetedReranker
+from src.components.HybridRetriever import HybridRetriever
 
 from haystack.components.writers import DocumentWriter
+from haystack.document_stores.types import DuplicatePolicy
 from haystack.components.retrievers.in_memory import InMemoryEmbeddingRetriever
-from haystack.components.rankers import SentenceTransformersSimilarityRanker
 from haystack.components.builders import PromptBuilder
-from haystack.utils import ComponentDevice
 from haystack.document_stores.in_memory import InMemoryDocumentStore
 from haystack.dataclasses import Document
-from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
-from haystack_integrations.components.retrievers.weaviate import WeaviateEmbeddingRetriever
 from phoenix.otel import register
 
 from src.core.config import settings
+from src.utils.embedding_cache import EmbeddingCache, CachedDocumentEmbedder
+from src.utils.query_cache import IndexVersion, LRUCache, CachedTextEmbedder, CachedRetriever
+from src.utils.document_store import get_document_store, get_embedding_retriever
 from src.pipelines.llm_factory import LLMFactory
 
 class RAGService:
     _instrumented = False
+    # Warmed query pipelines, keyed by process id (models are not shared across fork)
+    _query_pipelines: Dict[int, Pipeline] = {}
+    _query_pipeline_lock = threading.Lock()
 
     def __init__(self):
         # Phoenix Tracing Setup
@@ -46,8 +52,9 @@ class RAGService:
         if settings.GOOGLE_API_KEY:
              headers["X-Goog-Studio-Api-Key"] = settings.GOOGLE_API_KEY
         
-        self.document_store = WeaviateDocumentStore(
-            url=settings.WEAVIATE_URL, 
+        self.document_store = get_document_store(
+            settings,
+            weaviate_url=settings.WEAVIATE_URL,
             additional_headers=headers
         )
         
@@ -55,6 +62,9 @@ class RAGService:
         self.embedding_model = settings.EMBEDDING_MODEL
         self.reranker_model = settings.RERANKER_MODEL
 
+        # Bumped on every write so cached retrieval results are never served stale
+        self.index_version = IndexVersion(settings.get("rag.query_cache.version_path", ".docgen_cache/index_version"))
+
     def indexing_pipeline(self, ast_data: List[dict]):
         """
         Creates and runs the indexing pipeline.
@@ -66,7 +76,11 @@ class RAGService:
 
 
         embedder = SentenceTransformersDocumentEmbedder(model=self.embedding_model)
-        writer = DocumentWriter(document_store=self.document_store)
+        if settings.get("rag.embedding_cache.enabled", True):
+            # Unchanged chunks reuse their stored vectors instead of hitting the model
+            cache = EmbeddingCache(settings.get("rag.embedding_cache.path", ".docgen_cache/embeddings"), self.embedding_model)
+            embedder = CachedDocumentEmbedder(embedder, cache)
+        writer = DocumentWriter(document_store=self.document_store, policy=DuplicatePolicy.OVERWRITE)
         
         # Connections
         pipeline.add_component("splitter", splitter)
@@ -78,20 +92,40 @@ class RAGService:
         
         # Run
         pipeline.run({"splitter": {"ast_data_list": ast_data}})
+        self.index_version.bump()
 
-    def search_and_generate(self, query: str) -> str:
+    def _build_query_pipeline(self) -> Pipeline:
         """
-        Retrieval and Generation Pipeline.
+        Builds the retrieval and generation pipeline.
         """
         pipeline = Pipeline()
         
         # Components
         text_embedder = SentenceTransformersTextEmbedder(model=self.embedding_model)
-        retriever = WeaviateEmbeddingRetriever(document_store=self.document_store, top_k=settings.get("rag.top_k_retriever", 10))
-        reranker = SentenceTransformersSimilarityRanker(
-            model="cross-encoder/ms-marco-MiniLM-L-6-v2",
-            top_k=5,
-            device=ComponentDevice.from_str("cuda") 
+        retriever = get_embedding_retriever(self.document_store, top_k=settings.get("rag.top_k_retriever", 10))
+        if settings.get("rag.query_cache.enabled", True):
+            # Repeated questions skip the embedding model and, until the index changes, Weaviate
+            text_embedder = CachedTextEmbedder(text_embedder, LRUCache(settings.get("rag.query_cache.embedding_entries", 1024)))
+            retriever = CachedRetriever(retriever, LRUCache(settings.get("rag.query_cache.retrieval_entries", 512)), self.index_version)
+        if settings.get("rag.retrieval.mode", "hybrid") == "hybrid":
+            # Exact identifier matches (BM25 over names and code) fused with vector hits
+            retriever = HybridRetriever(
+                retriever,
+                self.document_store,
+                self.index_version,
+                top_k=settings.get("rag.top_k_retriever", 10),
+                keyword_top_k=settings.get("rag.retrieval.keyword_top_k", None),
+                rrf_k=settings.get("rag.retrieval.rrf_k", 60)
+            )
+        reranker = BudgetedReranker(
+            model=self.reranker_model,
+            device=settings.get("rag.reranker.device", "auto"),
+            top_k=settings.get("rag.top_k_reranker", 5),
+            batch_size=settings.get("rag.reranker.batch_size", 16),
+            max_candidates=settings.get("rag.reranker.max_candidates", 20),
+            skip_below=settings.get("rag.reranker.skip_below", 0),
+            quantize_int8=settings.get("rag.reranker.quantize_int8", False),
+            latency_budget_ms=settings.get("rag.reranker.latency_budget_ms", 0)
         )
         prompt_template = """
         You are an expert API documentation generator.
@@ -122,22 +156,98 @@ class RAGService:
         pipeline.connect("retriever", "reranker")
         pipeline.connect("reranker", "prompt_builder.documents")
         pipeline.connect("prompt_builder", "generator")
+
+        return pipeline
+
+    def get_query_pipeline(self) -> Pipeline:
+        """
+        Returns the process-wide query pipeline, building and warming it on first use.
+
+        Model weights are loaded once by warm_up() and then shared by every call.
+        Pipeline.run keeps its per-run state local, so concurrent queries can
+        share one warmed pipeline; only the first build is serialized.
+        """
+        pid = os.getpid()
+        pipeline = RAGService._query_pipelines.get(pid)
+        if pipeline is None:
+            with RAGService._query_pipeline_lock:
+                pipeline = RAGService._query_pipelines.get(pid)
+                if pipeline is None:
+                    pipeline = self._build_query_pipeline()
+                    pipeline.warm_up()
+                    RAGService._query_pipelines[pid] = pipeline
+        return pipeline
+
+    @classmethod
+    def reset_query_pipeline(cls):
+        """
+        Drops the cached query pipeline so the next query rebuilds it (e.g. after a settings change).
+        """
+        with cls._query_pipeline_lock:
+            cls._query_pipelines.pop(os.getpid(), None)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Dict]:
+        """
+        Returns hit rate and saved latency of the query caches in this process.
+        """
+        pipeline = cls._query_pipelines.get(os.getpid())
+        if pipeline is None:
+            return {}
+        stats = {}
+        for name in ("text_embedder", "retriever"):
+            component = pipeline.get_component(name)
+            # The hybrid retriever wraps the cached vector retriever
+            component = getattr(component, "vector_retriever", component)
+            cache = getattr(component, "cache", None)
+            if cache is not None:
+                stats[name] = cache.stats()
+        return stats
+
+    def search_and_generate(self, query: str) -> str:
+        """
+        Retrieval and Generation Pipeline.
+        """
+        pipeline = self.get_query_pipeline()
         
         # Run
-        result = pipeline.run({
+        inputs = {
             "text_embedder": {"text": query},
             "reranker": {"query": query},
             "prompt_builder": {"query": query}
-        })
+        }
+        if isinstance(pipeline.get_component("retriever"), HybridRetriever):
+            inputs["retriever"] = {"query": query}
+        result = pipeline.run(inputs)
 
         return result["generator"]["replies"][0]
 
-    def reset_knowledge_base(self):
+    def reset_knowledge_base(self, repo: Optional[str] = None) -> int:
         """
-        Clears the document store (if policy allows).
+        Clears the document store. Disabled unless rag.allow_reset is set to true.
+
+        Args:
+            repo: Only delete the documents written for this repository; None clears everything
+
+        Returns:
+            Number of documents deleted
         """
-        # Logic to delete old documents
-        pass
+        if not settings.get("rag.allow_reset", False):
+            print("Knowledge base reset is disabled (rag.allow_reset: false).")
+            return 0
+
+        if repo is not None:
+            deleted = self.document_store.delete_by_filter(
+                filters={"field": "meta.repo", "operator": "==", "value": repo}
+            )
+            self.index_version.bump()
+            return deleted
+
+        count = self.document_store.count_documents()
+        # Dropping and recreating the collection is much faster than deleting object by object
+        self.document_store.delete_all_documents(recreate_index=True)
+        self.index_version.bump()
+        return count
 
     def learn_framework(self, framework_name: str):
         """
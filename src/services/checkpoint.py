@@ -0,0 +1,166 @@
+"""
+Checkpoint and resume support for long-running documentation jobs.
+
+A job is identified by a stable key derived from its source (repository or
+folder, commit, base commit), not by its job id, so a job restarted after a
+crash finds the work the previous attempt already finished.
+
+Two levels are recorded under checkpoint.path/<job key>/:
+
+- stage level (stages.json): the result of every completed stage, e.g. the
+  extracted classes, together with a fingerprint of that stage's input.
+- item level (<stage>.jsonl): one line per completed item, e.g. a mapped class
+  or a documented endpoint, appended and flushed as soon as it completes.
+
+Items carry a fingerprint of their input (class definitions, endpoint prompt)
+and are only reused when it still matches.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of any JSON-serializable value."""
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageCheckpoint:
+    """
+    Append-only log of completed items for one stage.
+
+    Usage:
+        stage = checkpoint.stage("map")
+        mapping = stage.get("AuthController", fp)
+        if mapping is None:
+            mapping = map_class(...)
+            stage.put("AuthController", fp, mapping)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from a crash mid-write
+                        continue
+                    self._items[item["key"]] = item
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str, item_fingerprint: str) -> Optional[Any]:
+        """Return the recorded value for key, or None if missing or stale."""
+        item = self._items.get(key)
+        if item is None or item.get("fingerprint") != item_fingerprint:
+            return None
+        return item.get("value")
+
+    def put(self, key: str, item_fingerprint: str, value: Any):
+        """Record a completed item; safe to call from worker threads."""
+        item = {"key": key, "fingerprint": item_fingerprint, "value": value}
+        line = json.dumps(item, default=str) + "\n"
+        with self._lock:
+            self._items[key] = item
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                logger.warning(f"Could not write checkpoint for {key}: {e}")
+
+
+class JobCheckpoint:
+    """
+    Stage- and item-level checkpoints of one job.
+
+    Usage:
+        checkpoint = JobCheckpoint(".docgen_cache/checkpoints", JobCheckpoint.make_key("git", url, sha))
+        chunks = checkpoint.stage_result("extract", input_fp)
+        if chunks is None:
+            chunks = extract(...)
+            checkpoint.complete_stage("extract", input_fp, chunks)
+        mapper = CodeMapper(config=config, checkpoint=checkpoint.stage("map"))
+        ...
+        checkpoint.clear()   # job finished
+    """
+
+    def __init__(self, state_dir: str, job_key: str):
+        self.job_key = job_key
+        self.path = os.path.join(state_dir, job_key)
+        self._stages: Dict[str, StageCheckpoint] = {}
+        self._stage_results: Dict[str, Dict[str, Any]] = self._read_stage_results()
+
+    @staticmethod
+    def make_key(*parts: Optional[str]) -> str:
+        # Credentials in URLs must not change the key (or end up on disk)
+        cleaned = [re.sub(r"://[^/@]*@", "://", part or "") for part in parts]
+        return hashlib.sha256("\0".join(cleaned).encode("utf-8")).hexdigest()[:24]
+
+    @property
+    def _stages_path(self) -> str:
+        return os.path.join(self.path, "stages.json")
+
+    def _read_stage_results(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._stages_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable stage checkpoint {self._stages_path}: {e}")
+            return {}
+
+    def stage(self, name: str) -> StageCheckpoint:
+        """Item-level checkpoint of a stage."""
+        if name not in self._stages:
+            self._stages[name] = StageCheckpoint(os.path.join(self.path, f"{name}.jsonl"))
+        return self._stages[name]
+
+    def stage_result(self, name: str, input_fingerprint: str) -> Optional[Any]:
+        """Result of a completed stage, or None if it has not completed for this input."""
+        entry = self._stage_results.get(name)
+        if entry is None or entry.get("fingerprint") != input_fingerprint:
+            return None
+        return entry.get("result")
+
+    def complete_stage(self, name: str, input_fingerprint: str, result: Any):
+        """Persist a stage result atomically."""
+        self._stage_results[name] = {"fingerprint": input_fingerprint, "result": result}
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{self._stages_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._stage_results, f, default=str)
+            os.replace(tmp_path, self._stages_path)
+        except OSError as e:
+            logger.warning(f"Could not write stage checkpoint {name}: {e}")
+
+    def clear(self):
+        """Drop every checkpoint of this job, e.g. once it completed."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._stages = {}
+        self._stage_results = {}
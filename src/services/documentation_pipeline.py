@@ -0,0 +1,252 @@
+"""
+Documentation pipeline - the work behind one /generate job.
+
+process_documentation fetches the source (git clone or local folder),
+extracts the AST, maps dependencies and saves the mapping. With
+doc_creator.enabled it then documents the API endpoints; an incremental run
+only regenerates the endpoints whose definition or dependencies changed. It is run by the
+worker processes of the job queue (see src/services/job_queue.py) and reports
+status changes through a callback instead of touching any API state.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from src.services.input_handler import InputHandler
+from src.core.config import get_app_config
+from src.components.extractor.parallel_extractor import ParallelASTExtractor
+from src.components.CodeMapper import CodeMapper
+from src.components.DocumentationCreator import DocumentationCreator
+from src.services.incremental import IncrementalPlan, RunManifestStore
+from src.services.checkpoint import JobCheckpoint, fingerprint
+from src.services.progress import ProgressTracker
+from src.services.result_cache import result_cache_from_config
+from src.services.git_mirror import git_mirror_from_config
+from src.services.file_discovery import file_discovery_from_config
+
+PIPELINE_STAGES = ["clone", "extract", "map"]
+DOCUMENT_STAGE = "document"
+
+
+def process_documentation(
+    source_type: str,
+    path: str,
+    credentials: Optional[str],
+    job_id: str,
+    base_commit: Optional[str] = None,
+    report: Optional[Callable[[Dict[str, Any]], None]] = None,
+    result_key: Optional[str] = None,
+    revision: Optional[str] = None,
+    ref: Optional[str] = None
+):
+    """
+    Run one documentation job end to end: fetch the source, extract, map and save.
+
+    Args:
+        source_type: 'git' or 'local'
+        path: Repository URL or local folder
+        credentials: Optional git token
+        job_id: Id used in log lines and as the name of the job's mapping file
+        base_commit: Previously processed commit SHA, enables incremental mode (git only)
+        report: Receives the job's status dict whenever it changes; the last
+            call carries the terminal status ("completed" or "failed"). While
+            running, the dict carries a "progress" entry (see ProgressTracker).
+        result_key: Request key the API coalesced this job under; the result
+            is stored in the result cache under it
+        revision: Commit the key was derived from (git); the result is only
+            cached if the clone checked out that commit
+        ref: Branch, tag or commit to document (git only, default: remote HEAD)
+    """
+    publish = report or (lambda status: None)
+    print(f"Starting processing for {path} (Job ID: {job_id})")
+    working_dir = None
+    head_commit = None
+    
+    # Shared config, re-read only if config.yaml changed since the last job
+    config = get_app_config()
+    config.reload_if_changed()
+    discovery = file_discovery_from_config(config)
+    input_handler = InputHandler(
+        mirror_cache=git_mirror_from_config(config),
+        local_mode=config.get('input.local_mode', 'in_place'),
+        discovery=discovery
+    )
+
+    document = bool(config.get('doc_creator.enabled', False))
+    tracker = ProgressTracker(
+        lambda progress: publish({
+            "status": "processing",
+            "message": f"Documentation is being generated ({progress['stage']}).",
+            "progress": progress
+        }),
+        stages=PIPELINE_STAGES + ([DOCUMENT_STAGE] if document else []),
+        min_interval=config.get('jobs.progress_interval', 0.5)
+    )
+
+    def report(status: Dict[str, Any]):
+        # Terminal statuses carry the final stage timings
+        publish({**status, "progress": tracker.finish()})
+    
+    try:
+        # 1. Input Handling
+        tracker.start_stage("clone")
+        if source_type == "git":
+            working_dir = input_handler.process_git_repo(path, credentials, ref=revision or ref)
+        elif source_type == "local":
+            working_dir = input_handler.process_local_folder(path)
+        else:
+            report({"status": "failed", "error": "Invalid source type"})
+            return
+
+        if not working_dir:
+             report({"status": "failed", "error": "Could not determine working directory"})
+             return
+
+        # Incremental mode: reuse the base commit's artifacts for unchanged code
+        manifest_store = RunManifestStore(config.get('incremental.state_dir', '.docgen_cache/runs'))
+        plan = IncrementalPlan()
+        if source_type == "git":
+            head_commit = input_handler.get_head_commit(working_dir)
+            previous = manifest_store.load(path, base_commit) if base_commit else None
+            if previous:
+                changed, _ = input_handler.changed_files(working_dir, base_commit)
+                plan = IncrementalPlan(previous, changed)
+                print(f"Incremental run against {base_commit}: {len(changed)} changed files")
+            elif base_commit:
+                print(f"No artifacts stored for {base_commit}, running a full documentation pass")
+
+        # 2. AST Extraction
+        tracker.start_stage("extract")
+        print(f"Extracting AST from {working_dir}...")
+
+        # One walk yields every source file with its stats; ignore rules,
+        # extension and size filters are applied by FileDiscovery
+        records = sorted(discovery.walk(working_dir), key=lambda r: r.rel_path)
+        file_paths = [r.path for r in records]
+        rel_paths = {r.path: r.rel_path for r in records}
+
+        # A git commit pins the input; a local folder is pinned by its file stats
+        if head_commit:
+            extract_input = head_commit
+        else:
+            extract_input = fingerprint([(r.rel_path, r.size, r.mtime_ns) for r in records])
+
+        # Checkpoints are keyed by source and the input it pins, so a restarted
+        # job resumes, but jobs on different contents of a folder never share one
+        checkpoint = None
+        if config.get('checkpoint.enabled', False):
+            checkpoint = JobCheckpoint(
+                config.get('checkpoint.path', '.docgen_cache/checkpoints'),
+                JobCheckpoint.make_key(source_type, path, extract_input, base_commit)
+            )
+
+        file_chunks = checkpoint.stage_result("extract", extract_input) if checkpoint else None
+        if file_chunks is not None:
+            print(f"Resuming: reusing extracted AST of {len(file_chunks)} files from the last attempt")
+            tracker.update(len(file_chunks), total=len(file_chunks))
+        else:
+            extractor = ParallelASTExtractor(
+                workers=config.get('extraction.workers', 1),
+                chunksize=config.get('extraction.chunksize', 16),
+                config=config
+            )
+            to_extract = extractor.supported_paths(p for p in file_paths if plan.needs_extraction(rel_paths[p]))
+            tracker.set_total(len(to_extract))
+            extracted = {}
+            for file_path, chunks in extractor.iter_extract(to_extract):
+                extracted[file_path] = chunks
+                tracker.advance()
+            print(f"AST cache: {extractor.cache_stats['hits']} hits, {extractor.cache_stats['misses']} misses")
+
+            # Keep the walk order so reused and fresh results interleave deterministically
+            file_chunks = {}
+            for file_path in file_paths:
+                rel_path = rel_paths[file_path]
+                if file_path in extracted:
+                    file_chunks[rel_path] = extracted[file_path]
+                elif not plan.needs_extraction(rel_path):
+                    file_chunks[rel_path] = plan.reused_chunks(rel_path)
+            if checkpoint:
+                checkpoint.complete_stage("extract", extract_input, file_chunks)
+        all_ast_data = [cls for chunks in file_chunks.values() for cls in chunks]
+
+        if not all_ast_data:
+            print("No suitable files found for AST extraction.")
+            report({"status": "completed", "warning": "No AST data found"})
+            return
+
+        # 3. Code Mapping
+        classes_to_map, reused_mappings = plan.split_classes(all_ast_data)
+        print(f"Mapping {len(classes_to_map)} AST chunks ({len(reused_mappings)} reused)...")
+        tracker.start_stage("map", total=len(classes_to_map))
+        mapper = CodeMapper(config=config, checkpoint=checkpoint.stage("map") if checkpoint else None)
+        fresh_mappings = mapper.run(
+            classes_to_map, known_classes=all_ast_data, progress_callback=tracker.callback()
+        ) if classes_to_map else {}
+        mapped_data = {}
+        for cls in all_ast_data:
+            class_name = cls['class_name']
+            if class_name in fresh_mappings:
+                mapped_data[class_name] = fresh_mappings[class_name]
+            elif class_name in reused_mappings:
+                mapped_data[class_name] = reused_mappings[class_name]
+        changed_endpoints = plan.changed_endpoints(all_ast_data, mapped_data)
+
+        # 4. Save Output
+        # One file per job: workers run concurrently and /status hands the
+        # path to the client, so a shared output file would mix up results
+        output_dir = config.get('jobs.output_dir', '.docgen_cache/outputs')
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"{job_id}.json")
+        tmp_file = f"{output_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(mapped_data, f, indent=2)
+        os.replace(tmp_file, output_file)
+
+        print(f"Mapping complete. Results saved to {output_file}")
+
+        # 5. Documentation: endpoints that did not change keep their output files
+        documentation = None
+        if document:
+            tracker.start_stage(DOCUMENT_STAGE)
+            creator = DocumentationCreator(
+                config=config, checkpoint=checkpoint.stage(DOCUMENT_STAGE) if checkpoint else None
+            )
+            documentation = creator.run(
+                output_file,
+                ast_folder=config.save_ast_path if config.save_ast else None,
+                endpoints=changed_endpoints if plan.is_incremental else None,
+                progress_callback=tracker.callback()
+            )
+
+        if head_commit:
+            manifest_store.save(
+                path, head_commit,
+                IncrementalPlan.build_manifest(head_commit, file_chunks, all_ast_data, mapped_data, changed_endpoints)
+            )
+
+        # Finished: later runs of the same source start fresh (or incrementally)
+        if checkpoint:
+            checkpoint.clear()
+        
+        status = {
+            "status": "completed", 
+            "message": "Documentation generation successful.",
+            "results_file": output_file,
+            "commit": head_commit,
+            "incremental": plan.is_incremental,
+            "changed_endpoints": changed_endpoints
+        }
+        if documentation is not None:
+            status["documentation"] = {k: v for k, v in documentation.items() if k != "output_files"}
+        # Later identical requests are answered from the cache
+        if result_key and (source_type != "git" or head_commit == revision):
+            result_cache_from_config(config).put(result_key, {**status, "job_id": job_id}, mapped_data)
+        report(status)
+
+    except Exception as e:
+        print(f"Error during processing: {e}")
+        report({"status": "failed", "error": str(e)})
+    finally:
+        input_handler.cleanup()
@@ -0,0 +1,275 @@
+"""
+FileDiscovery - the single walker every stage uses to find source files.
+
+The tree is walked once with os.scandir, one directory per task on a thread
+pool (directory listing is I/O bound, so threads overlap the syscalls). Each
+file comes out as a DiscoveredFile record carrying the stat results the walk
+already has, so consumers never stat a file again:
+
+    DiscoveredFile(path, rel_path, size, mtime_ns, language)
+
+A file is skipped when any of the following applies:
+
+- it lies in an excluded directory (VCS metadata, dependencies, vendored code)
+- .gitignore or .docgenignore rules in its directory or any parent ignore it
+  (gitignore syntax: *, **, ?, [...], leading / anchors, trailing / for
+  directories, ! re-includes; later rules and deeper files win)
+- it matches one of the default generated-code patterns (minified JS,
+  protobuf output, designer files)
+- its extension is not in LanguageFinder.EXTENSION_MAP
+- it is larger than max_file_size
+
+Records are yielded in completion order; consumers that need a stable order
+sort them by rel_path.
+"""
+
+import os
+import re
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.components.LanguageFinder import LanguageFinder
+from src.core.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Directories never worth reading: VCS metadata, dependencies, caches
+EXCLUDED_DIRS = {"node_modules", ".git", "__pycache__", ".venv", "vendor", ".docgen_cache"}
+
+# Ignore files read in every directory, in order (later files win)
+IGNORE_FILES = [".gitignore", ".docgenignore"]
+
+# Generated code that would only add noise to the documentation
+GENERATED_PATTERNS = ["*.min.js", "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.g.cs", "*.Designer.cs", "*.generated.*"]
+
+
+class DiscoveredFile(NamedTuple):
+    path: str
+    rel_path: str  # relative to the walked root, '/' separated
+    size: int
+    mtime_ns: int
+    language: str
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex."""
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """
+    Compiled rules of one ignore file, applied to paths below its directory.
+
+    Usage:
+        rules = IgnoreRules("src", ["build/", "*.log", "!keep.log"])
+        rules.match("src/app/build", is_dir=True)   # True: ignored
+        rules.match("src/keep.log", is_dir=False)   # False: re-included
+        rules.match("docs/a.log", is_dir=False)     # None: not below src
+    """
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        """
+        Args:
+            base: Directory of the ignore file, relative to the walked root ('' for the root)
+            lines: Lines of the ignore file
+        """
+        self.base = base
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            prefix = "^" if anchored else "^(?:.*/)?"
+            self.rules.append((re.compile(prefix + _translate(line) + "$"), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, base: str, path: str) -> Optional["IgnoreRules"]:
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                rules = cls(base, f)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True (ignored), False (re-included) or None (no rule applies)."""
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        verdict = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                verdict = not negate
+        return verdict
+
+
+def is_ignored(rules: List[IgnoreRules], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for ignore_rules in rules:
+        verdict = ignore_rules.match(rel_path, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+class FileDiscovery:
+    """
+    Parallel, ignore-aware source file walker.
+
+    Usage:
+        discovery = FileDiscovery(max_file_size=1024 * 1024)
+        for record in discovery.walk(working_dir):
+            print(record.rel_path, record.language, record.size)
+    """
+
+    def __init__(
+        self,
+        extensions: Optional[Iterable[str]] = None,
+        max_file_size: int = 0,
+        workers: int = 8,
+        excluded_dirs: Optional[Iterable[str]] = None,
+        ignore_patterns: Optional[Iterable[str]] = None,
+        language_finder: Optional[LanguageFinder] = None
+    ):
+        """
+        Args:
+            extensions: File extensions to keep (default: LanguageFinder.EXTENSION_MAP)
+            max_file_size: Skip files larger than this many bytes, 0 = no limit
+            workers: Threads listing directories concurrently
+            excluded_dirs: Directory names never entered (default: EXCLUDED_DIRS)
+            ignore_patterns: Gitignore-style patterns applied at the root
+                (default: GENERATED_PATTERNS)
+            language_finder: Maps extensions to languages
+        """
+        self.language_finder = language_finder or LanguageFinder()
+        self.extensions = {e.lower() for e in (extensions if extensions is not None else LanguageFinder.EXTENSION_MAP)}
+        self.max_file_size = max_file_size
+        self.workers = max(1, workers)
+        self.excluded_dirs = set(EXCLUDED_DIRS if excluded_dirs is None else excluded_dirs)
+        patterns = GENERATED_PATTERNS if ignore_patterns is None else ignore_patterns
+        self._root_rules = IgnoreRules("", patterns)
+
+    def _scan(
+        self,
+        directory: str,
+        rel_dir: str,
+        rules: List[IgnoreRules]
+    ) -> Tuple[List[DiscoveredFile], List[Tuple[str, str, List[IgnoreRules]]]]:
+        """List one directory: returns (files, subdirectories to walk with their rules)."""
+        rules = list(rules)
+        for name in IGNORE_FILES:
+            ignore_rules = IgnoreRules.from_file(rel_dir, os.path.join(directory, name))
+            if ignore_rules:
+                rules.append(ignore_rules)
+
+        files, subdirs = [], []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+            return files, subdirs
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.excluded_dirs and not is_ignored(rules, rel_path, True):
+                        subdirs.append((entry.path, rel_path, rules))
+                    continue
+                if not entry.is_file():
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                    continue
+                if is_ignored(rules, rel_path, False):
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            if self.max_file_size and st.st_size > self.max_file_size:
+                logger.debug(f"Skipping {rel_path}: {st.st_size} bytes exceeds the size limit")
+                continue
+            files.append(DiscoveredFile(
+                entry.path, rel_path, st.st_size, st.st_mtime_ns, self.language_finder.detect(entry.name)
+            ))
+        return files, subdirs
+
+    def walk(self, root: str) -> Iterator[DiscoveredFile]:
+        """Yield every source file below root that passes the filters."""
+        root_rules = [self._root_rules] if self._root_rules.rules else []
+        if self.workers == 1:
+            pending = [(root, "", root_rules)]
+            while pending:
+                files, subdirs = self._scan(*pending.pop())
+                yield from files
+                pending.extend(subdirs)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="docgen-discovery") as pool:
+            running = {pool.submit(self._scan, root, "", root_rules)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        running.add(pool.submit(self._scan, *subdir))
+                    yield from files
+
+
+def file_discovery_from_config(config: Optional[AppConfig]) -> FileDiscovery:
+    """Build the walker described by the discovery.* config section."""
+    get = config.get if config is not None else (lambda key, default=None: default)
+    excluded_dirs = EXCLUDED_DIRS | set(get("discovery.exclude_dirs", None) or [])
+    return FileDiscovery(
+        max_file_size=int(float(get("discovery.max_file_size_kb", 0)) * 1024),
+        workers=int(get("discovery.workers", 8)),
+        excluded_dirs=excluded_dirs,
+        ignore_patterns=GENERATED_PATTERNS + list(get("discovery.ignore_patterns", None) or [])
+    )
@@ -1,7 +1,8 @@
-import os
 import abc
 from typing import List, Optional
 
+from src.services.file_discovery import FileDiscovery
+
 class FrameworkStrategy(abc.ABC):
     @abc.abstractmethod
     def matches(self, file_content: str, filename: str) -> bool:
@@ -73,7 +74,8 @@ class FrameworkDetector:
     Detects the framework used in a project by scanning files and using strategies.
     """
 
-    def __init__(self):
+    def __init__(self, discovery: Optional[FileDiscovery] = None):
+        self.discovery = discovery or FileDiscovery()
         self.strategies: List[FrameworkStrategy] = [
             DjangoStrategy(),
             FastAPIStrategy(),
@@ -89,33 +91,19 @@ class FrameworkDetector:
         Scans the project path to detect the framework.
         Returns the framework name or 'Unknown'.
         """
-        # Limit the walk to avoid scanning node_modules or huge directories unnecessarily deep
-        # For now, we'll scan everything but we could optimize
-        
-        for root, dirs, files in os.walk(project_path):
-            if 'node_modules' in dirs:
-                dirs.remove('node_modules')
-            if '.git' in dirs:
-                dirs.remove('.git')
-            if '__pycache__' in dirs:
-                dirs.remove('__pycache__')
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                print(file_path)
-                if os.path.isdir(file_path):
-                   return  self.detect(file_path)
-
-                
-                # Skip large files or binaries
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read(10000) # Read first 10kb covers most imports/decorators
-                        
-                        for strategy in self.strategies:
-                            if strategy.matches(content, file):
-                                return strategy.name
-                except Exception:
-                    continue
+        # FileDiscovery skips dependencies, ignored and generated files and
+        # everything that is not source code. Its parallel walk yields files
+        # in completion order, so sort them to keep the first match stable.
+        for record in sorted(self.discovery.walk(project_path), key=lambda r: r.rel_path):
+            try:
+                with open(record.path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read(10000) # Read first 10kb covers most imports/decorators
+            except OSError:
+                continue
+
+            file_name = record.rel_path.rsplit('/', 1)[-1]
+            for strategy in self.strategies:
+                if strategy.matches(content, file_name):
+                    return strategy.name
                     
         return "Unknown"
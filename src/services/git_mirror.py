@@ -0,0 +1,271 @@
+"""
+GitMirrorCache - persistent bare mirrors of the repositories jobs clone.
+
+Instead of a full clone per job, every remote gets one bare repository under
+git_cache.path that is fetched incrementally (only new objects travel). A job
+then gets a detached worktree of that mirror at the requested ref: checking
+out a worktree only writes the files, the history is shared with the mirror
+and stays available for incremental diffs against a base commit.
+
+With sparse checkout, the worktree only contains files whose extension
+LanguageFinder knows, plus ignore files; build files such as pom.xml or
+package.json are left out.
+
+Mirrors are evicted least recently used first once their total size exceeds
+git_cache.quota_mb. A mirror with live worktrees is never evicted. Fetches,
+worktree changes and eviction of one mirror are serialized with a file lock
+(POSIX only), so several worker processes can share the cache.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+import git
+
+from src.components.LanguageFinder import LanguageFinder
+from src.core.config import AppConfig
+from src.services.file_discovery import IGNORE_FILES
+
+logger = logging.getLogger(__name__)
+
+HEAD_REF = "refs/docgen/HEAD"
+FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*", f"+HEAD:{HEAD_REF}"]
+SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+def authenticated_url(repo_url: str, credentials: Optional[str]) -> str:
+    # Insert credentials into URL if provided and not already present
+    if credentials and "@" not in repo_url and "https://" in repo_url:
+        return repo_url.replace("https://", f"https://{credentials}@")
+    return repo_url
+
+
+def is_valid_ref(ref: str) -> bool:
+    """
+    True if ref is a full commit SHA or a well-formed ref name.
+
+    Refs come from API requests and end up on git command lines, so
+    anything git could read as an option is rejected.
+    """
+    if SHA_RE.match(ref):
+        return True
+    if not ref or ref.startswith("-"):
+        return False
+    try:
+        git.cmd.Git().check_ref_format("--allow-onelevel", ref)
+    except git.GitCommandError:
+        return False
+    return True
+
+
+def sparse_patterns(extensions: Iterable[str]) -> List[str]:
+    """Non-cone sparse-checkout patterns for the given file extensions."""
+    return sorted({f"*{ext}" for ext in extensions}) + IGNORE_FILES
+
+
+class GitMirrorCache:
+    """
+    Bare mirrors shared by all jobs, with per-job worktrees.
+
+    Usage:
+        cache = GitMirrorCache(".docgen_cache/git", quota_bytes=5 * 1024**3)
+        commit = cache.checkout(url, dest_dir, credentials=token, ref="main")
+        ...
+        cache.release(dest_dir)
+    """
+
+    def __init__(
+        self,
+        path: str = ".docgen_cache/git",
+        quota_bytes: int = 0,
+        sparse_extensions: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            path: Directory holding the mirrors
+            quota_bytes: Total mirror size before LRU eviction, 0 = unlimited
+            sparse_extensions: Only check out files with these extensions
+                (None checks out everything)
+        """
+        self.path = os.path.abspath(path)
+        self.quota_bytes = quota_bytes
+        self.sparse_extensions = list(sparse_extensions) if sparse_extensions is not None else None
+        os.makedirs(self.path, exist_ok=True)
+
+    def mirror_path(self, repo_url: str) -> str:
+        # Credentials in URLs must not change the mirror (or end up on disk)
+        clean_url = re.sub(r"://[^/@]*@", "://", repo_url)
+        name = re.sub(r"[^A-Za-z0-9]+", "-", clean_url.rstrip("/").split("/")[-1].removesuffix(".git"))[:40]
+        digest = hashlib.sha256(clean_url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.path, f"{name}-{digest}.git")
+
+    @contextmanager
+    def _locked(self, mirror: str, blocking: bool = True) -> Iterator[bool]:
+        try:
+            import fcntl
+        except ImportError:
+            # No flock on Windows; the cache is then not safe to share between processes
+            yield True
+            return
+        with open(f"{mirror}.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _fetch(self, mirror: str, repo_url: str, credentials: Optional[str]):
+        if not os.path.exists(os.path.join(mirror, "HEAD")):
+            logger.info(f"Creating git mirror {mirror}")
+            git.Repo.init(mirror, bare=True)
+        # The credentialed URL is only passed on the command line, never stored
+        git.Git(mirror).fetch("--prune", "--quiet", "--", authenticated_url(repo_url, credentials), *FETCH_REFSPECS)
+
+    def _resolve(self, mirror: str, repo_url: str, credentials: Optional[str], ref: Optional[str]) -> str:
+        repo = git.Git(mirror)
+        if ref is None:
+            return repo.rev_parse("--verify", f"{HEAD_REF}^{{commit}}")
+        if not is_valid_ref(ref):
+            raise RuntimeError(f"Invalid git ref {ref!r}")
+        for candidate in (ref, f"refs/heads/{ref}", f"refs/tags/{ref}"):
+            try:
+                return repo.rev_parse("--verify", "--quiet", f"{candidate}^{{commit}}")
+            except git.GitCommandError:
+                continue
+        # Refs outside heads/tags (e.g. refs/pull/1/head) or unadvertised commits
+        try:
+            repo.fetch("--quiet", "--", authenticated_url(repo_url, credentials), ref)
+            return repo.rev_parse("--verify", "FETCH_HEAD^{commit}")
+        except git.GitCommandError as e:
+            raise RuntimeError(f"Unknown ref {ref} in {repo_url}: {e}")
+
+    def checkout(
+        self,
+        repo_url: str,
+        dest_dir: str,
+        credentials: Optional[str] = None,
+        ref: Optional[str] = None
+    ) -> str:
+        """
+        Fetch the mirror and check out ref (default: the remote HEAD) into dest_dir.
+
+        Returns:
+            The checked out commit SHA
+        """
+        mirror = self.mirror_path(repo_url)
+        with self._locked(mirror):
+            self._fetch(mirror, repo_url, credentials)
+            commit = self._resolve(mirror, repo_url, credentials, ref)
+            mirror_git = git.Git(mirror)
+            if self.sparse_extensions is None:
+                mirror_git.worktree("add", "--detach", "--force", dest_dir, commit)
+            else:
+                mirror_git.worktree("add", "--no-checkout", "--detach", "--force", dest_dir, commit)
+                worktree_git = git.Git(dest_dir)
+                worktree_git.sparse_checkout("set", "--no-cone", *sparse_patterns(self.sparse_extensions))
+                worktree_git.checkout("--quiet", "--detach", commit)
+            self._touch(mirror)
+        self.enforce_quota(keep=mirror)
+        return commit
+
+    def release(self, dest_dir: str):
+        """Remove a worktree created by checkout()."""
+        try:
+            common_dir = git.Git(dest_dir).rev_parse("--git-common-dir")
+        except (git.GitCommandError, git.NoSuchPathError):
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            return
+        mirror = os.path.abspath(os.path.join(dest_dir, common_dir))
+        with self._locked(mirror):
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            try:
+                git.Git(mirror).worktree("prune")
+            except git.GitCommandError as e:
+                logger.warning(f"Could not prune worktrees of {mirror}: {e}")
+
+    @staticmethod
+    def _touch(mirror: str):
+        stamp = os.path.join(mirror, "docgen-last-used")
+        with open(stamp, "w") as f:
+            f.write(str(time.time()))
+
+    @staticmethod
+    def _last_used(mirror: str) -> float:
+        try:
+            return os.path.getmtime(os.path.join(mirror, "docgen-last-used"))
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _size(mirror: str) -> int:
+        total = 0
+        for root, _, files in os.walk(mirror):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def mirrors(self) -> List[str]:
+        """Mirror directories, least recently used first."""
+        paths = [
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.endswith(".git") and os.path.isdir(os.path.join(self.path, name))
+        ]
+        return sorted(paths, key=self._last_used)
+
+    def enforce_quota(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Evict least recently used mirrors until the cache fits the quota.
+
+        Mirrors that are locked, have worktrees, or equal keep are skipped.
+
+        Returns:
+            The evicted mirror directories
+        """
+        if not self.quota_bytes:
+            return []
+        mirrors = self.mirrors()
+        sizes = {mirror: self._size(mirror) for mirror in mirrors}
+        total = sum(sizes.values())
+        evicted = []
+        for mirror in mirrors:
+            if total <= self.quota_bytes:
+                break
+            if mirror == keep:
+                continue
+            with self._locked(mirror, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                git.Git(mirror).worktree("prune")
+                worktrees = os.path.join(mirror, "worktrees")
+                if os.path.isdir(worktrees) and os.listdir(worktrees):
+                    continue
+                shutil.rmtree(mirror, ignore_errors=True)
+            total -= sizes[mirror]
+            evicted.append(mirror)
+            logger.info(f"Evicted git mirror {mirror} ({sizes[mirror]} bytes)")
+        return evicted
+
+
+def git_mirror_from_config(config: AppConfig) -> Optional[GitMirrorCache]:
+    """Open the mirror cache described by the git_cache.* config section, or None if disabled."""
+    if not config.get("git_cache.enabled", False):
+        return None
+    extensions = LanguageFinder.EXTENSION_MAP.keys() if config.get("git_cache.sparse_checkout", False) else None
+    return GitMirrorCache(
+        config.get("git_cache.path", ".docgen_cache/git"),
+        quota_bytes=int(float(config.get("git_cache.quota_mb", 0)) * 1024 * 1024),
+        sparse_extensions=extensions
+    )
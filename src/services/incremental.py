@@ -0,0 +1,236 @@
+"""
+Incremental re-documentation support.
+
+After every successful git run we persist a manifest of what was produced
+for that commit: the extracted classes per file, the CodeMapper output and
+hashes of every class and method definition. A later run that names the
+previous commit SHA as its base only re-extracts files changed in the git
+diff, only re-maps classes whose method definitions changed or that
+reference a changed class, and only regenerates docs for endpoints whose
+definition or dependencies changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import logging
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dependency receivers that refer to the calling class itself
+SELF_RECEIVERS = {"this", "self", "base", "super"}
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def method_hashes(ast_data: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map "Class.method" to a hash of its definition."""
+    hashes = {}
+    for cls in ast_data:
+        for method in cls.get("methods", []):
+            key = f"{cls.get('class_name')}.{method.get('method_name')}"
+            hashes[key] = _sha256(method.get("method_definition", ""))
+    return hashes
+
+
+def _name_key(name: str) -> str:
+    # Same rule as the static resolver: authService, auth_service -> authservice
+    return name.replace("_", "").lower()
+
+
+def class_hashes(ast_data: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map class name to a hash of all its method definitions, in order."""
+    hashes = {}
+    for cls in ast_data:
+        definitions = [m.get("method_definition", "") for m in cls.get("methods", [])]
+        hashes[cls.get("class_name")] = _sha256("\0".join(definitions))
+    return hashes
+
+
+class RunManifestStore:
+    """
+    Stores one JSON manifest per (repository, commit) under a state directory.
+
+    Usage:
+        store = RunManifestStore(".docgen_cache/runs")
+        previous = store.load(repo_url, base_commit)
+        ...
+        store.save(repo_url, head_commit, manifest)
+    """
+
+    def __init__(self, state_dir: str = ".docgen_cache/runs"):
+        self.state_dir = state_dir
+
+    @staticmethod
+    def repo_key(repo_url: str) -> str:
+        # Credentials must not change the key (or end up on disk)
+        clean_url = re.sub(r"://[^/@]*@", "://", repo_url.strip()).rstrip("/")
+        if clean_url.endswith(".git"):
+            clean_url = clean_url[:-4]
+        return _sha256(clean_url)[:16]
+
+    def _manifest_path(self, repo_url: str, commit: str) -> str:
+        return os.path.join(self.state_dir, self.repo_key(repo_url), f"{commit}.json")
+
+    def load(self, repo_url: str, commit: str) -> Optional[Dict[str, Any]]:
+        path = self._manifest_path(repo_url, commit)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable run manifest {path}: {e}")
+            return None
+
+    def save(self, repo_url: str, commit: str, manifest: Dict[str, Any]):
+        path = self._manifest_path(repo_url, commit)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+
+class IncrementalPlan:
+    """
+    Decides what a run can reuse from a previous run's manifest.
+
+    Args:
+        previous: Manifest of the base commit, or None for a full run
+        changed_files: Paths (relative to the repo root) added or modified since the base commit
+    """
+
+    def __init__(self, previous: Optional[Dict[str, Any]] = None, changed_files: Optional[Set[str]] = None):
+        self.previous = previous or {}
+        self.changed_files = changed_files or set()
+
+    @property
+    def is_incremental(self) -> bool:
+        return bool(self.previous)
+
+    def needs_extraction(self, rel_path: str) -> bool:
+        if not self.is_incremental:
+            return True
+        return rel_path in self.changed_files or rel_path not in self.previous.get("files", {})
+
+    def reused_chunks(self, rel_path: str) -> List[Dict[str, Any]]:
+        return self.previous.get("files", {}).get(rel_path, [])
+
+    def split_classes(self, ast_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Split classes into those that must be re-mapped and reusable mappings.
+
+        A class is re-mapped when its own definitions changed, or when it
+        references a class that changed, appeared or disappeared: a renamed
+        method or new signature there makes its dependency list stale.
+
+        Returns:
+            (classes_to_map, reused_mappings keyed by class name)
+        """
+        previous_hashes = self.previous.get("class_hashes", {})
+        previous_mapped = self.previous.get("mapped", {})
+        current_hashes = class_hashes(ast_data)
+        changed = {name for name, digest in current_hashes.items() if previous_hashes.get(name) != digest}
+        changed |= set(previous_hashes) - set(current_hashes)
+
+        to_map, reused = [], {}
+        references = self._reference_matcher(ast_data, changed)
+        for cls in ast_data:
+            name = cls.get("class_name")
+            if name in previous_mapped and name not in changed and not references(cls, previous_mapped[name]):
+                reused[name] = previous_mapped[name]
+            else:
+                to_map.append(cls)
+        return to_map, reused
+
+    def _reference_matcher(self, ast_data: List[Dict[str, Any]], changed: Set[str]):
+        """
+        Build a predicate telling whether a class (with its previous mapping)
+        references one of the changed classes.
+
+        A reference is a dependency whose receiver names a changed class
+        (authService -> AuthService) or whose method a changed class defined
+        before or after the change, or the class name in a method definition.
+        """
+        if not changed:
+            return lambda cls, mapping: False
+
+        previous_classes = [cls for chunks in self.previous.get("files", {}).values() for cls in chunks]
+        changed_methods = {
+            method.get("method_name")
+            for cls in previous_classes + ast_data if cls.get("class_name") in changed
+            for method in cls.get("methods", [])
+        }
+        changed_keys = {_name_key(name) for name in changed}
+        name_re = re.compile(r"\b(?:" + "|".join(re.escape(name) for name in sorted(changed)) + r")\b")
+
+        def references(cls: Dict[str, Any], mapping: Dict[str, Any]) -> bool:
+            for method in mapping.get("methods", []):
+                for dependency in method.get("dependencies", []):
+                    receiver, _, callee = dependency.rpartition(".")
+                    if receiver in SELF_RECEIVERS:
+                        continue
+                    if _name_key(receiver.split(".")[-1]) in changed_keys or callee in changed_methods:
+                        return True
+            return any(name_re.search(m.get("method_definition", "")) for m in cls.get("methods", []))
+
+        return references
+
+    def changed_endpoints(self, ast_data: List[Dict[str, Any]], mapped_data: Dict[str, Any]) -> List[str]:
+        """
+        Return "Class.method" keys of API endpoints whose docs must be regenerated.
+
+        An endpoint is stale when its own definition changed, its dependency
+        list changed, or any method it depends on changed definition.
+        """
+        current = method_hashes(ast_data)
+        if not self.is_incremental:
+            changed_methods = set(current)
+        else:
+            previous = self.previous.get("method_hashes", {})
+            changed_methods = {k for k, v in current.items() if previous.get(k) != v}
+            changed_methods |= set(previous) - set(current)
+        changed_names = {key.split(".")[-1] for key in changed_methods}
+        previous_mapped = self.previous.get("mapped", {})
+
+        endpoints = []
+        for class_name, class_data in mapped_data.items():
+            old_deps = {
+                m.get("method"): m.get("dependencies", [])
+                for m in previous_mapped.get(class_name, {}).get("methods", [])
+            }
+            for method_info in class_data.get("methods", []):
+                if method_info.get("is_api_route") is not True:
+                    continue
+                method_name = method_info.get("method")
+                key = f"{class_name}.{method_name}"
+                dependencies = method_info.get("dependencies", [])
+                if (
+                    key in changed_methods
+                    or old_deps.get(method_name) != dependencies
+                    or any(dep.split(".")[-1] in changed_names for dep in dependencies)
+                ):
+                    endpoints.append(key)
+        return endpoints
+
+    @staticmethod
+    def build_manifest(
+        commit: str,
+        files: Dict[str, List[Dict[str, Any]]],
+        ast_data: List[Dict[str, Any]],
+        mapped_data: Dict[str, Any],
+        changed_endpoints: List[str]
+    ) -> Dict[str, Any]:
+        return {
+            "commit": commit,
+            "files": files,
+            "mapped": mapped_data,
+            "class_hashes": class_hashes(ast_data),
+            "method_hashes": method_hashes(ast_data),
+            "changed_endpoints": changed_endpoints,
+        }
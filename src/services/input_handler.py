@@ -1,61 +1,223 @@
+import errno
 import os
 import shutil
 import tempfile
 import git
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, Tuple
+
+from src.services.file_discovery import FileDiscovery
+from src.services.git_mirror import GitMirrorCache, SHA_RE, authenticated_url, is_valid_ref
+
+# How process_local_folder exposes a local folder to the pipeline
+LOCAL_MODES = ("in_place", "snapshot", "copy")
+
+# Linux ioctl cloning a file's extents (copy-on-write reflink on btrfs, XFS, ...)
+FICLONE = 0x40049409
 
 class InputHandler:
     """
     Handles input sources for the documentation generation (Git Repos or Local Folders).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        mirror_cache: Optional[GitMirrorCache] = None,
+        local_mode: str = "in_place",
+        discovery: Optional[FileDiscovery] = None
+    ):
+        """
+        Args:
+            mirror_cache: Serve git repos as worktrees of cached mirrors
+                instead of full clones (see GitMirrorCache)
+            local_mode: How local folders are exposed (see process_local_folder)
+            discovery: Selects the files a snapshot contains
+        """
+        if local_mode not in LOCAL_MODES:
+            raise ValueError(f"Unknown local folder mode {local_mode!r}, expected one of {LOCAL_MODES}")
         self.temp_dir: Optional[str] = None
+        self.mirror_cache = mirror_cache
+        self.local_mode = local_mode
+        self.discovery = discovery or FileDiscovery()
+        self._worktree = False
+        self._reflink_supported = True
 
-    def process_git_repo(self, repo_url: str, credentials: Optional[str] = None) -> str:
+    def process_git_repo(self, repo_url: str, credentials: Optional[str] = None, ref: Optional[str] = None) -> str:
         """
-        Clones a git repo to a temporary directory.
+        Checks out a git repo (at ref, default the remote HEAD) in a temporary directory.
         Credentials handling is simplified for this demo (assumes https with auth token in URL if needed, 
         or SSH key configured in environment).
         """
+        if ref is not None and not is_valid_ref(ref):
+            raise ValueError(f"Invalid git ref {ref!r}")
         self.temp_dir = tempfile.mkdtemp(prefix="docgen_rag_")
-        
-        # Insert credentials into URL if provided and not already present
-        final_url = repo_url
-        if credentials and "@" not in repo_url and "https://" in repo_url:
-            final_url = repo_url.replace("https://", f"https://{credentials}@")
+
+        if self.mirror_cache is not None:
+            try:
+                print(f"Checking out {repo_url} from the mirror cache into {self.temp_dir}...")
+                self.mirror_cache.checkout(repo_url, self.temp_dir, credentials=credentials, ref=ref)
+                self._worktree = True
+                return self.temp_dir
+            except Exception as e:
+                # A broken mirror must not fail the job; clone it directly instead
+                print(f"Mirror checkout failed ({e}), falling back to a full clone")
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                os.makedirs(self.temp_dir)
 
         try:
             print(f"Cloning {repo_url} into {self.temp_dir}...")
-            git.Repo.clone_from(final_url, self.temp_dir)
+            repo = git.Repo.clone_from(authenticated_url(repo_url, credentials), self.temp_dir)
+            if ref:
+                # The trailing "--" marks ref as a revision, never a path
+                repo.git.checkout(ref, "--")
             return self.temp_dir
         except Exception as e:
             self.cleanup()
             raise RuntimeError(f"Failed to clone repository: {e}")
 
+    def resolve_remote_head(self, repo_url: str, credentials: Optional[str] = None, ref: Optional[str] = None) -> str:
+        """
+        Returns the commit SHA the remote's HEAD (or ref) points to, without cloning.
+        A short ref must name exactly one branch or tag.
+        """
+        if ref and SHA_RE.match(ref):
+            return ref
+        if ref is not None and not is_valid_ref(ref):
+            raise RuntimeError(f"Invalid git ref {ref!r}")
+        target = ref or "HEAD"
+        if target == "HEAD" or target.startswith("refs/"):
+            candidates = [target]
+        else:
+            candidates = [f"refs/heads/{target}", f"refs/tags/{target}"]
+
+        # ls-remote matches patterns by their tail (main also matches
+        # refs/heads/feature/main), so only exact refnames are kept
+        patterns = candidates + [f"{c}^{{}}" for c in candidates]
+        try:
+            output = git.cmd.Git().ls_remote("--", authenticated_url(repo_url, credentials), *patterns)
+        except git.GitCommandError as e:
+            raise RuntimeError(f"Could not resolve {target} of {repo_url}: {e}")
+        refs = dict(reversed(line.split("\t", 1)) for line in output.splitlines() if "\t" in line)
+
+        matches = []
+        for candidate in candidates:
+            # An annotated tag is listed twice; the peeled line (^{}) names the commit
+            sha = refs.get(f"{candidate}^{{}}") or refs.get(candidate)
+            if sha:
+                matches.append((candidate, sha))
+        if not matches:
+            raise RuntimeError(f"Remote {repo_url} has no {target}")
+        if len(matches) > 1:
+            names = ", ".join(name for name, _ in matches)
+            raise RuntimeError(f"Ref {target} of {repo_url} is ambiguous ({names})")
+        return matches[0][1]
+
+    def get_head_commit(self, working_dir: str) -> str:
+        """
+        Returns the commit SHA checked out in a cloned repository.
+        """
+        return git.Repo(working_dir).head.commit.hexsha
+
+    def changed_files(self, working_dir: str, base_commit: str) -> Tuple[Set[str], Set[str]]:
+        """
+        Lists files changed between base_commit and HEAD.
+        Returns (added_or_modified, deleted) as paths relative to the repo root.
+        Renames count as a deletion of the old path and an addition of the new one.
+        """
+        repo = git.Repo(working_dir)
+        try:
+            diff = repo.git.diff("--name-status", "-M", base_commit, "HEAD")
+        except git.GitCommandError as e:
+            raise RuntimeError(f"Could not diff against {base_commit}: {e}")
+
+        changed, deleted = set(), set()
+        for line in diff.splitlines():
+            parts = line.split("\t")
+            if len(parts) < 2:
+                continue
+            status = parts[0][0]
+            if status == "D":
+                deleted.add(parts[1])
+            elif status in ("R", "C") and len(parts) == 3:
+                if status == "R":
+                    deleted.add(parts[1])
+                changed.add(parts[2])
+            else:
+                changed.add(parts[-1])
+        return changed, deleted
+
     def process_local_folder(self, folder_path: str) -> str:
         """
-        Copies a local folder to a temporary directory to avoid modifying the source.
+        Exposes a local folder to the pipeline, which only ever reads it.
+
+        Modes:
+            in_place: return the folder itself; nothing is copied or written
+            snapshot: reflink (copy-on-write clone) or, where the filesystem
+                cannot, copy the source files into a temporary directory, so
+                later edits to the folder do not affect a running job
+            copy: copy the whole folder into a temporary directory
+
+        The snapshot only contains the source files FileDiscovery finds,
+        i.e. it already honors ignore rules, extensions and size limits.
         """
         if not os.path.exists(folder_path):
             raise FileNotFoundError(f"Local folder not found: {folder_path}")
 
+        if self.local_mode == "in_place":
+            return os.path.abspath(folder_path)
+
         self.temp_dir = tempfile.mkdtemp(prefix="docgen_rag_local_")
         
-        # We copy individual items to avoid copying the root folder *into* the temp dir, 
-        # we want the contents *of* the folder in the temp dir.
         try:
-             shutil.copytree(folder_path, self.temp_dir, dirs_exist_ok=True)
-             return self.temp_dir
+            if self.local_mode == "snapshot":
+                self._snapshot(folder_path, self.temp_dir)
+            else:
+                # We copy individual items to avoid copying the root folder *into* the temp dir, 
+                # we want the contents *of* the folder in the temp dir.
+                shutil.copytree(folder_path, self.temp_dir, dirs_exist_ok=True)
+            return self.temp_dir
         except Exception as e:
             self.cleanup()
             raise RuntimeError(f"Failed to copy local folder: {e}")
 
+    def _snapshot(self, folder_path: str, dest_dir: str):
+        for record in self.discovery.walk(folder_path):
+            dst = os.path.join(dest_dir, record.rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            self._clone_or_copy(record.path, dst)
+
+    def _clone_or_copy(self, src: str, dst: str):
+        # A reflink is a private copy-on-write clone. Hardlinks are not an
+        # option: an in-place save (or a git checkout) would rewrite the
+        # shared inode under a running job
+        if self._reflink_supported:
+            try:
+                import fcntl
+            except ImportError:
+                # No ioctl outside POSIX (Windows): always copy
+                self._reflink_supported = False
+        if self._reflink_supported:
+            try:
+                with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                    fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+                shutil.copystat(src, dst)
+                return
+            except OSError as e:
+                if os.path.exists(dst):
+                    os.unlink(dst)
+                if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV):
+                    self._reflink_supported = False
+        shutil.copy2(src, dst)
+
     def cleanup(self):
         """
         Removes the temporary directory.
         """
+        # Only ever remove directories this handler created; in_place mode
+        # never sets temp_dir, so the user's folder is never deleted
+        if self._worktree and self.temp_dir:
+            self.mirror_cache.release(self.temp_dir)
+            self._worktree = False
         if self.temp_dir and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
             self.temp_dir = None
@@ -0,0 +1,317 @@
+"""
+JobQueue - durable, SQLite-backed queue of documentation jobs.
+
+Replaces the API's in-memory job dict. Jobs survive restarts, are visible to
+every uvicorn worker and are claimed atomically by worker processes (see
+src/services/worker_pool.py), highest priority first and FIFO within a
+priority. The number of queued jobs can be capped; enqueue then raises
+QueueFullError.
+
+Jobs can carry a dedup key (see src/services/result_cache.py). At most one
+queued or running job exists per key; enqueueing another returns the id of
+that job, so identical requests share one run.
+
+A claimed job carries a heartbeat. When a worker dies, its job stops
+heartbeating and requeue_stale() puts it back in the queue (up to
+max_attempts), where job checkpoints let the next attempt resume.
+
+Git credentials never enter the database: SQLite keeps old row versions in
+the WAL and in free pages long after an UPDATE drops them. enqueue() moves
+payload["credentials"] to its own file under <path>.secrets/ (directory
+0700, file 0600), claim() hands it to the worker in memory, and the file is
+deleted as soon as the job reaches a terminal status. The database itself is
+created with mode 0600.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATUSES = {COMPLETED, FAILED}
+
+
+class QueueFullError(Exception):
+    """Raised when the number of queued jobs reached the configured limit."""
+
+
+class JobQueue:
+    """
+    Jobs table shared by the API and the workers.
+
+    Usage:
+        queue = JobQueue(".docgen_cache/jobs.sqlite3", max_depth=100)
+        job_id = queue.enqueue({"source_type": "git", "path": url}, priority=5, dedup_key=key)
+        job = queue.claim("worker-1")          # in a worker process
+        queue.update(job["id"], {"status": "completed", ...})
+        queue.get(job_id)                      # status dict for /status
+    """
+
+    def __init__(self, path: str = ".docgen_cache/jobs.sqlite3", max_depth: int = 0, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite database file
+            max_depth: Maximum number of queued (not yet claimed) jobs, 0 = unlimited
+            max_attempts: Claims per job before a crashed job is marked failed
+        """
+        self.path = path
+        self.max_depth = max_depth
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        self.secrets_path = f"{path}.secrets"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.makedirs(self.secrets_path, mode=0o700, exist_ok=True)
+        # SQLite gives the -wal and -shm files the database's permissions
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+                "status TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 0, "
+                "payload TEXT NOT NULL, result TEXT, worker TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, seq)")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "dedup_key" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN dedup_key TEXT")
+            # One active job per key; the constraint makes coalescing race-free across processes
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(dedup_key) "
+                f"WHERE dedup_key IS NOT NULL AND status IN ('{QUEUED}', '{PROCESSING}')"
+            )
+
+    def _secret_file(self, job_id: str) -> str:
+        return os.path.join(self.secrets_path, job_id)
+
+    def _store_secret(self, job_id: str, secret: str):
+        tmp_path = f"{self._secret_file(job_id)}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(secret)
+        os.replace(tmp_path, self._secret_file(job_id))
+
+    def _load_secret(self, job_id: str) -> Optional[str]:
+        try:
+            with open(self._secret_file(job_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _drop_secret(self, job_id: str):
+        try:
+            os.remove(self._secret_file(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _active_job(self, dedup_key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT id FROM jobs WHERE dedup_key = ? AND status IN (?, ?)", (dedup_key, QUEUED, PROCESSING)
+        ).fetchone()
+        return row[0] if row else None
+
+    def enqueue(
+        self,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        job_id: Optional[str] = None,
+        dedup_key: Optional[str] = None
+    ) -> str:
+        """
+        Add a job and return its id; raises QueueFullError when the queue is at max_depth.
+
+        With dedup_key, a queued or running job with the same key is reused:
+        its id is returned and nothing is added.
+
+        payload["credentials"] is kept out of the database (see the module docstring).
+        """
+        job_id = job_id or str(uuid.uuid4())
+        payload = dict(payload)
+        credentials = payload.pop("credentials", None)
+        with self._lock:
+            for _ in range(2):
+                try:
+                    with self._conn:
+                        if dedup_key:
+                            active = self._active_job(dedup_key)
+                            if active:
+                                return active
+                        if self.max_depth:
+                            depth = self._conn.execute(
+                                "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+                            ).fetchone()[0]
+                            if depth >= self.max_depth:
+                                raise QueueFullError(f"{depth} jobs are already queued (limit {self.max_depth})")
+                        # Written before the row exists, so no worker claims the job without it
+                        if credentials:
+                            self._store_secret(job_id, credentials)
+                        self._conn.execute(
+                            "INSERT INTO jobs (id, status, priority, payload, result, created_at, dedup_key) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (job_id, QUEUED, int(priority), json.dumps(payload),
+                             json.dumps({"status": QUEUED, "message": "Waiting for a worker."}), time.time(),
+                             dedup_key)
+                        )
+                    return job_id
+                except sqlite3.IntegrityError:
+                    self._drop_secret(job_id)
+                    # Another process enqueued the same key in between; attach to its job
+                    if not dedup_key:
+                        raise
+                except Exception:
+                    self._drop_secret(job_id)
+                    raise
+            raise RuntimeError(f"Could not enqueue or attach job for key {dedup_key}")
+
+    def add_completed(self, payload: Dict[str, Any], status: Dict[str, Any], dedup_key: Optional[str] = None) -> str:
+        """Record a job that is already complete, e.g. one answered from the result cache."""
+        job_id = str(uuid.uuid4())
+        payload = {k: v for k, v in payload.items() if k != "credentials"}
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, payload, result, created_at, finished_at, dedup_key) "
+                "VALUES (?, ?, 0, ?, ?, ?, ?, ?)",
+                (job_id, status.get("status", COMPLETED), json.dumps(payload), json.dumps(status, default=str),
+                 now, now, dedup_key)
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the next queued job, or return None if there is none."""
+        now = time.time()
+        result = json.dumps({"status": PROCESSING, "message": "Documentation is being generated."})
+        with self._lock, self._conn:
+            # A single UPDATE ... RETURNING is atomic across processes
+            row = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, result = ? "
+                "WHERE seq = (SELECT seq FROM jobs WHERE status = ? ORDER BY priority DESC, seq LIMIT 1) "
+                "RETURNING id, payload, priority, attempts",
+                (PROCESSING, worker_id, now, now, result, QUEUED)
+            ).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row[1])
+        credentials = self._load_secret(row[0])
+        if credentials is not None:
+            payload["credentials"] = credentials
+        return {"id": row[0], "payload": payload, "priority": row[2], "attempts": row[3]}
+
+    def update(self, job_id: str, status: Dict[str, Any], worker_id: Optional[str] = None) -> bool:
+        """
+        Store a job's status dict.
+
+        With worker_id, the update only applies while that worker still owns
+        the job, so a worker presumed dead cannot overwrite a requeued job.
+        A terminal status also deletes the job's credentials file.
+
+        Returns:
+            Whether the job was updated
+        """
+        now = time.time()
+        state = status.get("status", PROCESSING)
+        owner_clause, owner_args = (" AND worker = ? AND status = ?", (worker_id, PROCESSING)) if worker_id else ("", ())
+        with self._lock, self._conn:
+            if state in TERMINAL_STATUSES:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, finished_at = ?, heartbeat_at = ? "
+                    "WHERE id = ?" + owner_clause,
+                    (state, json.dumps(status, default=str), now, now, job_id) + owner_args
+                )
+                if cursor.rowcount:
+                    self._drop_secret(job_id)
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, heartbeat_at = ? WHERE id = ?" + owner_clause,
+                    (state, json.dumps(status, default=str), now, job_id) + owner_args
+                )
+        return cursor.rowcount > 0
+
+    def heartbeat(self, job_id: str, worker_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                               (time.time(), job_id, worker_id, PROCESSING))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job's status dict (plus its queue position while queued), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, priority, seq FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            status = json.loads(row[1]) if row[1] else {"status": row[0]}
+            if row[0] == QUEUED:
+                ahead = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ? AND (priority > ? OR (priority = ? AND seq < ?))",
+                    (QUEUED, row[2], row[2], row[3])
+                ).fetchone()[0]
+                status["position"] = ahead + 1
+        return status
+
+    def requeue_stale(self, timeout_seconds: float) -> List[str]:
+        """
+        Return jobs whose worker stopped heartbeating to the queue.
+
+        Jobs already claimed max_attempts times are marked failed instead.
+        """
+        cutoff = time.time() - timeout_seconds
+        with self._lock, self._conn:
+            stale = self._conn.execute(
+                "SELECT id, attempts FROM jobs WHERE status = ? AND heartbeat_at < ?", (PROCESSING, cutoff)
+            ).fetchall()
+            requeued = []
+            for job_id, attempts in stale:
+                if attempts >= self.max_attempts:
+                    status = {"status": FAILED, "error": f"Worker died {attempts} times while running this job"}
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+                        (FAILED, json.dumps(status), time.time(), job_id)
+                    )
+                    self._drop_secret(job_id)
+                else:
+                    status = {"status": QUEUED, "message": "Worker stopped; job queued again and will resume."}
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, result = ?, worker = NULL WHERE id = ?",
+                        (QUEUED, json.dumps(status), job_id)
+                    )
+                    requeued.append(job_id)
+        if stale:
+            logger.warning(f"Recovered {len(stale)} stale jobs ({len(requeued)} requeued)")
+        return requeued
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (COMPLETED, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "processing": counts.get(PROCESSING, 0),
+            "completed": counts.get(COMPLETED, 0),
+            "failed": counts.get(FAILED, 0),
+            "max_depth": self.max_depth,
+        }
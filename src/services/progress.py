@@ -0,0 +1,146 @@
+"""
+Structured progress events for documentation jobs.
+
+ProgressTracker turns stage transitions and per-stage counters into one
+progress dict, which the pipeline publishes as part of the job status:
+
+    {
+        "stage": "map",
+        "stages": ["clone", "extract", "map", "index", "document"],
+        "stage_index": 2,
+        "completed": 40,
+        "total": 120,
+        "failed": 1,
+        "stage_elapsed_seconds": 12.5,
+        "eta_seconds": 25.0,
+        "elapsed_seconds": 31.2,
+        "history": {"clone": 4.1, "extract": 14.6}
+    }
+
+Counter updates are throttled (min_interval) so a fast stage does not write
+the job row for every item; stage transitions are always published.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+STAGES = ["clone", "extract", "map", "index", "document"]
+
+
+class ProgressTracker:
+    """
+    Tracks the current stage of a job and publishes progress dicts.
+
+    Usage:
+        tracker = ProgressTracker(publish=lambda progress: report({"status": "processing", "progress": progress}))
+        tracker.start_stage("extract", total=len(files))
+        for ...:
+            tracker.advance()
+        tracker.start_stage("map", total=len(classes))
+        CodeMapper(...).run(classes, progress_callback=tracker.callback())
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[Dict[str, Any]], None],
+        stages: Optional[List[str]] = None,
+        min_interval: float = 0.5
+    ):
+        """
+        Args:
+            publish: Receives a progress dict on every published change
+            stages: Ordered stage names of the job
+            min_interval: Minimum seconds between two counter-only publishes
+        """
+        self.publish = publish
+        self.stages = list(stages or STAGES)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._stage: Optional[str] = None
+        self._stage_started = self._started
+        self._completed = 0
+        self._total: Optional[int] = None
+        self._failed = 0
+        self._history: Dict[str, float] = {}
+        self._last_publish = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        stage_elapsed = now - self._stage_started
+        eta = None
+        if self._total is not None and self._completed:
+            eta = stage_elapsed / self._completed * max(self._total - self._completed, 0)
+        return {
+            "stage": self._stage,
+            "stages": self.stages,
+            "stage_index": self.stages.index(self._stage) if self._stage in self.stages else None,
+            "completed": self._completed,
+            "total": self._total,
+            "failed": self._failed,
+            "stage_elapsed_seconds": round(stage_elapsed, 3),
+            "eta_seconds": round(eta, 3) if eta is not None else None,
+            "elapsed_seconds": round(now - self._started, 3),
+            "history": dict(self._history),
+        }
+
+    def _emit(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_publish < self.min_interval:
+            return
+        self._last_publish = now
+        self.publish(self.snapshot())
+
+    def start_stage(self, stage: str, total: Optional[int] = None):
+        """Close the current stage and start the next one."""
+        with self._lock:
+            now = time.monotonic()
+            if self._stage is not None:
+                self._history[self._stage] = round(now - self._stage_started, 3)
+            if stage not in self.stages:
+                self.stages.append(stage)
+            self._stage = stage
+            self._stage_started = now
+            self._completed = 0
+            self._failed = 0
+            self._total = total
+            self._emit(force=True)
+
+    def set_total(self, total: int):
+        with self._lock:
+            self._total = total
+            self._emit(force=True)
+
+    def advance(self, count: int = 1, failed: int = 0):
+        """Count finished items of the current stage; safe to call from worker threads."""
+        with self._lock:
+            self._completed += count
+            self._failed += failed
+            self._emit(force=self._total is not None and self._completed >= self._total)
+
+    def update(self, completed: int, total: Optional[int] = None, failed: int = 0):
+        """Set the counters of the current stage to absolute values."""
+        with self._lock:
+            self._completed = completed
+            self._failed = failed
+            if total is not None:
+                self._total = total
+            self._emit(force=self._total is not None and self._completed >= self._total)
+
+    def callback(self) -> Callable[[Dict[str, Any]], None]:
+        """
+        Adapter for the progress_callback of CodeMapper, DocumentationCreator
+        and WeaviateCodeWriter, which report running counts as dicts.
+        """
+        def on_progress(event: Dict[str, Any]):
+            completed = event.get("completed", event.get("total_documents", 0))
+            self.update(completed, total=event.get("total"), failed=event.get("failed", 0))
+        return on_progress
+
+    def finish(self) -> Dict[str, Any]:
+        """Close the last stage and return the final snapshot, for the terminal status."""
+        with self._lock:
+            if self._stage is not None:
+                self._history[self._stage] = round(time.monotonic() - self._stage_started, 3)
+            return self.snapshot()
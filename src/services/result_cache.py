@@ -0,0 +1,179 @@
+"""
+Request coalescing and result caching for /generate.
+
+Identical requests produce identical documentation, so they should not run
+twice. request_key() derives a key from exactly the inputs of a job:
+
+- the source (git URL without credentials, or local folder path)
+- its revision: for git, the commit the requested ref (default: the remote
+  HEAD) resolves to (git ls-remote, no clone); for a local folder, a
+  fingerprint of its source files' paths, sizes and mtimes
+- the base commit of an incremental run
+- a hash of config.yaml without its runtime-only sections
+
+The API attaches a request to the queued or running job with the same key
+(see JobQueue.enqueue). Once such a job completed, its status and mapping
+are kept in ResultCache and served for jobs.result_retention seconds.
+"""
+
+import json
+import os
+import shutil
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.config import AppConfig
+from src.services.checkpoint import JobCheckpoint, fingerprint
+from src.services.file_discovery import FileDiscovery, file_discovery_from_config
+from src.services.input_handler import InputHandler
+
+logger = logging.getLogger(__name__)
+
+# Config sections that change how jobs run, not what they produce
+RUNTIME_SECTIONS = {"jobs", "checkpoint", "git_cache", "verbose"}
+
+
+def config_fingerprint(config: AppConfig) -> str:
+    """Hash of the config values that can change a job's output."""
+    return fingerprint({k: v for k, v in config.config.items() if k not in RUNTIME_SECTIONS})
+
+
+def folder_fingerprint(folder: str, discovery: Optional[FileDiscovery] = None) -> str:
+    """Hash of the paths, sizes and mtimes of a folder's source files."""
+    records = (discovery or FileDiscovery()).walk(folder)
+    return fingerprint(sorted((r.rel_path, r.size, r.mtime_ns) for r in records))
+
+
+def request_key(
+    source_type: str,
+    path: str,
+    credentials: Optional[str],
+    base_commit: Optional[str],
+    config: AppConfig,
+    input_handler: Optional[InputHandler] = None,
+    ref: Optional[str] = None
+) -> Optional[Tuple[str, str]]:
+    """
+    Derive the coalescing key of a /generate request.
+
+    Returns:
+        (key, revision), or None when the revision cannot be resolved; such
+        requests are queued without coalescing and fail or succeed on their own.
+    """
+    input_handler = input_handler or InputHandler()
+    try:
+        if source_type == "git":
+            revision = input_handler.resolve_remote_head(path, credentials, ref)
+        elif source_type == "local" and os.path.isdir(path):
+            revision = folder_fingerprint(os.path.abspath(path), file_discovery_from_config(config))
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"Not coalescing request for {path}: {e}")
+        return None
+
+    source = path if source_type == "git" else os.path.abspath(path)
+    key = JobCheckpoint.make_key(source_type, source, revision, base_commit, config_fingerprint(config))
+    return key, revision
+
+
+class ResultCache:
+    """
+    Completed job results, one directory per request key.
+
+    Usage:
+        cache = ResultCache(".docgen_cache/results", retention_seconds=86400)
+        status = cache.get(key)            # cached status dict or None
+        cache.put(key, status, mapped_data)
+        cache.prune()
+    """
+
+    RESULTS_FILE = "mapped_ast.json"
+    STATUS_FILE = "status.json"
+
+    def __init__(self, path: str = ".docgen_cache/results", retention_seconds: float = 86400):
+        """
+        Args:
+            path: Directory holding the cached results
+            retention_seconds: How long a result is served; 0 disables the cache
+        """
+        self.path = path
+        self.retention_seconds = retention_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_seconds > 0
+
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached status of a completed job, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        try:
+            with open(os.path.join(self._dir(key), self.STATUS_FILE), "r", encoding="utf-8") as f:
+                status = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - status.get("cached_at", 0) > self.retention_seconds:
+            shutil.rmtree(self._dir(key), ignore_errors=True)
+            return None
+        if not os.path.exists(status.get("results_file", "")):
+            return None
+        return status
+
+    def put(self, key: str, status: Dict[str, Any], mapped_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Keep a completed job's mapping and status.
+
+        The mapping is written from the job's own data rather than copied
+        from the shared output file, which a concurrent job may already have
+        overwritten; the cached status points to the cached copy.
+
+        Returns:
+            The cached status, or None if the cache is disabled or not writable
+        """
+        if not self.enabled:
+            return None
+        directory = self._dir(key)
+        cached_results = os.path.join(directory, self.RESULTS_FILE)
+        cached = {**status, "results_file": cached_results, "cached_at": time.time()}
+        try:
+            os.makedirs(directory, exist_ok=True)
+            tmp_results = f"{cached_results}.{os.getpid()}.tmp"
+            with open(tmp_results, "w", encoding="utf-8") as f:
+                json.dump(mapped_data, f, indent=2)
+            os.replace(tmp_results, cached_results)
+
+            status_path = os.path.join(directory, self.STATUS_FILE)
+            tmp_status = f"{status_path}.{os.getpid()}.tmp"
+            with open(tmp_status, "w", encoding="utf-8") as f:
+                json.dump(cached, f, default=str)
+            os.replace(tmp_status, status_path)
+        except OSError as e:
+            logger.warning(f"Could not cache results for {key}: {e}")
+            return None
+        return cached
+
+    def prune(self) -> int:
+        """Delete expired results; returns how many were removed."""
+        try:
+            keys = os.listdir(self.path)
+        except OSError:
+            return 0
+        removed = 0
+        for key in keys:
+            if self.get(key) is None and os.path.isdir(self._dir(key)):
+                shutil.rmtree(self._dir(key), ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def result_cache_from_config(config: AppConfig) -> ResultCache:
+    """Open the result cache described by the jobs.* config section."""
+    return ResultCache(
+        config.get("jobs.result_cache_path", ".docgen_cache/results"),
+        retention_seconds=float(config.get("jobs.result_retention", 86400))
+    )
@@ -0,0 +1,211 @@
+"""
+WorkerPool - processes that claim documentation jobs from the JobQueue.
+
+Each worker is a separate process (spawned, so no web server state is
+inherited) that loops: claim the next job, run process_documentation,
+store its status, repeat. While a job runs, a thread heartbeats it so the
+supervisor can tell a slow job from a dead worker. The supervisor thread
+restarts workers that exited and requeues jobs whose heartbeat went stale.
+Workers are not daemonic, so a job can start its own process pool (parallel
+extraction); stop() shuts them down.
+
+The API starts a pool in-process by default (jobs.embedded_workers). Set it
+to false to run the pool on its own, e.g. on another host sharing the queue
+file or next to several uvicorn workers:
+
+    python -m src.services.worker_pool
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import logging
+from typing import List, Optional
+
+from src.core.config import AppConfig, get_app_config
+from src.services.job_queue import JobQueue, PROCESSING, FAILED
+from src.services.result_cache import result_cache_from_config
+
+logger = logging.getLogger(__name__)
+
+
+def job_queue_from_config(config: AppConfig) -> JobQueue:
+    """Open the job queue described by the jobs.* config section."""
+    return JobQueue(
+        config.get("jobs.path", ".docgen_cache/jobs.sqlite3"),
+        max_depth=int(config.get("jobs.max_queue_depth", 0)),
+        max_attempts=int(config.get("jobs.max_attempts", 3))
+    )
+
+
+def run_job(queue: JobQueue, job: dict, worker_id: str, heartbeat_interval: float):
+    """Run one claimed job to a terminal status."""
+    from src.services.documentation_pipeline import process_documentation
+
+    job_id = job["id"]
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(heartbeat_interval):
+            queue.heartbeat(job_id, worker_id)
+
+    heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    heartbeat.start()
+    last_status = {}
+
+    def report(status: dict):
+        last_status.update(status)
+        queue.update(job_id, status, worker_id=worker_id)
+
+    try:
+        payload = job["payload"]
+        process_documentation(
+            payload.get("source_type"),
+            payload.get("path"),
+            payload.get("credentials"),
+            job_id,
+            payload.get("base_commit"),
+            report=report,
+            result_key=payload.get("dedup_key"),
+            revision=payload.get("revision"),
+            ref=payload.get("ref")
+        )
+    except Exception as e:
+        logger.exception(f"Job {job_id} crashed")
+        report({"status": FAILED, "error": str(e)})
+    finally:
+        done.set()
+        heartbeat.join()
+
+    if last_status.get("status", PROCESSING) == PROCESSING:
+        report({"status": FAILED, "error": "Job finished without reporting a result"})
+
+
+def worker_main(queue_path: str, worker_id: str, poll_interval: float, heartbeat_interval: float, stop_event):
+    """Entry point of a worker process."""
+    config = get_app_config()
+    queue = JobQueue(queue_path, max_attempts=int(config.get("jobs.max_attempts", 3)))
+    logger.info(f"Worker {worker_id} started (pid {os.getpid()})")
+    while not stop_event.is_set():
+        job = queue.claim(worker_id)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        logger.info(f"Worker {worker_id} claimed job {job['id']} (attempt {job['attempts']})")
+        run_job(queue, job, worker_id, heartbeat_interval)
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of worker processes plus a supervisor thread.
+
+    Usage:
+        pool = WorkerPool(config=config)
+        pool.start()
+        ...
+        pool.stop()
+    """
+
+    def __init__(
+        self,
+        queue_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        stale_after: Optional[float] = None,
+        config: Optional[AppConfig] = None
+    ):
+        """
+        Args:
+            queue_path: SQLite queue file (jobs.path)
+            workers: Number of worker processes (jobs.workers); 0 uses every CPU
+            poll_interval: Seconds an idle worker waits before polling again
+            heartbeat_interval: Seconds between heartbeats of a running job
+            stale_after: Seconds without heartbeat after which a job is requeued
+            config: Shared app config
+        """
+        config = config or get_app_config()
+        self.queue = job_queue_from_config(config) if queue_path is None else JobQueue(queue_path)
+        workers = int(config.get("jobs.workers", 2) if workers is None else workers)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.poll_interval = float(config.get("jobs.poll_interval", 1.0) if poll_interval is None else poll_interval)
+        self.heartbeat_interval = float(
+            config.get("jobs.heartbeat_interval", 10.0) if heartbeat_interval is None else heartbeat_interval
+        )
+        self.stale_after = float(config.get("jobs.stale_after", 60.0) if stale_after is None else stale_after)
+        self.result_cache = result_cache_from_config(config)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes: List[Optional[multiprocessing.Process]] = [None] * self.workers
+        self._supervisor: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def _spawn(self, index: int):
+        worker_id = f"{os.uname().nodename}-{os.getpid()}-{index}-{int(time.time())}"
+        process = self._context.Process(
+            target=worker_main,
+            args=(self.queue.path, worker_id, self.poll_interval, self.heartbeat_interval, self._stop_event),
+            name=f"docgen-worker-{index}",
+            # Not daemonic: jobs start their own process pools (parallel extraction)
+            daemon=False
+        )
+        process.start()
+        self._processes[index] = process
+
+    def _supervise(self):
+        while not self._stopping.wait(min(self.stale_after / 2, 5.0)):
+            for index, process in enumerate(self._processes):
+                if process is not None and not process.is_alive():
+                    logger.warning(f"Worker {index} exited with code {process.exitcode}, restarting")
+                    self._spawn(index)
+            self.queue.requeue_stale(self.stale_after)
+            self.result_cache.prune()
+
+    def start(self):
+        # Jobs left running by a previous server instance get picked up again
+        self.queue.requeue_stale(self.stale_after)
+        for index in range(self.workers):
+            self._spawn(index)
+        self._supervisor = threading.Thread(target=self._supervise, name="docgen-worker-supervisor", daemon=True)
+        self._supervisor.start()
+        logger.info(f"Started {self.workers} documentation workers on {self.queue.path}")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop claiming jobs and shut the workers down.
+
+        Workers are not daemonic, so they must be stopped here: one that is
+        still busy after timeout is terminated, and its job is requeued by
+        the next pool.
+        """
+        self._stopping.set()
+        self._stop_event.set()
+        # The supervisor must not restart workers while they are being stopped
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join(timeout)
+
+    def alive(self) -> int:
+        return sum(1 for process in self._processes if process is not None and process.is_alive())
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    pool = WorkerPool()
+    pool.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Document store selection.
+
+Every stage gets its document store from here, so one config key switches
+the whole pipeline between a Weaviate server and the embedded
+LocalDocumentStore:
+
+    document_store:
+      backend: "local"            # or "weaviate" (default)
+      path: ".docgen_cache/vector_store"
+"""
+
+from typing import Any, Dict, Optional
+import logging
+
+from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
+from haystack_integrations.components.retrievers.weaviate import WeaviateEmbeddingRetriever
+
+from src.utils.local_document_store import LocalDocumentStore, LocalEmbeddingRetriever, get_local_document_store
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("weaviate", "local")
+
+
+def get_document_store(
+    config: Any,
+    weaviate_url: Optional[str] = None,
+    additional_headers: Optional[Dict[str, str]] = None
+):
+    """
+    Create the document store selected by `document_store.backend`.
+
+    Args:
+        config: Settings or AppConfig (anything with get("a.b", default))
+        weaviate_url: Weaviate URL, used by the weaviate backend
+        additional_headers: Optional Weaviate headers (e.g. API keys)
+
+    Returns:
+        WeaviateDocumentStore or LocalDocumentStore
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = str(config.get("document_store.backend", "weaviate")).lower()
+
+    if backend == "weaviate":
+        return WeaviateDocumentStore(
+            url=weaviate_url or config.get("WEAVIATE_URL", "http://127.0.0.1:8080"),
+            additional_headers=additional_headers or {}
+        )
+    if backend == "local":
+        path = config.get("document_store.path", ".docgen_cache/vector_store")
+        logger.info(f"Using embedded document store at {path}")
+        return get_local_document_store(
+            path,
+            nprobe=config.get("document_store.nprobe", 8),
+            ivf_min_rows=config.get("document_store.ivf_min_rows", 4096)
+        )
+    raise ValueError(f"Unsupported document store backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+
+def get_embedding_retriever(document_store: Any, top_k: int = 10):
+    """Return the embedding retriever matching a document store."""
+    if isinstance(document_store, LocalDocumentStore):
+        return LocalEmbeddingRetriever(document_store=document_store, top_k=top_k)
+    return WeaviateEmbeddingRetriever(document_store=document_store, top_k=top_k)
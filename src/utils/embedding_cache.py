@@ -0,0 +1,242 @@
+"""
+Embedding cache - persistent store of document embeddings keyed by content hash.
+
+Vectors live in one compact float32 file per embedding model, read through a
+NumPy memory map, next to a JSON index mapping content keys to row numbers.
+Keys are derived from (model name, whitespace-normalized content), so
+re-indexing an unchanged method reuses its vector instead of re-running
+the sentence-transformers model. CachedDocumentEmbedder wraps a Haystack
+document embedder and only sends cache misses to the model, which is not
+even loaded when every document is already cached.
+
+Several worker processes may share a cache directory (on POSIX). Appends and
+index writes hold an exclusive file lock: the row offset of an append is derived
+from the vector file's size under that lock, and flush() merges the index on
+disk with this process's rows before replacing it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from haystack import component, Document
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Memory-mapped float32 embedding store for a single model.
+
+    Usage:
+        cache = EmbeddingCache(".docgen_cache/embeddings", "sentence-transformers/all-MiniLM-L6-v2")
+        vectors = cache.get_many(texts)          # None for every miss
+        cache.put_many(missing_texts, missing_vectors)
+        cache.flush()
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        self.model_name = model_name
+        model_key = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        self.cache_dir = os.path.join(cache_dir, model_key)
+        self.vectors_path = os.path.join(self.cache_dir, "vectors.f32")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.lock_path = os.path.join(self.cache_dir, "lock")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._vectors: Optional[np.memmap] = None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        index = self._read_index()
+        if index:
+            self.dim = index.get("dim")
+            self._rows = index.get("rows", {})
+        self._drop_rows_beyond_file()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared with every process using this cache directory."""
+        try:
+            import fcntl
+        except ImportError:
+            # No flock on Windows; the cache is then not safe to share between processes
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable embedding index {self.index_path}: {e}")
+            return None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join((text or "").split())
+
+    def make_key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{self.normalize(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _row_count(self) -> int:
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _drop_rows_beyond_file(self):
+        # An interrupted write can leave index rows pointing past the vector file
+        count = self._row_count()
+        if any(row >= count for row in self._rows.values()):
+            self._rows = {key: row for key, row in self._rows.items() if row < count}
+
+    def _matrix(self) -> Optional[np.memmap]:
+        count = self._row_count()
+        if count == 0:
+            return None
+        if self._vectors is None or self._vectors.shape[0] != count:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        return self._vectors
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return the cached vector for each text, or None where it is not cached."""
+        with self._lock:
+            matrix = self._matrix()
+            results = []
+            for text in texts:
+                row = self._rows.get(self.make_key(text))
+                if row is None or matrix is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    results.append(matrix[row].tolist())
+            return results
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """Append vectors for texts not yet cached."""
+        with self._lock:
+            new_keys, new_vectors = [], []
+            for text, embedding in zip(texts, embeddings):
+                key = self.make_key(text)
+                if key in self._rows or key in new_keys:
+                    continue
+                new_keys.append(key)
+                new_vectors.append(embedding)
+            if not new_vectors:
+                return
+
+            block = np.asarray(new_vectors, dtype=np.float32)
+            if self.dim is None:
+                self.dim = block.shape[1]
+            elif block.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {block.shape[1]} does not match cache dimension {self.dim}")
+
+            with self._file_lock():
+                # Another process may have appended since; the offset is only
+                # valid while the lock is held. A torn row from a crash is cut off.
+                start = self._row_count()
+                with open(self.vectors_path, "ab") as f:
+                    f.truncate(start * 4 * self.dim)
+                    f.write(block.tobytes())
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = start + offset
+            self._dirty = True
+
+    def flush(self):
+        """Persist the key -> row index, merged with rows other processes flushed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            with self._file_lock():
+                index = self._read_index()
+                if index and index.get("dim") == self.dim:
+                    self._rows = {**index.get("rows", {}), **self._rows}
+                    self._drop_rows_beyond_file()
+                tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dim": self.dim, "rows": self._rows}, f)
+                os.replace(tmp_path, self.index_path)
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._rows),
+        }
+
+
+@component
+class CachedDocumentEmbedder:
+    """
+    Drop-in wrapper around a Haystack document embedder that reuses cached vectors.
+
+    Usage:
+        embedder = CachedDocumentEmbedder(
+            SentenceTransformersDocumentEmbedder(model=model_name),
+            EmbeddingCache(".docgen_cache/embeddings", model_name)
+        )
+        documents = embedder.run(documents=documents)["documents"]
+    """
+
+    def __init__(self, embedder: Any, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self._warm = False
+
+    def _text_to_embed(self, doc: Document) -> str:
+        # Mirror the text SentenceTransformersDocumentEmbedder builds, so prefixes and
+        # embedded meta fields are part of the key
+        meta_fields = getattr(self.embedder, "meta_fields_to_embed", None) or []
+        separator = getattr(self.embedder, "embedding_separator", "\n")
+        meta_values = [str(doc.meta[key]) for key in meta_fields if key in doc.meta and doc.meta[key]]
+        return (
+            getattr(self.embedder, "prefix", "")
+            + separator.join(meta_values + [doc.content or ""])
+            + getattr(self.embedder, "suffix", "")
+        )
+
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]):
+        texts = [self._text_to_embed(doc) for doc in documents]
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            # Load the model lazily: a fully cached run never pays for it
+            if not self._warm and hasattr(self.embedder, "warm_up"):
+                self.embedder.warm_up()
+                self._warm = True
+            embedded = self.embedder.run(documents=[documents[i] for i in missing])["documents"]
+            new_vectors = [doc.embedding for doc in embedded]
+            self.cache.put_many([texts[i] for i in missing], new_vectors)
+            self.cache.flush()
+            for i, vector in zip(missing, new_vectors):
+                vectors[i] = vector
+            logger.info(f"Embedded {len(missing)} of {len(documents)} documents ({len(documents) - len(missing)} cached)")
+
+        return {"documents": [replace(doc, embedding=list(vector)) for doc, vector in zip(documents, vectors)]}
@@ -0,0 +1,167 @@
+"""
+Identifier-aware BM25 index over code documents.
+
+Embedding similarity is weak at exact identifier lookups such as
+"authService.verify" or "get_user_by_id". This index tokenizes code the way
+developers name things. Every identifier contributes its full lowercase
+form, its dotted parts and its camelCase / snake_case words. Documents are
+scored with BM25, and method and class names weigh more than the body.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from haystack import Document
+
+IDENTIFIER_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*(?:\.[A-Za-z_$][A-Za-z0-9_$]*)*")
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Repeats per token, i.e. how much a match in each field counts
+FIELD_WEIGHTS = (("method_name", 3), ("class_name", 2))
+
+
+def split_identifier(identifier: str) -> List[str]:
+    """
+    Expand one identifier into its search tokens.
+
+    "authService.verify" -> ["authservice.verify", "authservice", "auth", "service", "verify"]
+    """
+    tokens = []
+    lowered = identifier.lower()
+    if "." in identifier:
+        tokens.append(lowered)
+    for part in identifier.split("."):
+        if not part:
+            continue
+        tokens.append(part.lower())
+        words = [w.lower() for chunk in part.split("_") for w in CAMEL_RE.findall(chunk)]
+        if len(words) > 1:
+            tokens.extend(words)
+    return tokens
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize free text or code into identifier tokens."""
+    tokens = []
+    for match in IDENTIFIER_RE.finditer(text or ""):
+        tokens.extend(split_identifier(match.group(0)))
+    return tokens
+
+
+class IdentifierIndex:
+    """
+    In-memory BM25 inverted index keyed by document id.
+
+    Usage:
+        index = IdentifierIndex()
+        index.build(documents)
+        hits = index.search("authService.verify", top_k=10)   # [(Document, score), ...]
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._documents: List[Document] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        self._avg_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @staticmethod
+    def document_tokens(doc: Document) -> List[str]:
+        tokens = tokenize(doc.content or "")
+        for field, weight in FIELD_WEIGHTS:
+            value = doc.meta.get(field)
+            if value:
+                tokens.extend(tokenize(str(value)) * weight)
+        return tokens
+
+    def build(self, documents: Iterable[Document]):
+        """Replace the index contents with `documents`."""
+        docs, lengths = [], []
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for doc in documents:
+            counts = Counter(self.document_tokens(doc))
+            idx = len(docs)
+            # Keep the index light: embeddings are not needed for keyword hits
+            docs.append(Document(id=doc.id, content=doc.content, meta=doc.meta))
+            lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                postings[token].append((idx, tf))
+
+        with self._lock:
+            self._documents = docs
+            self._postings = dict(postings)
+            self._lengths = lengths
+            self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def search(self, query: str, top_k: int = 10, doc_filter=None) -> List[Tuple[Document, float]]:
+        """
+        Return the best BM25 matches for a query.
+
+        Args:
+            query: Free text or identifiers
+            top_k: Maximum number of hits
+            doc_filter: Optional predicate on Document applied before ranking
+
+        Returns:
+            List of (Document, score), best first
+        """
+        with self._lock:
+            documents, postings = self._documents, self._postings
+            lengths, avg_length = self._lengths, self._avg_length
+
+        n = len(documents)
+        if not n:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            hits = postings.get(token)
+            if not hits:
+                continue
+            idf = math.log(1 + (n - len(hits) + 0.5) / (len(hits) + 0.5))
+            for idx, tf in hits:
+                norm = self.k1 * (1 - self.b + self.b * lengths[idx] / (avg_length or 1))
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for idx, score in ranked:
+            doc = documents[idx]
+            if doc_filter is not None and not doc_filter(doc):
+                continue
+            results.append((doc, score))
+            if len(results) >= top_k:
+                break
+        return results
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int = 60, top_k: Optional[int] = None) -> List[Document]:
+    """
+    Fuse several ranked lists with reciprocal-rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the lists it appears in;
+    the fused score replaces Document.score.
+    """
+    fused: Dict[str, float] = defaultdict(float)
+    first_seen: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc.id] += 1.0 / (k + rank)
+            first_seen.setdefault(doc.id, doc)
+
+    ordered = sorted(fused, key=lambda doc_id: fused[doc_id], reverse=True)
+    if top_k is not None:
+        ordered = ordered[:top_k]
+    results = []
+    for doc_id in ordered:
+        doc = first_seen[doc_id]
+        results.append(Document(id=doc.id, content=doc.content, meta=doc.meta, embedding=doc.embedding, score=fused[doc_id]))
+    return results
@@ -8,7 +8,7 @@ that can be used by both the AST extractor and WeaviateCodeWriter.
 import json
 import os
 import logging
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -38,39 +38,53 @@ def load_json_file(file_path: str) -> Optional[Union[List, Dict]]:
         return None
 
 
-def load_json_folder(folder_path: str) -> List[Dict[str, Any]]:
+def iter_json_folder(folder_path: str) -> Iterator[Dict[str, Any]]:
     """
-    Load all JSON files from a folder.
+    Lazily load JSON files from a folder, one file at a time.
     
-    Returns a list of dicts, each containing:
-    - file_name: The filename of the JSON file
-    - data: The parsed JSON content
+    Yields the same dicts as load_json_folder, in the same (sorted) order,
+    without holding every file in memory.
     
     Args:
         folder_path: Path to folder containing JSON files
         
-    Returns:
-        List of dictionaries with file_name and data
+    Yields:
+        Dictionaries with file_name and data
     """
-    json_files = []
-    
     if not os.path.exists(folder_path):
         logger.warning(f"Folder does not exist: {folder_path}")
-        return json_files
+        return
     
     if not os.path.isdir(folder_path):
         logger.warning(f"Path is not a directory: {folder_path}")
-        return json_files
+        return
     
     for filename in sorted(os.listdir(folder_path)):
         if filename.endswith('.json'):
             filepath = os.path.join(folder_path, filename)
             data = load_json_file(filepath)
             if data is not None:
-                json_files.append({
+                yield {
                     'file_name': filename,
                     'data': data
-                })
+                }
+
+
+def load_json_folder(folder_path: str) -> List[Dict[str, Any]]:
+    """
+    Load all JSON files from a folder.
+    
+    Returns a list of dicts, each containing:
+    - file_name: The filename of the JSON file
+    - data: The parsed JSON content
+    
+    Args:
+        folder_path: Path to folder containing JSON files
+        
+    Returns:
+        List of dictionaries with file_name and data
+    """
+    json_files = list(iter_json_folder(folder_path))
     
     logger.info(f"Loaded {len(json_files)} JSON files from {folder_path}")
     return json_files
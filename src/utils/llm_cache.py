@@ -0,0 +1,231 @@
+"""
+LLM response cache - persistent, SQLite-backed cache of generator replies.
+
+Prompts sent by CodeMapper and DocumentationCreator repeat heavily across
+runs. CachedGenerator wraps any Haystack generator and answers repeated
+prompts from disk. Entries are keyed by (provider, model, prompt hash,
+generation kwargs) and expire after a TTL. The least recently used entries
+are evicted past a maximum entry count.
+
+A reply is only stored once its caller has validated it (remember()), so an
+answer that parses but is unusable - a non-dict mapping, documentation
+without postman/swagger keys - is never replayed. Retries bypass the cache
+read (generate(..., attempt>0)) so they always reach the model. generate()
+runs its before_call hook (e.g. rate limiting) only for calls that do.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from haystack import component
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    SQLite store of LLM replies.
+
+    Usage:
+        cache = LLMResponseCache(".docgen_cache/llm_responses.sqlite3", ttl_seconds=86400)
+        key = cache.make_key("ollama", "llama3", prompt, {})
+        reply = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        path: str = ".docgen_cache/llm_responses.sqlite3",
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 100000
+    ):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Age after which an entry is ignored and purged; 0 disables expiry
+            max_entries: Maximum number of stored replies before LRU eviction
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, reply TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, generation_kwargs: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps({
+            "provider": provider,
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "generation_kwargs": generation_kwargs or {},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT reply, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, reply: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, reply, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, reply, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_caches: Dict[tuple, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(path: str, ttl_seconds: float, max_entries: int) -> LLMResponseCache:
+    """
+    Return the shared LLMResponseCache for a database file in this process.
+
+    Connections are not shared across fork(), so the process id is part of the key.
+    """
+    key = (os.getpid(), os.path.abspath(path))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = LLMResponseCache(path, ttl_seconds, max_entries)
+        return _caches[key]
+
+
+@component
+class CachedGenerator:
+    """
+    Drop-in wrapper around a Haystack generator that serves repeated prompts from an LLMResponseCache.
+
+    Usage:
+        generator = CachedGenerator(OllamaGenerator(...), cache, provider="ollama", model="llama3")
+        reply = generator.run(prompt)["replies"][0]
+        if is_valid(reply):
+            generator.remember(prompt, reply)
+    """
+
+    def __init__(self, generator: Any, cache: LLMResponseCache, provider: str, model: str):
+        self.generator = generator
+        self.cache = cache
+        self.provider = provider
+        self.model = model
+
+    def _key(self, prompt: str, generation_kwargs: Optional[Dict[str, Any]]) -> str:
+        effective_kwargs = {**(getattr(self.generator, "generation_kwargs", None) or {}), **(generation_kwargs or {})}
+        return self.cache.make_key(self.provider, self.model, prompt, effective_kwargs)
+
+    @component.output_types(replies=List[str], meta=List[Dict[str, Any]])
+    def run(self, prompt: str, generation_kwargs: Optional[Dict[str, Any]] = None, use_cache: bool = True):
+        """
+        Args:
+            prompt: Prompt sent to the wrapped generator
+            generation_kwargs: Passed through to the wrapped generator
+            use_cache: Read the cache first; retries pass False
+        """
+        if use_cache:
+            cached = self.lookup(prompt, generation_kwargs)
+            if cached is not None:
+                return {"replies": [cached], "meta": [{"model": self.model, "cached": True}]}
+
+        if generation_kwargs:
+            return self.generator.run(prompt, generation_kwargs=generation_kwargs)
+        return self.generator.run(prompt)
+
+    def lookup(self, prompt: str, generation_kwargs: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached reply to a prompt, or None."""
+        return self.cache.get(self._key(prompt, generation_kwargs))
+
+    def remember(self, prompt: str, reply: str, generation_kwargs: Optional[Dict[str, Any]] = None):
+        """Store a reply the caller has validated."""
+        self.cache.put(self._key(prompt, generation_kwargs), reply)
+
+
+def generate(
+    generator: Any,
+    prompt: str,
+    attempt: int = 0,
+    before_call: Optional[Callable[[], None]] = None
+) -> str:
+    """
+    Return the first reply of any generator; retries (attempt > 0) skip the cache read.
+
+    Args:
+        before_call: Runs only when the prompt is actually sent to the model,
+            not on a cache hit (e.g. a rate limiter's acquire)
+    """
+    if isinstance(generator, CachedGenerator):
+        if attempt == 0:
+            cached = generator.lookup(prompt)
+            if cached is not None:
+                return cached
+        if before_call:
+            before_call()
+        return generator.run(prompt, use_cache=False)["replies"][0]
+    if before_call:
+        before_call()
+    return generator.run(prompt)["replies"][0]
+
+
+def remember(generator: Any, prompt: str, reply: str):
+    """Cache a validated reply if the generator is cached; a no-op otherwise."""
+    if isinstance(generator, CachedGenerator):
+        generator.remember(prompt, reply)
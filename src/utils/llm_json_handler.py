@@ -10,6 +10,8 @@ import re
 import logging
 from typing import Optional, Any, Callable
 
+from src.utils.llm_cache import generate
+
 logger = logging.getLogger(__name__)
 
 
@@ -129,7 +131,7 @@ class LLMJsonHandler:
             except json.JSONDecodeError as e:
                 if attempt < max_retries:
                     logger.warning(f"Attempt {attempt + 1}: JSON parse error: {e}, retrying...")
-                    response = generator.run(prompt)['replies'][0]
+                    response = generate(generator, prompt, attempt=attempt + 1)
                 else:
                     logger.error(f"All {max_retries + 1} attempts failed. Last response: {response[:200]}...")
                     raise
@@ -0,0 +1,569 @@
+"""
+LocalDocumentStore - embedded vector store usable in place of WeaviateDocumentStore.
+
+Runs in-process, with no server, for CI, laptops and air-gapped runs. It
+implements the parts of the WeaviateDocumentStore interface the pipeline
+uses: Haystack metadata filters, bulk writes with duplicate policies,
+deletes and embedding retrieval.
+
+On-disk layout (under `path`):
+    documents.jsonl    append-only log of document puts/deletes (content, metadata, vector row)
+    vectors.f32        float32 matrix of L2-normalized embeddings, read through np.memmap
+    ivf.json           IVF index header (list count, generation, rows covered)
+    ivf_centroids.f32  IVF centroids
+    ivf_offsets.i64    start of each inverted list in ivf_rows.i32 (CSR layout)
+    ivf_rows.i32       vector rows grouped by inverted list
+
+Retrieval is exact (brute force over the matrix) for small stores and for
+filtered queries. Past `ivf_min_rows` vectors, unfiltered queries probe the
+`nprobe` nearest IVF lists and also scan rows written since the index was
+built. The index is rebuilt once that tail exceeds `rebuild_ratio`.
+
+Writes append to the log, so a bulk load costs O(batch) per write rather
+than rewriting every document. The log and the vector file are compacted
+once dead entries dominate them. Writers in several processes are
+serialized with a file lock (write.lock, POSIX only): a write first replays the entries
+other writers appended, and vector rows are derived from the file size only
+while the lock is held. Readers in other processes replay new log entries
+before every operation.
+"""
+
+import json
+import math
+import os
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from haystack import component, Document, default_to_dict, default_from_dict
+from haystack.document_stores.errors import DuplicateDocumentError
+from haystack.document_stores.types import DuplicatePolicy
+from haystack.utils.filters import document_matches_filter
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class LocalDocumentStore:
+    """
+    Embedded document store backed by memory-mapped NumPy files.
+
+    Usage:
+        store = LocalDocumentStore(".docgen_cache/vector_store")
+        store.write_documents(embedded_docs, policy=DuplicatePolicy.OVERWRITE)
+        hits = store._embedding_retrieval(query_embedding, top_k=10)
+    """
+
+    def __init__(
+        self,
+        path: str = ".docgen_cache/vector_store",
+        nprobe: int = 8,
+        ivf_min_rows: int = 4096,
+        rebuild_ratio: float = 0.2,
+        kmeans_iterations: int = 10
+    ):
+        """
+        Args:
+            path: Directory holding the store files
+            nprobe: Inverted lists scanned per IVF query (higher = better recall, slower)
+            ivf_min_rows: Vector count below which retrieval is always brute force
+            rebuild_ratio: Fraction of rows added since the last build that triggers an IVF rebuild
+            kmeans_iterations: Lloyd iterations used to train IVF centroids
+        """
+        self.path = path
+        self.nprobe = max(1, nprobe)
+        self.ivf_min_rows = ivf_min_rows
+        self.rebuild_ratio = rebuild_ratio
+        self.kmeans_iterations = kmeans_iterations
+
+        self.documents_path = os.path.join(path, "documents.jsonl")
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.ivf_path = os.path.join(path, "ivf.json")
+        self.lock_path = os.path.join(path, "write.lock")
+
+        self._lock = threading.RLock()
+        self._writer_depth = 0
+        self._writer_file = None
+        self._docs: Dict[str, Tuple[Document, Optional[int]]] = {}
+        self._row_ids: Dict[int, str] = {}
+        self.dim: Optional[int] = None
+        self._generation = 0
+        self._vectors: Optional[np.memmap] = None
+        self._ivf: Optional[Dict[str, Any]] = None
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+        self._log_records = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # Persistence
+
+    def _reset(self):
+        self._docs, self._row_ids, self._vectors, self._ivf = {}, {}, None, None
+        self.dim, self._generation = None, 0
+        self._log_inode, self._log_offset, self._log_records = None, 0, 0
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record.get("op")
+        if op == "header":
+            self.dim = record.get("dim")
+            self._generation = record.get("generation", 0)
+        elif op == "put":
+            doc_id = record["id"]
+            self._drop(doc_id)
+            row = record.get("row")
+            self._docs[doc_id] = (Document(id=doc_id, content=record.get("content"), meta=record.get("meta", {})), row)
+            if row is not None:
+                self._row_ids[row] = doc_id
+        elif op == "delete":
+            self._drop(record["id"])
+        self._log_records += 1
+
+    def _drop(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry and entry[1] is not None:
+            self._row_ids.pop(entry[1], None)
+
+    def _read_log(self, offset: int):
+        with open(self.documents_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written record; picked up on the next read
+                try:
+                    self._apply(json.loads(line))
+                except (json.JSONDecodeError, KeyError) as e:
+                    logger.warning(f"Skipping corrupt record in {self.documents_path}: {e}")
+                offset += len(line)
+        self._log_offset = offset
+        self._log_inode = os.stat(self.documents_path).st_ino
+
+    def _load(self):
+        self._reset()
+        try:
+            self._read_log(0)
+        except FileNotFoundError:
+            self._reset()
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable local store log {self.documents_path}: {e}")
+            self._reset()
+
+    def _maybe_reload(self):
+        """Replay log entries written by another process."""
+        try:
+            stat = os.stat(self.documents_path)
+        except OSError:
+            if self._log_inode is not None:
+                self._load()
+            return
+        if stat.st_ino != self._log_inode or stat.st_size < self._log_offset:
+            # The log was compacted or recreated elsewhere
+            self._load()
+        elif stat.st_size > self._log_offset:
+            self._read_log(self._log_offset)
+
+    @contextmanager
+    def _writing(self, reload: bool = True) -> Iterator[None]:
+        """
+        Hold the cross-process writer lock; re-entrant within this instance.
+
+        Args:
+            reload: Replay entries other writers appended once the lock is held
+        """
+        try:
+            import fcntl
+        except ImportError:
+            # No flock on Windows: writers are only serialized within this process
+            fcntl = None
+        with self._lock:
+            if self._writer_depth == 0 and fcntl is not None:
+                self._writer_file = open(self.lock_path, "a")
+                fcntl.flock(self._writer_file, fcntl.LOCK_EX)
+            self._writer_depth += 1
+            try:
+                if reload:
+                    self._maybe_reload()
+                yield
+            finally:
+                self._writer_depth -= 1
+                if self._writer_depth == 0 and self._writer_file is not None:
+                    fcntl.flock(self._writer_file, fcntl.LOCK_UN)
+                    self._writer_file.close()
+                    self._writer_file = None
+
+    def _append_records(self, records: List[Dict[str, Any]]):
+        payload = b"".join(json.dumps(r, default=str).encode("utf-8") + b"\n" for r in records)
+        with open(self.documents_path, "ab") as f:
+            f.write(payload)
+            self._log_offset = f.tell()
+        self._log_inode = os.stat(self.documents_path).st_ino
+        self._log_records += len(records)
+
+    def _header(self) -> Dict[str, Any]:
+        return {"op": "header", "dim": self.dim, "generation": self._generation}
+
+    def _rewrite_log(self):
+        records = [self._header()] + [
+            {"op": "put", "id": doc_id, "content": doc.content, "meta": doc.meta, "row": row}
+            for doc_id, (doc, row) in self._docs.items()
+        ]
+        payload = b"".join(json.dumps(r, default=str).encode("utf-8") + b"\n" for r in records)
+        _write_atomic(self.documents_path, payload)
+        self._log_offset = len(payload)
+        self._log_inode = os.stat(self.documents_path).st_ino
+        self._log_records = len(records)
+
+    def _file_rows(self) -> int:
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _matrix(self) -> Optional[np.memmap]:
+        rows = self._file_rows()
+        if rows == 0:
+            return None
+        if self._vectors is None or self._vectors.shape[0] != rows:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._vectors
+
+    def _append_vectors(self, block: np.ndarray) -> int:
+        # Called under the writer lock; a torn row from a crashed writer is cut off
+        start = self._file_rows()
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(start * 4 * self.dim)
+            f.write(np.ascontiguousarray(block, dtype=np.float32).tobytes())
+        return start
+
+    def _compact_if_needed(self):
+        """Rewrite the vector file and/or the log once dead entries dominate them."""
+        total = self._file_rows()
+        live = len(self._row_ids)
+        if total >= 1024 and live < total * 0.7:
+            matrix = self._matrix()
+            old_rows = sorted(self._row_ids)
+            block = np.asarray(matrix[old_rows]) if old_rows else np.zeros((0, self.dim), dtype=np.float32)
+            self._vectors = None
+            _write_atomic(self.vectors_path, block.astype(np.float32).tobytes())
+
+            remap = {old: new for new, old in enumerate(old_rows)}
+            self._row_ids = {remap[old]: doc_id for old, doc_id in self._row_ids.items()}
+            self._docs = {
+                doc_id: (doc, remap[row] if row is not None else None)
+                for doc_id, (doc, row) in self._docs.items()
+            }
+            # Row numbers changed, so any IVF index on disk is stale
+            self._generation += 1
+            self._ivf = None
+            self._rewrite_log()
+            logger.info(f"Compacted local vector store from {total} to {live} rows")
+        elif self._log_records > 2 * len(self._docs) + 1000:
+            self._rewrite_log()
+
+    # IVF index
+
+    def _load_ivf(self) -> Optional[Dict[str, Any]]:
+        if self._ivf is not None and self._ivf["generation"] == self._generation:
+            return self._ivf
+        try:
+            with open(self.ivf_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if header.get("generation") != self._generation or header.get("dim") != self.dim:
+            return None
+
+        nlist = header["nlist"]
+        self._ivf = {
+            **header,
+            "centroids": np.memmap(os.path.join(self.path, "ivf_centroids.f32"), dtype=np.float32, mode="r",
+                                   shape=(nlist, self.dim)),
+            "offsets": np.memmap(os.path.join(self.path, "ivf_offsets.i64"), dtype=np.int64, mode="r",
+                                 shape=(nlist + 1,)),
+            "rows": np.memmap(os.path.join(self.path, "ivf_rows.i32"), dtype=np.int32, mode="r",
+                              shape=(header["indexed_rows"],)) if header["indexed_rows"] else np.zeros(0, np.int32),
+        }
+        return self._ivf
+
+    def build_index(self):
+        """Train IVF centroids over the live vectors and persist the inverted lists."""
+        # No replay: a retrieval in progress holds row numbers of the current state
+        with self._writing(reload=False):
+            matrix = self._matrix()
+            rows = np.array(sorted(self._row_ids), dtype=np.int64)
+            if matrix is None or len(rows) == 0:
+                return
+
+            nlist = max(1, min(4096, int(math.sqrt(len(rows)))))
+            rng = np.random.default_rng(0)
+            sample_rows = rows if len(rows) <= 50000 else rng.choice(rows, 50000, replace=False)
+            sample = np.asarray(matrix[np.sort(sample_rows)])
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+            # Spherical k-means: vectors are unit length, so assign by dot product
+            for _ in range(self.kmeans_iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(nlist):
+                    members = sample[assign == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = _normalize(centroids).astype(np.float32)
+
+            assignments = np.empty(len(rows), dtype=np.int64)
+            for start in range(0, len(rows), 65536):
+                chunk = rows[start:start + 65536]
+                assignments[start:start + len(chunk)] = np.argmax(np.asarray(matrix[chunk]) @ centroids.T, axis=1)
+
+            order = np.argsort(assignments, kind="stable")
+            grouped_rows = rows[order].astype(np.int32)
+            counts = np.bincount(assignments, minlength=nlist)
+            offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+            _write_atomic(os.path.join(self.path, "ivf_centroids.f32"), centroids.tobytes())
+            _write_atomic(os.path.join(self.path, "ivf_offsets.i64"), offsets.tobytes())
+            _write_atomic(os.path.join(self.path, "ivf_rows.i32"), grouped_rows.tobytes())
+            header = {
+                "nlist": nlist,
+                "dim": self.dim,
+                "generation": self._generation,
+                "indexed_rows": int(len(grouped_rows)),
+                "file_rows": self._file_rows(),
+            }
+            _write_atomic(self.ivf_path, json.dumps(header).encode("utf-8"))
+            self._ivf = None
+            logger.info(f"Built IVF index with {nlist} lists over {len(rows)} vectors")
+
+    def _ivf_candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows worth scoring for an unfiltered query, or None to scan everything."""
+        live = len(self._row_ids)
+        if live < self.ivf_min_rows:
+            return None
+
+        ivf = self._load_ivf()
+        tail_start = ivf["file_rows"] if ivf else 0
+        if ivf is None or (self._file_rows() - tail_start) > self.rebuild_ratio * max(1, ivf["indexed_rows"]):
+            self.build_index()
+            ivf = self._load_ivf()
+            if ivf is None:
+                return None
+            tail_start = ivf["file_rows"]
+
+        nprobe = min(self.nprobe, ivf["nlist"])
+        nearest = np.argpartition(-(np.asarray(ivf["centroids"]) @ query), nprobe - 1)[:nprobe]
+        offsets = ivf["offsets"]
+        parts = [np.asarray(ivf["rows"][offsets[c]:offsets[c + 1]]) for c in nearest]
+        # Rows written after the index was built are not in any list yet
+        parts.append(np.arange(tail_start, self._file_rows(), dtype=np.int32))
+        # Drop rows of deleted or overwritten documents so they do not take top_k slots
+        return np.array([row for row in np.concatenate(parts).tolist() if row in self._row_ids], dtype=np.int64)
+
+    # Document store interface
+
+    def count_documents(self) -> int:
+        with self._lock:
+            self._maybe_reload()
+            return len(self._docs)
+
+    def _matching(self, filters: Optional[Dict[str, Any]]) -> List[Tuple[Document, Optional[int]]]:
+        if not filters:
+            return list(self._docs.values())
+        return [(doc, row) for doc, row in self._docs.values() if document_matches_filter(filters, doc)]
+
+    def _with_embedding(self, doc: Document, row: Optional[int]) -> Document:
+        matrix = self._matrix()
+        embedding = matrix[row].tolist() if row is not None and matrix is not None else None
+        return replace(doc, meta=dict(doc.meta), embedding=embedding)
+
+    def filter_documents(self, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        with self._lock:
+            self._maybe_reload()
+            return [self._with_embedding(doc, row) for doc, row in self._matching(filters)]
+
+    def write_documents(self, documents: List[Document], policy: DuplicatePolicy = DuplicatePolicy.NONE) -> int:
+        with self._writing():
+            to_write: Dict[str, Document] = {}
+            duplicates = []
+            for doc in documents:
+                if not isinstance(doc, Document):
+                    raise ValueError(f"Expected a Document, got '{type(doc)}' instead.")
+                exists = doc.id in self._docs or doc.id in to_write
+                if exists and policy == DuplicatePolicy.SKIP:
+                    continue
+                if exists and policy == DuplicatePolicy.FAIL:
+                    duplicates.append(doc.id)
+                    continue
+                to_write[doc.id] = doc
+            if duplicates:
+                raise DuplicateDocumentError(f"IDs '{', '.join(duplicates)}' already exist in the document store.")
+            if not to_write:
+                return 0
+
+            records = []
+            embedded = [doc for doc in to_write.values() if doc.embedding is not None]
+            first_row = None
+            if embedded:
+                block = np.asarray([doc.embedding for doc in embedded], dtype=np.float32)
+                if self.dim is None:
+                    self.dim = block.shape[1]
+                    records.append(self._header())
+                elif block.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dimension {block.shape[1]} does not match store dimension {self.dim}")
+                # Vectors go to disk before the log records that point at them
+                first_row = self._append_vectors(_normalize(block))
+            new_rows = {doc.id: first_row + i for i, doc in enumerate(embedded)}
+
+            for doc_id, doc in to_write.items():
+                self._drop(doc_id)
+                row = new_rows.get(doc_id)
+                self._docs[doc_id] = (replace(doc, embedding=None, score=None), row)
+                if row is not None:
+                    self._row_ids[row] = doc_id
+                records.append({"op": "put", "id": doc_id, "content": doc.content, "meta": doc.meta, "row": row})
+
+            self._append_records(records)
+            self._compact_if_needed()
+            return len(to_write)
+
+    def delete_documents(self, document_ids: List[str]) -> None:
+        with self._writing():
+            records = []
+            for doc_id in document_ids:
+                if doc_id in self._docs:
+                    self._drop(doc_id)
+                    records.append({"op": "delete", "id": doc_id})
+            if records:
+                self._append_records(records)
+                self._compact_if_needed()
+
+    def delete_by_filter(self, filters: Dict[str, Any]) -> int:
+        with self._writing():
+            ids = [doc.id for doc, _ in self._matching(filters)]
+            self.delete_documents(ids)
+            return len(ids)
+
+    def delete_all_documents(self, *, recreate_index: bool = False, batch_size: int = 1000) -> None:
+        with self._writing(reload=False):
+            self._vectors, self._ivf = None, None
+            for name in os.listdir(self.path):
+                if name.endswith((".json", ".jsonl", ".f32", ".i64", ".i32")):
+                    os.remove(os.path.join(self.path, name))
+            self._reset()
+
+    def _embedding_retrieval(
+        self,
+        query_embedding: List[float],
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10,
+        return_embedding: bool = False
+    ) -> List[Document]:
+        with self._lock:
+            self._maybe_reload()
+            matrix = self._matrix()
+            if matrix is None or not self._row_ids:
+                return []
+
+            query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+            if filters:
+                rows = np.array([row for _, row in self._matching(filters) if row is not None], dtype=np.int64)
+            else:
+                rows = self._ivf_candidates(query)
+
+            if rows is None:
+                # Exact scan straight over the memory map; dead rows are masked out
+                scores = matrix @ query
+                if len(self._row_ids) < matrix.shape[0]:
+                    live = np.zeros(matrix.shape[0], dtype=bool)
+                    live[list(self._row_ids)] = True
+                    scores = np.where(live, scores, -np.inf)
+                rows = np.arange(matrix.shape[0])
+            else:
+                if rows.size == 0:
+                    return []
+                rows = np.sort(rows)
+                scores = np.asarray(matrix[rows]) @ query
+            k = min(top_k, rows.size)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+
+            results = []
+            for i in best:
+                doc_id = self._row_ids.get(int(rows[i]))
+                if doc_id is None:
+                    continue  # masked dead row, only reached when top_k exceeds the live count
+                doc, row = self._docs[doc_id]
+                hit = self._with_embedding(doc, row) if return_embedding else replace(doc, meta=dict(doc.meta))
+                hit.score = float(scores[i])
+                results.append(hit)
+            return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            path=self.path,
+            nprobe=self.nprobe,
+            ivf_min_rows=self.ivf_min_rows,
+            rebuild_ratio=self.rebuild_ratio,
+            kmeans_iterations=self.kmeans_iterations,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LocalDocumentStore":
+        return default_from_dict(cls, data)
+
+
+_stores: Dict[tuple, LocalDocumentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_local_document_store(path: str, **kwargs) -> LocalDocumentStore:
+    """
+    Return the shared LocalDocumentStore for a directory in this process.
+
+    Every component writing to the same directory must share one instance so
+    their in-memory state stays consistent.
+    """
+    key = (os.getpid(), os.path.abspath(path))
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = LocalDocumentStore(path, **kwargs)
+        return _stores[key]
+
+
+@component
+class LocalEmbeddingRetriever:
+    """
+    Embedding retriever for LocalDocumentStore, mirroring WeaviateEmbeddingRetriever.
+
+    Usage:
+        retriever = LocalEmbeddingRetriever(document_store=store, top_k=10)
+        docs = retriever.run(query_embedding=embedding)["documents"]
+    """
+
+    def __init__(self, document_store: LocalDocumentStore, filters: Optional[Dict[str, Any]] = None, top_k: int = 10):
+        self.document_store = document_store
+        self.filters = filters
+        self.top_k = top_k
+
+    @component.output_types(documents=List[Document])
+    def run(self, query_embedding: List[float], filters: Optional[Dict[str, Any]] = None, top_k: Optional[int] = None):
+        documents = self.document_store._embedding_retrieval(
+            query_embedding=query_embedding,
+            filters=filters or self.filters,
+            top_k=top_k or self.top_k
+        )
+        return {"documents": documents}
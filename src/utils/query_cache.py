@@ -0,0 +1,185 @@
+"""
+Query-side caches for the RAG retrieval pipeline.
+
+Documentation prompts ask the same questions over and over. CachedTextEmbedder
+keeps an in-memory LRU of query embeddings, and CachedRetriever keeps an LRU of
+retrieval results keyed by (query embedding hash, top_k, filters, index version).
+
+The index version is a small file bumped by every writer (WeaviateCodeWriter,
+RAGService.indexing_pipeline). Because it is part of the retrieval key, any
+write makes older results unreachable, including writes made by another
+process. Both caches count hits and the latency that hits saved.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from haystack import component, Document
+
+logger = logging.getLogger(__name__)
+
+
+class IndexVersion:
+    """
+    Version token of the document index, shared across processes through a file.
+
+    Usage:
+        version = IndexVersion(".docgen_cache/index_version")
+        version.current()   # changes after every bump()
+        version.bump()      # call after writing documents
+    """
+
+    def __init__(self, path: str = ".docgen_cache/index_version"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._value = ""
+
+    def current(self) -> str:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return ""
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._value = f.read().strip()
+                except OSError:
+                    return ""
+                self._mtime = mtime
+            return self._value
+
+    def bump(self) -> str:
+        value = uuid.uuid4().hex
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Index version bumped to {value}")
+        return value
+
+
+class LRUCache:
+    """
+    Thread-safe LRU map that also tracks how much compute time its hits saved.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value, cost = entry
+            self.saved_seconds += cost
+            return value
+
+    def put(self, key: str, value: Any, cost_seconds: float = 0.0):
+        with self._lock:
+            self._entries[key] = (value, cost_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_ms": self.saved_seconds * 1000,
+            "entries": len(self._entries),
+        }
+
+
+@component
+class CachedTextEmbedder:
+    """
+    Wraps a Haystack text embedder with an LRU of query embeddings.
+
+    Usage:
+        embedder = CachedTextEmbedder(SentenceTransformersTextEmbedder(model=name), LRUCache(1024))
+    """
+
+    def __init__(self, embedder: Any, cache: LRUCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    def warm_up(self):
+        if hasattr(self.embedder, "warm_up"):
+            self.embedder.warm_up()
+
+    @component.output_types(embedding=List[float])
+    def run(self, text: str):
+        key = hashlib.sha256(f"{getattr(self.embedder, 'model', '')}\0{text}".encode("utf-8")).hexdigest()
+        embedding = self.cache.get(key)
+        if embedding is None:
+            start = time.perf_counter()
+            embedding = self.embedder.run(text=text)["embedding"]
+            self.cache.put(key, embedding, time.perf_counter() - start)
+        return {"embedding": embedding}
+
+
+@component
+class CachedRetriever:
+    """
+    Wraps an embedding retriever with an LRU of results that is invalidated by index writes.
+
+    Usage:
+        retriever = CachedRetriever(WeaviateEmbeddingRetriever(...), LRUCache(512), IndexVersion(path))
+    """
+
+    def __init__(self, retriever: Any, cache: LRUCache, index_version: IndexVersion):
+        self.retriever = retriever
+        self.cache = cache
+        self.index_version = index_version
+
+    def make_key(self, query_embedding: List[float], top_k: Optional[int], filters: Optional[Dict[str, Any]]) -> str:
+        payload = json.dumps({
+            "embedding": hashlib.sha256(json.dumps(query_embedding).encode("utf-8")).hexdigest(),
+            "top_k": top_k or getattr(self.retriever, "top_k", None),
+            "filters": filters or getattr(self.retriever, "filters", None),
+            "version": self.index_version.current(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @component.output_types(documents=List[Document])
+    def run(
+        self,
+        query_embedding: List[float],
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
+    ):
+        key = self.make_key(query_embedding, top_k, filters)
+        documents = self.cache.get(key)
+        if documents is None:
+            kwargs = {k: v for k, v in (("filters", filters), ("top_k", top_k)) if v is not None}
+            start = time.perf_counter()
+            documents = self.retriever.run(query_embedding=query_embedding, **kwargs)["documents"]
+            self.cache.put(key, documents, time.perf_counter() - start)
+        return {"documents": list(documents)}
@@ -0,0 +1,56 @@
+"""
+Rate limiter shared by concurrent LLM callers.
+
+Spaces out requests to respect a provider's requests-per-minute budget and
+lets callers push every thread back when the provider reports throttling.
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Substrings of provider errors that indicate throttling rather than a bad request
+RATE_LIMIT_MARKERS = ("429", "rate limit", "ratelimit", "too many requests", "quota", "resource_exhausted", "resourceexhausted")
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Best-effort detection of provider throttling errors."""
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+class RateLimiter:
+    """
+    Thread-safe request spacer.
+
+    Usage:
+        limiter = RateLimiter(requests_per_minute=60)
+        limiter.acquire()            # blocks until a request may be sent
+        limiter.backoff(5.0)         # delay every caller after a 429
+    """
+
+    def __init__(self, requests_per_minute: float = 0):
+        """
+        Args:
+            requests_per_minute: Request budget; 0 disables spacing (backoff still applies)
+        """
+        self.interval = 60.0 / requests_per_minute if requests_per_minute and requests_per_minute > 0 else 0.0
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_allowed - now)
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def backoff(self, seconds: float):
+        """Hold back all callers for at least `seconds` from now."""
+        with self._lock:
+            self._next_allowed = max(self._next_allowed, time.monotonic() + seconds)
+        logger.warning(f"Provider is throttling requests, backing off for {seconds:.1f}s")
@@ -5,7 +5,9 @@ This module provides reusable functions for querying Weaviate document store
 with exact match filters on metadata fields.
 """
 
-from typing import List, Optional
+import hashlib
+import json
+from typing import List, Optional, Dict, Iterable
 from haystack.dataclasses import Document
 from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
 import logging
@@ -46,6 +48,58 @@ def fetch_by_method_name(
         return []
 
 
+def fetch_by_method_names(
+    document_store: WeaviateDocumentStore,
+    method_names: Iterable[str],
+    doc_type: str = "ast_method",
+    batch_size: int = 100
+) -> Dict[str, List[Document]]:
+    """
+    Resolve many exact method names with one filtered query per batch.
+    
+    Replaces calling fetch_by_method_name once per name (N+1 round trips)
+    with an "in" filter over the whole set.
+    
+    Args:
+        document_store: WeaviateDocumentStore instance
+        method_names: Method names to resolve (duplicates are ignored)
+        doc_type: Document type filter (default: "ast_method")
+        batch_size: Maximum number of names per query
+        
+    Returns:
+        Dict mapping every name of a successfully queried batch to its matching
+        documents (possibly empty). Names of a batch whose query failed are
+        left out, so callers do not mistake them for names without documents.
+    """
+    names = sorted({name for name in method_names if name})
+    resolved: Dict[str, List[Document]] = {}
+    
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        filters = {
+            "operator": "AND",
+            "conditions": [
+                {"field": "meta.type", "operator": "==", "value": doc_type},
+                {"field": "meta.method_name", "operator": "in", "value": batch}
+            ]
+        }
+        
+        try:
+            documents = document_store.filter_documents(filters=filters)
+        except Exception as e:
+            logger.error(f"Error fetching documents for {len(batch)} methods: {e}")
+            continue
+        
+        resolved.update((name, []) for name in batch)
+        for doc in documents:
+            name = doc.meta.get("method_name")
+            if name in resolved:
+                resolved[name].append(doc)
+    
+    logger.debug(f"Resolved {sum(1 for docs in resolved.values() if docs)}/{len(names)} methods")
+    return resolved
+
+
 def fetch_by_class_name(
     document_store: WeaviateDocumentStore,
     class_name: str,
@@ -77,3 +131,108 @@ def fetch_by_class_name(
     except Exception as e:
         logger.error(f"Error fetching documents for class {class_name}: {e}")
         return []
+
+
+def document_id(repo: str, file_name: str, class_name: str, method_name: str, doc_type: str) -> str:
+    """
+    Build a stable document ID from the identity of a code element.
+    
+    The same method in the same repository always maps to the same ID, so
+    re-indexing overwrites its document instead of adding a duplicate.
+    
+    Args:
+        repo: Repository identifier (empty for ad-hoc runs)
+        file_name: Source file the element was extracted from
+        class_name: Owning class
+        method_name: Method name
+        doc_type: Document type ("ast_method", "code_mapper", ...)
+        
+    Returns:
+        Hex digest usable as a Haystack Document id
+    """
+    payload = "\0".join([repo or "", file_name or "", class_name or "", method_name or "", doc_type or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str, meta: Dict) -> str:
+    """Hash of a document's content and metadata, used to detect changed documents."""
+    payload = json.dumps({"content": content, "meta": meta}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fetch_content_hashes(
+    document_store: WeaviateDocumentStore,
+    repo: str,
+    doc_types: Iterable[str]
+) -> Optional[Dict[str, str]]:
+    """
+    Load the id -> content_hash map of everything stored for a repository.
+    
+    On Weaviate, the collection is walked with its cursor iterator, which has
+    no offset cap and fetches only the id, hash, repo and type properties
+    (no vectors). The cursor API takes no filters, so repo and type are
+    matched client-side. Other stores are queried with filter_documents.
+    
+    Args:
+        document_store: WeaviateDocumentStore instance
+        repo: Repository identifier the documents were written with
+        doc_types: Document types to include
+        
+    Returns:
+        Dict of stored document ids to their content hash, or None if the store could not be queried
+    """
+    repo = repo or ""
+    doc_types = set(doc_types)
+    
+    if isinstance(document_store, WeaviateDocumentStore):
+        try:
+            objects = document_store.collection.iterator(
+                include_vector=False,
+                return_properties=["_original_id", "content_hash", "repo", "type"]
+            )
+            return {
+                obj.properties["_original_id"]: obj.properties.get("content_hash") or ""
+                for obj in objects
+                if (obj.properties.get("repo") or "") == repo and obj.properties.get("type") in doc_types
+            }
+        except Exception as e:
+            logger.error(f"Error fetching stored documents for repo {repo!r}: {e}")
+            return None
+    
+    filters = {
+        "operator": "AND",
+        "conditions": [
+            {"field": "meta.repo", "operator": "==", "value": repo},
+            {"field": "meta.type", "operator": "in", "value": sorted(doc_types)}
+        ]
+    }
+    
+    try:
+        documents = document_store.filter_documents(filters=filters)
+    except Exception as e:
+        logger.error(f"Error fetching stored documents for repo {repo!r}: {e}")
+        return None
+    
+    return {doc.id: doc.meta.get("content_hash", "") for doc in documents}
+
+
+def delete_by_ids(
+    document_store: WeaviateDocumentStore,
+    document_ids: Iterable[str],
+    batch_size: int = 1000
+) -> int:
+    """
+    Delete documents by id in bounded batches.
+    
+    Args:
+        document_store: WeaviateDocumentStore instance
+        document_ids: Ids of the documents to delete
+        batch_size: Maximum number of ids per delete request
+        
+    Returns:
+        Number of ids submitted for deletion
+    """
+    ids = list(document_ids)
+    for start in range(0, len(ids), batch_size):
+        document_store.delete_documents(ids[start:start + batch_size])
+    return len(ids)
@@ -0,0 +1,67 @@
+"""
+Shared fixtures: pipeline components built through their real constructors,
+with a stub in place of the LLM generator.
+"""
+
+import pytest
+import yaml
+from unittest.mock import patch
+
+from src.core.config import AppConfig
+from src.utils.modelGenerator import ModelGenerator
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def _llm_section(**settings) -> dict:
+    return {
+        "active_generator": "ollama",
+        "generators": {"ollama": {"url": "http://127.0.0.1:11434", "model": "stub"}},
+        **settings
+    }
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Write a minimal config.yaml below tmp_path; nested overrides are merged in."""
+    def make(overrides: dict = None) -> AppConfig:
+        config = {
+            "code_mapper": _llm_section(max_concurrency=1, static_analysis=False, batch_token_budget=0),
+            "doc_creator": _llm_section(output_dir=str(tmp_path / "output"), max_concurrency=1),
+            "document_store": {"backend": "local", "path": str(tmp_path / "vector_store")},
+        }
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(_merge(config, overrides or {})))
+        return AppConfig(str(path))
+    return make
+
+
+@pytest.fixture
+def doc_creator(make_config):
+    """Build a DocumentationCreator whose LLM is the given generator."""
+    from src.components.DocumentationCreator import DocumentationCreator
+
+    def build(generator, checkpoint=None, **settings) -> DocumentationCreator:
+        config = make_config({"doc_creator": settings})
+        with patch.object(ModelGenerator, "get_generator", return_value=generator):
+            return DocumentationCreator(config=config, checkpoint=checkpoint)
+    return build
+
+
+@pytest.fixture
+def code_mapper(make_config):
+    """Build a CodeMapper whose LLM is the given generator."""
+    from src.components.CodeMapper import CodeMapper
+
+    def build(generator, checkpoint=None, **settings) -> CodeMapper:
+        config = make_config({"code_mapper": settings})
+        with patch.object(ModelGenerator, "get_generator", return_value=generator):
+            return CodeMapper(config=config, checkpoint=checkpoint)
+    return build
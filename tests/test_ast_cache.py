@@ -0,0 +1,76 @@
+"""
+Tests for the content-hash AST cache.
+"""
+
+import os
+import shutil
+import pytest
+
+from src.core.config import AppConfig
+from src.components.extractor.ast_cache import ASTCache
+from src.components.extractor.ast_extractor import ASTExtractor
+
+APIS_TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "apis-test")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ASTCache(str(tmp_path / "cache"), max_size_mb=1)
+
+
+@pytest.fixture
+def query_file(tmp_path):
+    path = tmp_path / "query.scm"
+    path.write_text("(identifier) @name")
+    return str(path)
+
+
+class TestASTCache:
+
+    def test_miss_then_hit(self, cache, query_file):
+        key = cache.make_key(b"class A {}", "java", query_file)
+        assert cache.get(key) is None
+
+        cache.put(key, [{"class_name": "A", "methods": []}])
+        assert cache.get(key) == [{"class_name": "A", "methods": []}]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_key_depends_on_content_language_and_query(self, cache, query_file, tmp_path):
+        other_query = tmp_path / "other.scm"
+        other_query.write_text("(class_declaration) @cls")
+
+        base = cache.make_key(b"code", "java", query_file)
+        assert base == cache.make_key(b"code", "java", query_file)
+        assert base != cache.make_key(b"code!", "java", query_file)
+        assert base != cache.make_key(b"code", "python", query_file)
+        assert base != cache.make_key(b"code", "java", str(other_query))
+
+    def test_eviction_keeps_cache_under_limit(self, tmp_path, query_file):
+        cache = ASTCache(str(tmp_path / "cache"), max_size_mb=0.01)  # ~10KB
+        payload = [{"method_definition": "x" * 2000}]
+        for i in range(20):
+            cache.put(cache.make_key(str(i).encode(), "java", query_file), payload)
+
+        assert cache.evictions > 0
+        assert cache.stats()["size_bytes"] <= cache.max_bytes
+        # The newest entry survives eviction
+        assert cache.get(cache.make_key(b"19", "java", query_file)) == payload
+
+
+class TestASTExtractorWithCache:
+
+    def test_second_run_is_served_from_cache(self, tmp_path, cache):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("verbose: false\nsave_ast: false\n")
+        source = tmp_path / "AuthController.java"
+        shutil.copy(os.path.join(APIS_TEST_DIR, "springboot", "AuthController.java"), source)
+
+        extractor = ASTExtractor(config=AppConfig(str(config_path)), cache=cache)
+        first = extractor.extract_by_query(str(source))
+        second = extractor.extract_by_query(str(source))
+
+        assert first
+        assert second == first
+        assert cache.hits == 1
+        assert cache.misses == 1
@@ -0,0 +1,88 @@
+"""
+Unit tests for BudgetedReranker.
+"""
+
+import time
+from unittest.mock import Mock
+
+from haystack import Document
+
+from src.components.BudgetedReranker import BudgetedReranker, resolve_device
+
+
+def _docs(n):
+    # Retriever scores descend with the index
+    return [Document(content=f"doc{i}", score=1.0 - i / 100) for i in range(n)]
+
+
+def _ranker(delay=0.0):
+    ranker = Mock()
+
+    def run(query, documents, top_k):
+        time.sleep(delay)
+        # Reverse retriever order so we can tell the cross-encoder ran
+        return {"documents": list(reversed(documents))[:top_k]}
+
+    ranker.run.side_effect = run
+    return ranker
+
+
+class TestDeviceSelection:
+
+    def test_explicit_device_is_respected(self):
+        assert resolve_device("cpu").to_torch_str() == "cpu"
+
+    def test_auto_resolves_to_available_device(self):
+        device = resolve_device("auto").to_torch_str()
+        assert device == "cpu" or device.startswith(("cuda", "mps"))
+
+
+class TestBudgetedReranker:
+
+    def test_candidates_are_pruned_by_retriever_score(self):
+        inner = _ranker()
+        reranker = BudgetedReranker(device="cpu", top_k=2, max_candidates=4, ranker=inner)
+
+        shuffled = list(reversed(_docs(10)))
+        result = reranker.run(query="q", documents=shuffled)["documents"]
+
+        sent = inner.run.call_args.kwargs["documents"]
+        assert [d.content for d in sent] == ["doc0", "doc1", "doc2", "doc3"]
+        assert [d.content for d in result] == ["doc3", "doc2"]
+
+    def test_small_candidate_sets_skip_the_cross_encoder(self):
+        inner = _ranker()
+        reranker = BudgetedReranker(device="cpu", top_k=3, skip_below=5, ranker=inner)
+
+        result = reranker.run(query="q", documents=list(reversed(_docs(4))))["documents"]
+
+        inner.run.assert_not_called()
+        assert [d.content for d in result] == ["doc0", "doc1", "doc2"]
+
+    def test_over_budget_shrinks_candidate_cap(self):
+        reranker = BudgetedReranker(
+            device="cpu", top_k=2, max_candidates=20, latency_budget_ms=1, ranker=_ranker(delay=0.01)
+        )
+        for _ in range(20):
+            reranker.run(query="q", documents=_docs(30))
+
+        assert reranker.candidate_limit == 2
+
+    def test_headroom_grows_candidate_cap_back(self):
+        reranker = BudgetedReranker(
+            device="cpu", top_k=2, max_candidates=6, latency_budget_ms=10000, ranker=_ranker()
+        )
+        reranker.candidate_limit = 2
+        for _ in range(10):
+            reranker.run(query="q", documents=_docs(30))
+
+        assert reranker.candidate_limit == 6
+
+    def test_quantization_is_skipped_without_model(self):
+        inner = _ranker()
+        inner._cross_encoder = None
+        reranker = BudgetedReranker(device="cpu", quantize_int8=True, ranker=inner)
+
+        reranker.warm_up()
+
+        inner.warm_up.assert_called_once()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the static call-graph pre-pass used by CodeMapper.
+"""
+
+from src.components.extractor.call_graph import CallGraphExtractor, StaticDependencyResolver
+
+
+def _method(name, definition, is_api_route=False):
+    return {"method_name": name, "method_definition": definition, "is_api_route": is_api_route}
+
+
+def _java_project():
+    return [
+        {"class_name": "AuthController", "file_name": "AuthController.java.json", "methods": [
+            _method("login",
+                    "@PostMapping(\"/login\")\npublic Token login(@RequestBody Map<String, String> body) {\n"
+                    "    audit();\n    body.get(\"user\");\n    return authService.verify(body);\n}",
+                    is_api_route=True),
+            _method("audit", "private void audit() { System.out.println(\"login\"); }"),
+        ]},
+        {"class_name": "AuthService", "file_name": "AuthService.java.json", "methods": [
+            _method("verify", "public Token verify(Map<String, String> body) { return this.tokens.issue(body); }"),
+        ]},
+        {"class_name": "TokenStore", "file_name": "TokenStore.java.json", "methods": [
+            _method("issue", "public Token issue(Map<String, String> body) { return new Token(); }"),
+        ]},
+    ]
+
+
+class TestCallGraphExtractor:
+
+    def test_calls_and_declared_types(self):
+        calls, declared = CallGraphExtractor("java").method_calls(
+            "public void run(UserService users) { users.find(1); this.log(); List.of(1); }"
+        )
+
+        assert ("users", "find") in calls
+        assert ("this", "log") in calls
+        assert ("List", "of") in calls
+        assert declared["users"] == "UserService"
+
+    def test_python_method_is_wrapped(self):
+        calls, _ = CallGraphExtractor("python").method_calls(
+            "def get(self, request):\n        return self.user_service.get_user(request.id)"
+        )
+        assert ("self.user_service", "get_user") in calls
+
+    def test_broken_code_is_rejected(self):
+        assert CallGraphExtractor("typescript").method_calls("async login( { return") is None
+
+
+class TestStaticDependencyResolver:
+
+    def test_resolves_same_shape_as_llm_mapping(self):
+        mapped, _ = StaticDependencyResolver().resolve(_java_project())
+
+        assert mapped["AuthController"] == {"methods": [
+            {"method": "login", "dependencies": ["this.audit", "authService.verify"], "is_api_route": True},
+            {"method": "audit", "dependencies": [], "is_api_route": False},
+        ]}
+
+    def test_unresolvable_project_call_goes_to_llm(self):
+        # this.tokens names no project class, but issue() is a project method
+        mapped, ambiguous = StaticDependencyResolver().resolve(_java_project())
+
+        assert [cls["class_name"] for cls in ambiguous] == ["AuthService"]
+        assert set(mapped) == {"AuthController", "TokenStore"}
+
+    def test_typed_receivers_resolve(self):
+        project = _java_project()
+        project[1]["methods"][0]["method_definition"] = (
+            "public Token verify(Map<String, String> body) { TokenStore store = registry(); return store.issue(body); }"
+        )
+        mapped, ambiguous = StaticDependencyResolver().resolve(project)
+
+        assert ambiguous == []
+        assert mapped["AuthService"]["methods"][0]["dependencies"] == ["store.issue"]
+
+    def test_known_classes_cover_partial_runs(self):
+        project = _java_project()
+        resolver = StaticDependencyResolver(known_classes=project)
+
+        mapped, _ = resolver.resolve(project[:1])
+
+        assert mapped["AuthController"]["methods"][0]["dependencies"] == ["this.audit", "authService.verify"]
+
+    def test_unsupported_language_goes_to_llm(self):
+        classes = [{"class_name": "Handler", "file_name": "handler.go.json", "methods": [_method("Serve", "func ...")]}]
+        assert StaticDependencyResolver().resolve(classes) == ({}, classes)
+
+    def test_container_named_project_method_on_unresolved_receiver_goes_to_llm(self):
+        # users is an undeclared field: users.get may well be UserService.get
+        classes = [
+            {"class_name": "UserController", "file_name": "UserController.java.json", "methods": [
+                _method("show", "public User show(long id) { return users.get(id); }"),
+            ]},
+            {"class_name": "UserService", "file_name": "UserService.java.json", "methods": [
+                _method("get", "public User get(long id) { return null; }"),
+            ]},
+        ]
+        mapped, ambiguous = StaticDependencyResolver().resolve(classes)
+
+        assert [cls["class_name"] for cls in ambiguous] == ["UserController"]
+        assert "UserController" not in mapped
@@ -0,0 +1,156 @@
+"""
+Unit tests for job checkpoints and resume.
+"""
+
+import json
+import os
+from unittest.mock import Mock, patch
+
+from src.services.checkpoint import JobCheckpoint, StageCheckpoint, fingerprint
+
+
+class TestStageCheckpoint:
+
+    def test_items_survive_reopen_and_torn_lines(self, tmp_path):
+        path = str(tmp_path / "map.jsonl")
+        stage = StageCheckpoint(path)
+        stage.put("AuthController", "fp1", {"methods": []})
+        with open(path, "a") as f:
+            f.write('{"key": "UserCont')  # crash mid-write
+
+        reopened = StageCheckpoint(path)
+
+        assert reopened.get("AuthController", "fp1") == {"methods": []}
+        assert len(reopened) == 1
+
+    def test_stale_fingerprint_is_ignored(self, tmp_path):
+        stage = StageCheckpoint(str(tmp_path / "map.jsonl"))
+        stage.put("AuthController", "old", {"methods": []})
+
+        assert stage.get("AuthController", "new") is None
+
+
+class TestJobCheckpoint:
+
+    def test_key_ignores_credentials(self):
+        assert JobCheckpoint.make_key("git", "https://token@github.com/o/r", "abc") == \
+            JobCheckpoint.make_key("git", "https://github.com/o/r", "abc")
+
+    def test_stage_results_and_clear(self, tmp_path):
+        checkpoint = JobCheckpoint(str(tmp_path), "job")
+        checkpoint.complete_stage("extract", "sha1", {"a.py": [{"class_name": "A"}]})
+        checkpoint.stage("map").put("A", "fp", {"methods": []})
+
+        reopened = JobCheckpoint(str(tmp_path), "job")
+        assert reopened.stage_result("extract", "sha1") == {"a.py": [{"class_name": "A"}]}
+        assert reopened.stage_result("extract", "sha2") is None
+        assert reopened.stage("map").get("A", "fp") == {"methods": []}
+
+        reopened.clear()
+        assert not os.path.exists(checkpoint.path)
+
+
+class TestResume:
+
+    def _classes(self, n):
+        return [
+            {"class_name": f"Class{i}", "methods": [
+                {"method_name": "handle", "is_api_route": False, "method_definition": f"handle() {{ {i} }}"}
+            ]}
+            for i in range(n)
+        ]
+
+    def _generator(self, fail_for=()):
+        def run(prompt):
+            class_name = prompt.split("className: ")[1].split("\n")[0]
+            if class_name in fail_for:
+                raise ConnectionError("provider unavailable")
+            return {"replies": [json.dumps({"methods": [{"method": "handle", "dependencies": []}]})]}
+        return Mock(run=Mock(side_effect=run))
+
+    def test_code_mapper_resumes_completed_classes(self, tmp_path, code_mapper):
+        stage_path = str(tmp_path / "map.jsonl")
+        first = code_mapper(self._generator(fail_for={"Class2"}), checkpoint=StageCheckpoint(stage_path))
+        first.run(self._classes(3))
+        assert "Class2" in first.failures
+
+        generator = self._generator()
+        second = code_mapper(generator, checkpoint=StageCheckpoint(stage_path))
+        output = second.run(self._classes(3))
+
+        assert list(output) == ["Class0", "Class1", "Class2"]
+        assert generator.run.call_count == 1
+        assert second.stats["resumed"] == 2
+
+    def test_changed_class_is_remapped(self, tmp_path, code_mapper):
+        stage_path = str(tmp_path / "map.jsonl")
+        code_mapper(self._generator(), checkpoint=StageCheckpoint(stage_path)).run(self._classes(2))
+
+        classes = self._classes(2)
+        classes[1]["methods"][0]["method_definition"] = "handle() { changed }"
+        generator = self._generator()
+        code_mapper(generator, checkpoint=StageCheckpoint(stage_path)).run(classes)
+
+        assert generator.run.call_count == 1
+
+    def test_documentation_creator_resumes_documented_endpoints(self, tmp_path, doc_creator):
+        mapped_path = str(tmp_path / "mapped_ast.json")
+        with open(mapped_path, "w") as f:
+            json.dump({"ApiController": {"methods": [
+                {"method": f"endpoint{i}", "dependencies": [], "is_api_route": True} for i in range(3)
+            ]}}, f)
+
+        def creator(generator):
+            return doc_creator(generator, checkpoint=StageCheckpoint(str(tmp_path / "document.jsonl")))
+
+        reply = {"replies": [json.dumps({"postman": {}, "swagger": {"summary": "ok"}})]}
+        flaky = Mock()
+        flaky.run.side_effect = [reply, reply] + [ConnectionError("down")] * 3
+        first = creator(flaky).run(mapped_path)
+        assert first["methods_resumed"] == 0
+
+        generator = Mock()
+        generator.run.return_value = reply
+        second = creator(generator).run(mapped_path)
+
+        # endpoint2 only got fallback docs the first time, so it is regenerated
+        assert second["methods_resumed"] == 2
+        assert second["methods_processed"] == 3
+        assert generator.run.call_count == 1
+
+
+class TestPipelineCheckpoint:
+
+    def test_local_checkpoint_key_follows_folder_contents(self, tmp_path, make_config):
+        from src.services import documentation_pipeline
+        from src.services.file_discovery import FileDiscovery
+
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "app.py").write_text("class App:\n    def run(self):\n        return 1\n")
+        config = make_config({
+            "save_ast": False,
+            "ast_cache": {"enabled": False},
+            "checkpoint": {"enabled": True, "path": str(tmp_path / "checkpoints")},
+            "code_mapper": {"static_analysis": True},
+            "jobs": {"output_dir": str(tmp_path / "outputs")},
+            "incremental": {"state_dir": str(tmp_path / "runs")}
+        })
+
+        def run_job(job_id):
+            statuses = []
+            with patch.object(documentation_pipeline, "get_app_config", return_value=config), \
+                    patch.object(documentation_pipeline, "JobCheckpoint", wraps=JobCheckpoint) as checkpoints:
+                documentation_pipeline.process_documentation("local", str(source), None, job_id, report=statuses.append)
+            assert statuses[-1]["status"] == "completed", statuses[-1].get("error")
+            return checkpoints.call_args.args[1]
+
+        first = run_job("job-1")
+        records = FileDiscovery().walk(str(source))
+        assert first == JobCheckpoint.make_key(
+            "local", str(source), fingerprint([(r.rel_path, r.size, r.mtime_ns) for r in records]), None
+        )
+
+        (source / "app.py").write_text("class App:\n    def run(self):\n        return 2 + 2\n")
+        # Another job on changed contents neither resumes nor clears the first one's checkpoint
+        assert run_job("job-2") != first
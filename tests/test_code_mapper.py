@@ -0,0 +1,156 @@
+"""
+Unit tests for CodeMapper.
+"""
+
+import json
+import threading
+import time
+import pytest
+
+
+class FakeGenerator:
+    """Answers with a mapping naming the class found in the prompt; can fail per class."""
+
+    def __init__(self, fail_for=(), delay=0.0):
+        self.fail_for = set(fail_for)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def run(self, prompt):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            class_name = prompt.split("className: ")[1].split("\n")[0]
+            if class_name in self.fail_for:
+                raise ConnectionError("provider unavailable")
+            return {"replies": [json.dumps({"methods": [{"method": "handle", "dependencies": [f"{class_name}.dep"]}]})]}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _classes(n):
+    return [
+        {"class_name": f"Class{i}", "methods": [
+            {"method_name": "handle", "is_api_route": i % 2 == 0, "method_definition": "handle() {}"}
+        ]}
+        for i in range(n)
+    ]
+
+
+class TestCodeMapperRun:
+
+    def test_concurrent_output_matches_serial(self, code_mapper):
+        serial = code_mapper(FakeGenerator()).run(_classes(8))
+        generator = FakeGenerator(delay=0.02)
+        concurrent = code_mapper(generator, max_concurrency=4).run(_classes(8))
+
+        assert list(concurrent) == list(serial)
+        assert concurrent == serial
+        assert 1 < generator.max_in_flight <= 4
+
+    def test_is_api_route_is_merged(self, code_mapper):
+        output = code_mapper(FakeGenerator()).run(_classes(2))
+        assert output["Class0"]["methods"][0]["is_api_route"] is True
+        assert output["Class1"]["methods"][0]["is_api_route"] is False
+
+    def test_failing_class_is_isolated(self, code_mapper):
+        mapper = code_mapper(FakeGenerator(fail_for={"Class1"}), max_concurrency=3)
+        output = mapper.run(_classes(3))
+
+        assert list(output) == ["Class0", "Class2"]
+        assert "Class1" in mapper.failures
+
+    def test_raises_when_every_class_fails(self, code_mapper):
+        mapper = code_mapper(FakeGenerator(fail_for={"Class0", "Class1"}))
+        with pytest.raises(RuntimeError):
+            mapper.run(_classes(2))
+
+
+class TestStaticPrePass:
+
+    def test_only_ambiguous_classes_reach_the_llm(self, code_mapper):
+        classes = [
+            {"class_name": "AuthController", "file_name": "AuthController.java.json", "methods": [
+                {"method_name": "login", "is_api_route": True,
+                 "method_definition": "public Token login() { return authService.verify(); }"}
+            ]},
+            {"class_name": "AuthService", "file_name": "AuthService.java.json", "methods": [
+                {"method_name": "verify", "is_api_route": False,
+                 "method_definition": "public Token verify() { return store.handle(); }"}
+            ]},
+            {"class_name": "Class0", "methods": [
+                {"method_name": "handle", "is_api_route": False, "method_definition": "handle() {}"}
+            ]},
+        ]
+        mapper = code_mapper(FakeGenerator(), static_analysis=True)
+        prompted = []
+        original = mapper._map_class
+        mapper._map_class = lambda ast_data: prompted.append(ast_data["class_name"]) or original(ast_data)
+
+        output = mapper.run(classes)
+
+        assert list(output) == ["AuthController", "AuthService", "Class0"]
+        assert output["AuthController"]["methods"][0]["dependencies"] == ["authService.verify"]
+        assert prompted == ["AuthService", "Class0"]
+        assert mapper.stats == {"static": 1, "llm": 2, "resumed": 0, "batches": 2}
+
+
+class BatchGenerator:
+    """Answers batch prompts with a keyed reply; can drop classes or return garbage."""
+
+    def __init__(self, drop=(), garbage=False):
+        self.drop = set(drop)
+        self.garbage = garbage
+        self.prompts = []
+
+    def run(self, prompt):
+        self.prompts.append(prompt)
+        data = prompt.split("### DATA TO ANALYZE")[1]
+        names = [line.split("className: ")[1] for line in data.splitlines() if "className: " in line]
+        mapping = lambda name: {"methods": [{"method": "handle", "dependencies": [f"{name}.dep"]}]}
+        if len(names) == 1:
+            return {"replies": [json.dumps(mapping(names[0]))]}
+        if self.garbage:
+            return {"replies": ["I could not analyze these classes."]}
+        return {"replies": [json.dumps({name: mapping(name) for name in names if name not in self.drop})]}
+
+
+class TestBatching:
+
+    @pytest.fixture
+    def batching_mapper(self, code_mapper):
+        def build(generator, budget=1000, max_classes=8):
+            return code_mapper(generator, batch_token_budget=budget, batch_max_classes=max_classes)
+        return build
+
+    def test_small_classes_share_a_prompt(self, batching_mapper, code_mapper):
+        generator = BatchGenerator()
+        mapper = batching_mapper(generator, max_classes=3)
+
+        output = mapper.run(_classes(7))
+
+        assert len(generator.prompts) == 3
+        assert output == code_mapper(FakeGenerator()).run(_classes(7))
+
+    def test_budget_limits_batch_size(self, batching_mapper):
+        mapper = batching_mapper(BatchGenerator(), budget=25)
+        assert [len(batch) for batch in mapper._pack_batches(_classes(4))] == [2, 2]
+
+    def test_missing_class_falls_back_to_single_prompt(self, batching_mapper):
+        generator = BatchGenerator(drop={"Class1"})
+        output = batching_mapper(generator).run(_classes(3))
+
+        assert output["Class1"]["methods"][0]["dependencies"] == ["Class1.dep"]
+        assert len(generator.prompts) == 2
+
+    def test_unparseable_batch_falls_back_per_class(self, batching_mapper):
+        generator = BatchGenerator(garbage=True)
+        output = batching_mapper(generator).run(_classes(3))
+
+        assert list(output) == ["Class0", "Class1", "Class2"]
+        assert output["Class0"]["methods"][0]["is_api_route"] is True
@@ -0,0 +1,55 @@
+import os
+from src.core.config import AppConfig, get_app_config
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_app_config_typed_accessors(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("verbose: true\nsave_ast: false\nsave_ast_path: out\ndoc_creator:\n  output_dir: docs\n")
+
+    config = AppConfig(str(path))
+    assert config.exists
+    assert config.verbose is True
+    assert config.save_ast is False
+    assert config.save_ast_path == "out"
+    assert config.get("doc_creator.output_dir") == "docs"
+    assert config.get("doc_creator.missing", "default") == "default"
+    assert config.section("missing") == {}
+
+
+def test_app_config_missing_file(tmp_path):
+    config = AppConfig(str(tmp_path / "nope.yaml"))
+    assert not config.exists
+    assert config.mapper_output_path == "mapped_ast.json"
+
+
+def test_reload_only_when_mtime_changes(tmp_path):
+    path = tmp_path / "config.yaml"
+    _write(path, "verbose: false\n", 1000)
+    config = AppConfig(str(path))
+
+    assert config.reload_if_changed() is False
+
+    _write(path, "verbose: true\n", 2000)
+    assert config.reload_if_changed() is True
+    assert config.verbose is True
+
+
+def test_invalid_edit_keeps_last_good_config(tmp_path):
+    path = tmp_path / "config.yaml"
+    _write(path, "verbose: true\n", 1000)
+    config = AppConfig(str(path))
+
+    _write(path, "verbose: [unclosed\n", 2000)
+    assert config.reload_if_changed() is False
+    assert config.verbose is True
+
+
+def test_get_app_config_is_cached(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("verbose: false\n")
+    assert get_app_config(str(path)) is get_app_config(str(path))
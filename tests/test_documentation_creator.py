@@ -130,6 +130,96 @@ class TestWeaviateFilterQuery:
         assert result[0].content == "test content"
 
 
+class TestBulkDependencyLookup:
+    """Tests for batched dependency resolution."""
+    
+    def test_fetch_by_method_names_uses_single_in_filter(self):
+        """Verify a set of names is resolved with one 'in' query."""
+        from src.utils.weaviate_utils import fetch_by_method_names
+        
+        mock_store = Mock()
+        mock_store.filter_documents.return_value = [
+            Document(content="findAll body", meta={"method_name": "findAll"}),
+            Document(content="findById body", meta={"method_name": "findById"}),
+        ]
+        
+        result = fetch_by_method_names(mock_store, ["findById", "findAll", "findById", "missing"])
+        
+        mock_store.filter_documents.assert_called_once()
+        filters = mock_store.filter_documents.call_args.kwargs["filters"]
+        name_condition = filters["conditions"][1]
+        assert name_condition["operator"] == "in"
+        assert name_condition["value"] == ["findAll", "findById", "missing"]
+        assert result["findAll"][0].content == "findAll body"
+        assert result["missing"] == []
+    
+    def test_fetch_by_method_names_against_in_memory_store(self):
+        """The filter must be understood by a real document store."""
+        from haystack.document_stores.in_memory import InMemoryDocumentStore
+        from src.utils.weaviate_utils import fetch_by_method_names
+        
+        store = InMemoryDocumentStore()
+        store.write_documents([
+            Document(content="a", meta={"type": "ast_method", "method_name": "verify"}),
+            Document(content="b", meta={"type": "code_mapper", "method_name": "verify"}),
+            Document(content="c", meta={"type": "ast_method", "method_name": "login"}),
+        ])
+        
+        result = fetch_by_method_names(store, {"verify", "signup"}, batch_size=1)
+        
+        assert [d.content for d in result["verify"]] == ["a"]
+        assert result["signup"] == []
+    
+    def test_failed_batch_is_left_out(self):
+        """Names of a failed query must not look like names without documents."""
+        from src.utils.weaviate_utils import fetch_by_method_names
+        
+        mock_store = Mock()
+        mock_store.filter_documents.side_effect = [
+            RuntimeError("weaviate down"),
+            [Document(content="verify body", meta={"method_name": "verify"})],
+        ]
+        
+        result = fetch_by_method_names(mock_store, ["create", "login", "verify"], batch_size=2)
+        
+        assert set(result) == {"verify"}
+    
+    def test_dependency_context_is_memoized_per_run(self, doc_creator):
+        """Prefetched dependencies must not trigger further queries."""
+        creator = doc_creator(Mock())
+        creator.document_store = Mock()
+        creator.document_store.filter_documents.return_value = [
+            Document(content="verify body", meta={"method_name": "verify"})
+        ]
+        
+        creator._prefetch_dependencies([
+            {"dependencies": ["authService.verify"]},
+            {"dependencies": ["authService.verify", "userService.create"]},
+        ])
+        first = creator._fetch_dependency_context(["authService.verify"])
+        creator._fetch_dependency_context(["authService.verify", "userService.create"])
+        
+        assert creator.document_store.filter_documents.call_count == 1
+        assert "verify body" in first
+    
+    def test_failed_lookup_is_retried(self, doc_creator):
+        """A dependency whose lookup failed is queried again, not memoized as empty."""
+        creator = doc_creator(Mock())
+        creator.document_store = Mock()
+        creator.document_store.filter_documents.side_effect = [
+            RuntimeError("weaviate down"),
+            RuntimeError("weaviate down"),
+            [Document(content="verify body", meta={"method_name": "verify"})],
+        ]
+        
+        creator._prefetch_dependencies([{"dependencies": ["authService.verify"]}])
+        first = creator._fetch_dependency_context(["authService.verify"])
+        second = creator._fetch_dependency_context(["authService.verify"])
+        
+        assert "No additional context" in first
+        assert "verify body" in second
+
+
 class TestOutputFileStructure:
     """Tests for output directory and file creation."""
     
@@ -148,10 +238,10 @@ class TestOutputFileStructure:
                     "swagger": {"summary": "Test endpoint", "responses": {}}
                 }
                 
-                saved = creator._save_outputs("testMethod", documentation)
+                saved = creator._save_outputs("TestController.testMethod", documentation)
                 
                 # Check directory was created
-                method_dir = os.path.join(tmpdir, "testMethod")
+                method_dir = os.path.join(tmpdir, "TestController.testMethod")
                 assert os.path.isdir(method_dir)
                 
                 # Check files were created
@@ -263,3 +353,103 @@ class TestGetDependenciesForMethod:
             deps = creator._get_dependencies_for_method("PostController", "unknownMethod", mapped_ast)
             
             assert deps == []
+
+
+class TestConcurrentRun:
+    """Tests for the bounded worker pool in DocumentationCreator.run."""
+
+    def _mapped_ast(self, tmpdir, count):
+        mapped = {"ApiController": {"methods": [
+            {"method": f"endpoint{i}", "dependencies": [], "is_api_route": True}
+            for i in range(count)
+        ]}}
+        path = os.path.join(tmpdir, "mapped_ast.json")
+        with open(path, "w") as f:
+            json.dump(mapped, f)
+        return path
+
+    def test_parallel_run_documents_every_endpoint_and_reports_progress(self, doc_creator):
+        generator = Mock()
+        generator.run.return_value = {"replies": [json.dumps({"postman": {}, "swagger": {"summary": "ok"}})]}
+        events = []
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            creator = doc_creator(generator, max_concurrency=4)
+            result = creator.run(self._mapped_ast(tmpdir, 6), progress_callback=events.append)
+
+        assert result["methods_processed"] == 6
+        assert result["methods_failed"] == 0
+        assert list(result["output_files"]) == [f"ApiController.endpoint{i}" for i in range(6)]
+        assert [e["completed"] for e in events] == [1, 2, 3, 4, 5, 6]
+        assert events[-1]["total"] == 6
+
+    def test_llm_failure_falls_back_per_method(self, doc_creator):
+        generator = Mock()
+        generator.run.side_effect = ConnectionError("provider down")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            creator = doc_creator(generator, max_concurrency=2)
+            result = creator.run(self._mapped_ast(tmpdir, 2))
+
+            with open(result["output_files"]["ApiController.endpoint0"]["swagger"]) as f:
+                swagger = json.load(f)
+
+        assert result["methods_processed"] == 2
+        assert "could not be fully generated" in swagger["description"]
+
+    def test_same_method_name_in_two_classes_keeps_both_outputs(self, doc_creator, tmp_path):
+        mapped_path = tmp_path / "mapped_ast.json"
+        mapped_path.write_text(json.dumps({
+            name: {"methods": [{"method": "findAll", "dependencies": [], "is_api_route": True}]}
+            for name in ("UserController", "PostController")
+        }))
+        generator = Mock()
+        generator.run.side_effect = lambda prompt: {"replies": [json.dumps({
+            "postman": {}, "swagger": {"summary": "users" if "UserController" in prompt else "posts"}
+        })]}
+
+        result = doc_creator(generator, max_concurrency=2).run(str(mapped_path))
+
+        summaries = {}
+        for endpoint, saved in result["output_files"].items():
+            with open(saved["swagger"]) as f:
+                summaries[endpoint] = json.load(f)["summary"]
+        assert summaries == {"UserController.findAll": "users", "PostController.findAll": "posts"}
+
+
+class TestRateLimiter:
+    """Tests for the shared provider rate limiter."""
+
+    def test_detects_throttling_errors(self):
+        from src.utils.rate_limiter import is_rate_limit_error
+
+        assert is_rate_limit_error(Exception("HTTP 429 Too Many Requests"))
+        assert is_rate_limit_error(Exception("Quota exceeded for model"))
+        assert not is_rate_limit_error(ValueError("invalid prompt"))
+
+    def test_backoff_delays_next_acquire(self):
+        import time
+        from src.utils.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(0)
+        limiter.backoff(0.05)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_cache_hits_do_not_consume_rate_limit(self, tmp_path, doc_creator):
+        from src.utils.llm_cache import LLMResponseCache, CachedGenerator
+
+        reply = json.dumps({"postman": {}, "swagger": {"summary": "ok"}})
+        model = Mock(spec=["run"])
+        model.run.return_value = {"replies": [reply]}
+        generator = CachedGenerator(model, LLMResponseCache(str(tmp_path / "llm.sqlite3")), "ollama", "stub")
+        creator = doc_creator(generator, requests_per_minute=60)
+        method = {"method_name": "findAll"}
+
+        with patch.object(creator.rate_limiter, "acquire") as acquire:
+            creator._generate_documentation("document findAll", method)
+            creator._generate_documentation("document findAll", method)
+
+        assert model.run.call_count == 1
+        assert acquire.call_count == 1
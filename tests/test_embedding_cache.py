@@ -0,0 +1,113 @@
+"""
+Unit tests for the persistent embedding cache.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import Mock
+from dataclasses import replace
+
+from haystack import Document
+
+from src.utils.embedding_cache import EmbeddingCache, CachedDocumentEmbedder
+
+
+def _fake_embedder():
+    embedder = Mock(spec=["run", "warm_up"])
+    embedder.run.side_effect = lambda documents: {
+        "documents": [replace(doc, embedding=[float(len(doc.content)), 1.0, 0.5]) for doc in documents]
+    }
+    return embedder
+
+
+class TestEmbeddingCache:
+
+    def test_roundtrip_survives_reopen(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "model-a")
+        cache.put_many(["foo()", "bar()"], [[1.0, 2.0], [3.0, 4.0]])
+        cache.flush()
+
+        reopened = EmbeddingCache(str(tmp_path), "model-a")
+        assert reopened.get_many(["bar()", "baz()", "foo()"]) == [[3.0, 4.0], None, [1.0, 2.0]]
+        assert reopened.stats()["hits"] == 2
+
+    def test_works_without_fcntl(self, tmp_path):
+        # Windows has no fcntl; the cache then runs without the file lock
+        result = subprocess.run(
+            [sys.executable, "-c", (
+                "import sys; sys.modules['fcntl'] = None\n"
+                "from src.utils.embedding_cache import EmbeddingCache\n"
+                f"cache = EmbeddingCache({str(tmp_path)!r}, 'model-a')\n"
+                "cache.put_many(['foo()'], [[1.0, 2.0]]); cache.flush()\n"
+                f"print(EmbeddingCache({str(tmp_path)!r}, 'model-a').get_many(['foo()']))\n"
+            )],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[[1.0, 2.0]]"
+
+    def test_whitespace_is_normalized(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "model-a")
+        cache.put_many(["void  foo() {\n}"], [[1.0, 2.0]])
+        assert cache.get_many(["void foo() { }"]) == [[1.0, 2.0]]
+
+    def test_models_do_not_share_vectors(self, tmp_path):
+        EmbeddingCache(str(tmp_path), "model-a").put_many(["foo()"], [[1.0, 2.0]])
+        assert EmbeddingCache(str(tmp_path), "model-b").get_many(["foo()"]) == [None]
+
+    def test_dimension_mismatch_is_rejected(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "model-a")
+        cache.put_many(["foo()"], [[1.0, 2.0]])
+        with pytest.raises(ValueError):
+            cache.put_many(["bar()"], [[1.0, 2.0, 3.0]])
+
+    def test_unflushed_rows_are_dropped_on_reopen(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "model-a")
+        cache.put_many(["foo()"], [[1.0, 2.0]])
+        cache.flush()
+        # Simulate a crash that truncated the vector file after the index was written
+        open(cache.vectors_path, "wb").close()
+
+        assert EmbeddingCache(str(tmp_path), "model-a").get_many(["foo()"]) == [None]
+
+    def test_writers_sharing_a_directory_keep_each_others_rows(self, tmp_path):
+        # Two processes opened the cache before either wrote to it
+        first = EmbeddingCache(str(tmp_path), "model-a")
+        second = EmbeddingCache(str(tmp_path), "model-a")
+        first.put_many(["foo()"], [[1.0, 2.0]])
+        second.put_many(["bar()"], [[3.0, 4.0]])
+        second.flush()
+        first.flush()
+
+        reopened = EmbeddingCache(str(tmp_path), "model-a")
+        assert reopened.get_many(["foo()", "bar()"]) == [[1.0, 2.0], [3.0, 4.0]]
+
+
+class TestCachedDocumentEmbedder:
+
+    def test_only_misses_reach_the_model(self, tmp_path):
+        embedder = _fake_embedder()
+        cached = CachedDocumentEmbedder(embedder, EmbeddingCache(str(tmp_path), "model-a"))
+
+        first = cached.run(documents=[Document(content="a()"), Document(content="bb()")])["documents"]
+        second = cached.run(documents=[Document(content="bb()"), Document(content="ccc()")])["documents"]
+
+        assert [d.embedding for d in first] == [[3.0, 1.0, 0.5], [4.0, 1.0, 0.5]]
+        assert [d.embedding for d in second] == [[4.0, 1.0, 0.5], [5.0, 1.0, 0.5]]
+        sent = [[d.content for d in call.kwargs["documents"]] for call in embedder.run.call_args_list]
+        assert sent == [["a()", "bb()"], ["ccc()"]]
+
+    def test_fully_cached_run_never_loads_model(self, tmp_path):
+        warm = CachedDocumentEmbedder(_fake_embedder(), EmbeddingCache(str(tmp_path), "model-a"))
+        warm.run(documents=[Document(content="a()")])
+
+        embedder = _fake_embedder()
+        cold = CachedDocumentEmbedder(embedder, EmbeddingCache(str(tmp_path), "model-a"))
+        result = cold.run(documents=[Document(content="a()")])["documents"]
+
+        assert result[0].embedding == [3.0, 1.0, 0.5]
+        embedder.warm_up.assert_not_called()
+        embedder.run.assert_not_called()
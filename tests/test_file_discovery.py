@@ -0,0 +1,81 @@
+"""
+Unit tests for the shared source file discovery.
+"""
+
+import os
+
+import pytest
+
+from src.services.file_discovery import FileDiscovery, IgnoreRules
+
+
+def _write(root, rel_path, content="x"):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _write(tmp_path, "src/App.java", "class App {}")
+    _write(tmp_path, "src/util/helpers.py")
+    _write(tmp_path, "src/util/debug_log.py")
+    _write(tmp_path, "src/util/.gitignore", "debug_*.py\n")
+    _write(tmp_path, "README.md")
+    _write(tmp_path, "build/Gen.java")
+    _write(tmp_path, "node_modules/lib/index.js")
+    _write(tmp_path, "vendor/lib/Lib.php")
+    _write(tmp_path, "web/app.min.js")
+    _write(tmp_path, "web/app.ts")
+    _write(tmp_path, "logs/keep.py")
+    _write(tmp_path, "logs/drop.py")
+    _write(tmp_path, ".gitignore", "# build output\nbuild/\n/logs/*\n!/logs/keep.py\n")
+    _write(tmp_path, ".docgenignore", "web/*.ts\n")
+    return tmp_path
+
+
+class TestIgnoreRules:
+
+    def test_gitignore_semantics(self):
+        rules = IgnoreRules("", ["*.log", "!keep.log", "/dist", "out/", "docs/**/*.md", r"\#notes"])
+
+        assert rules.match("a/b/c.log", False) is True
+        assert rules.match("a/keep.log", False) is False
+        assert rules.match("dist", True) is True
+        assert rules.match("src/dist", True) is None
+        assert rules.match("a/out", True) is True
+        assert rules.match("out", False) is None
+        assert rules.match("docs/x/y/z.md", False) is True
+        assert rules.match("docs/z.md", False) is True
+        assert rules.match("#notes", False) is True
+
+    def test_rules_only_apply_below_their_directory(self):
+        rules = IgnoreRules("src", ["/gen"])
+
+        assert rules.match("src/gen", True) is True
+        assert rules.match("src/app/gen", True) is None
+        assert rules.match("gen", True) is None
+
+
+class TestFileDiscovery:
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_walk_applies_every_filter(self, tree, workers):
+        records = list(FileDiscovery(workers=workers).walk(str(tree)))
+
+        assert sorted(r.rel_path for r in records) == ["logs/keep.py", "src/App.java", "src/util/helpers.py"]
+        app = next(r for r in records if r.rel_path == "src/App.java")
+        assert app.path == os.path.join(str(tree), "src", "App.java")
+        assert (app.size, app.language) == (len("class App {}"), "java")
+        assert app.mtime_ns == os.stat(app.path).st_mtime_ns
+
+    def test_max_file_size(self, tree):
+        _write(tree, "src/Big.java", "x" * 2048)
+        records = FileDiscovery(max_file_size=1024).walk(str(tree))
+
+        assert "src/Big.java" not in {r.rel_path for r in records}
+
+    def test_custom_extensions_and_excludes(self, tree):
+        discovery = FileDiscovery(extensions=[".md", ".php"], excluded_dirs=[".git"])
+
+        assert sorted(r.rel_path for r in discovery.walk(str(tree))) == ["README.md", "vendor/lib/Lib.php"]
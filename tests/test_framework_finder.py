@@ -1,5 +1,6 @@
 import os
 import pytest
+from src.services.file_discovery import FileDiscovery
 from src.services.framework_detector import FrameworkDetector
 
 class TestFrameworkDetector:
@@ -42,3 +43,13 @@ class TestFrameworkDetector:
         d.mkdir()
         (d / "main.cpp").write_text("#include <iostream>\nint main() { return 0; }")
         assert finder.detect(str(d)) == "Unknown"
+
+    def test_detect_is_deterministic_with_parallel_discovery(self, tmp_path):
+        d = tmp_path / "mixed_project"
+        for i in range(8):
+            (d / f"pkg{i}").mkdir(parents=True)
+            (d / f"pkg{i}" / "routes.js").write_text("const app = require('express')")
+        (d / "api").mkdir()
+        (d / "api" / "main.py").write_text("from fastapi import FastAPI")
+        finder = FrameworkDetector(discovery=FileDiscovery(workers=4))
+        assert {finder.detect(str(d)) for _ in range(5)} == {"FastAPI"}
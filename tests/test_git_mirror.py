@@ -0,0 +1,165 @@
+"""
+Unit tests for the persistent git mirror cache.
+"""
+
+import os
+
+import git
+import pytest
+
+from src.services.git_mirror import GitMirrorCache, is_valid_ref
+from src.services.input_handler import InputHandler
+
+
+def _commit(repo: git.Repo, files: dict, message: str) -> str:
+    for name, content in files.items():
+        path = os.path.join(repo.working_tree_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        repo.index.add([name])
+    return repo.index.commit(message).hexsha
+
+
+@pytest.fixture
+def remote(tmp_path):
+    repo = git.Repo.init(tmp_path / "remote", initial_branch="main")
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "test")
+        writer.set_value("user", "email", "test@example.com")
+    _commit(repo, {"src/App.java": "class App {}", "pom.xml": "<project/>"}, "init")
+    return repo
+
+
+class TestGitMirrorCache:
+
+    def test_checkout_fetches_incrementally(self, tmp_path, remote):
+        cache = GitMirrorCache(str(tmp_path / "cache"))
+        url = f"file://{remote.working_tree_dir}"
+
+        first = cache.checkout(url, str(tmp_path / "job1"))
+        assert first == remote.head.commit.hexsha
+        assert os.path.exists(tmp_path / "job1" / "src" / "App.java")
+
+        second_commit = _commit(remote, {"src/Service.java": "class Service {}"}, "second")
+        assert cache.checkout(url, str(tmp_path / "job2")) == second_commit
+        assert cache.mirrors() == [cache.mirror_path(url)]
+
+        # History is available for incremental diffs
+        handler = InputHandler()
+        changed, _ = handler.changed_files(str(tmp_path / "job2"), first)
+        assert changed == {"src/Service.java"}
+
+        cache.release(str(tmp_path / "job1"))
+        cache.release(str(tmp_path / "job2"))
+        assert not os.path.exists(tmp_path / "job1")
+        # Only the bare mirror itself is left
+        assert len(git.Git(cache.mirror_path(url)).worktree("list").splitlines()) == 1
+
+    def test_checkout_at_ref(self, tmp_path, remote):
+        cache = GitMirrorCache(str(tmp_path / "cache"))
+        url = f"file://{remote.working_tree_dir}"
+        tagged = remote.head.commit.hexsha
+        remote.create_tag("v1")
+        _commit(remote, {"src/Later.java": "class Later {}"}, "later")
+
+        assert cache.checkout(url, str(tmp_path / "tag"), ref="v1") == tagged
+        assert cache.checkout(url, str(tmp_path / "sha"), ref=tagged) == tagged
+        assert not os.path.exists(tmp_path / "tag" / "src" / "Later.java")
+        with pytest.raises(RuntimeError):
+            cache.checkout(url, str(tmp_path / "missing"), ref="no-such-branch")
+
+    def test_sparse_checkout_keeps_source_files(self, tmp_path, remote):
+        cache = GitMirrorCache(str(tmp_path / "cache"), sparse_extensions=[".java"])
+        cache.checkout(f"file://{remote.working_tree_dir}", str(tmp_path / "job"))
+
+        assert os.path.exists(tmp_path / "job" / "src" / "App.java")
+        assert not os.path.exists(tmp_path / "job" / "pom.xml")
+
+    def test_credentials_are_not_stored(self, tmp_path):
+        cache = GitMirrorCache(str(tmp_path / "cache"))
+        assert cache.mirror_path("https://token@host/org/repo.git") == cache.mirror_path("https://host/org/repo.git")
+
+    def test_quota_evicts_least_recently_used_idle_mirrors(self, tmp_path, remote):
+        cache = GitMirrorCache(str(tmp_path / "cache"))
+        other = git.Repo.clone_from(remote.working_tree_dir, tmp_path / "other")
+        old_url, busy_url = f"file://{other.working_tree_dir}", f"file://{remote.working_tree_dir}"
+
+        cache.checkout(old_url, str(tmp_path / "old"))
+        cache.release(str(tmp_path / "old"))
+        cache.checkout(busy_url, str(tmp_path / "busy"))
+
+        cache.quota_bytes = 1
+        assert cache.enforce_quota() == [cache.mirror_path(old_url)]
+        # The remaining mirror still has a live worktree
+        assert cache.mirrors() == [cache.mirror_path(busy_url)]
+
+
+class TestInputHandlerWithMirror:
+
+    def test_worktree_is_released_on_cleanup(self, tmp_path, remote):
+        handler = InputHandler(mirror_cache=GitMirrorCache(str(tmp_path / "cache")))
+        working_dir = handler.process_git_repo(f"file://{remote.working_tree_dir}")
+
+        assert handler.get_head_commit(working_dir) == remote.head.commit.hexsha
+        handler.cleanup()
+        assert not os.path.exists(working_dir)
+
+
+class TestResolveRemoteHead:
+
+    def test_short_ref_matches_exact_branch_or_tag(self, remote):
+        url = f"file://{remote.working_tree_dir}"
+        main = remote.head.commit.hexsha
+        remote.create_head("feature/main")
+        remote.git.checkout("feature/main")
+        feature = _commit(remote, {"src/Feature.java": "class Feature {}"}, "feature")
+        remote.create_tag("v1", message="annotated")
+        handler = InputHandler()
+
+        assert handler.resolve_remote_head(url, None, "main") == main
+        assert handler.resolve_remote_head(url, None, "feature/main") == feature
+        assert handler.resolve_remote_head(url, None, "v1") == feature
+        assert handler.resolve_remote_head(url) == feature
+        with pytest.raises(RuntimeError):
+            handler.resolve_remote_head(url, None, "missing")
+
+    def test_ambiguous_ref_is_rejected(self, remote):
+        remote.create_tag("main")
+        with pytest.raises(RuntimeError, match="ambiguous"):
+            InputHandler().resolve_remote_head(f"file://{remote.working_tree_dir}", None, "main")
+
+
+class TestRefValidation:
+
+    def test_is_valid_ref(self):
+        assert is_valid_ref("main")
+        assert is_valid_ref("feature/x")
+        assert is_valid_ref("refs/pull/1/head")
+        assert is_valid_ref("a" * 40)
+        assert not is_valid_ref("--upload-pack=touch /tmp/x;git-upload-pack")
+        assert not is_valid_ref("-b")
+        assert not is_valid_ref("bad..ref")
+        assert not is_valid_ref("")
+
+    def test_option_refs_never_reach_git(self, tmp_path, remote):
+        marker = tmp_path / "pwned"
+        ref = f"--upload-pack=touch {marker};git-upload-pack"
+        url = f"file://{remote.working_tree_dir}"
+
+        with pytest.raises(RuntimeError, match="Invalid git ref"):
+            GitMirrorCache(str(tmp_path / "cache")).checkout(url, str(tmp_path / "job"), ref=ref)
+        with pytest.raises(ValueError, match="Invalid git ref"):
+            InputHandler().process_git_repo(url, ref=ref)
+        with pytest.raises(RuntimeError, match="Invalid git ref"):
+            InputHandler().resolve_remote_head(url, None, ref)
+        assert not marker.exists()
+
+    def test_api_rejects_invalid_refs(self):
+        from fastapi.testclient import TestClient
+        from src.api import main
+
+        response = TestClient(main.app).post(
+            "/generate", json={"source_type": "git", "path": "https://host/repo.git", "ref": "--upload-pack=x"}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,94 @@
+"""
+Unit tests for identifier-aware keyword search and hybrid retrieval.
+"""
+
+from unittest.mock import Mock
+
+from haystack import Document
+
+from src.components.HybridRetriever import HybridRetriever
+from src.utils.identifier_index import IdentifierIndex, split_identifier, tokenize, reciprocal_rank_fusion
+from src.utils.query_cache import IndexVersion
+
+
+def _code_docs():
+    return [
+        Document(id="verify", content="public boolean verify(String token) { return jwt.check(token); }",
+                 meta={"type": "ast_method", "class_name": "AuthService", "method_name": "verify"}),
+        Document(id="login", content="public Token login(User user) { return authService.issue(user); }",
+                 meta={"type": "ast_method", "class_name": "AuthController", "method_name": "login"}),
+        Document(id="get_user", content="def get_user_by_id(user_id): return db.get(user_id)",
+                 meta={"type": "ast_method", "class_name": "UserRepository", "method_name": "get_user_by_id"}),
+        Document(id="mapper", content="Class: AuthService\nMethod: verify\nDependencies: None",
+                 meta={"type": "code_mapper", "class_name": "AuthService", "method_name": "verify"}),
+    ]
+
+
+class TestTokenization:
+
+    def test_identifiers_are_split_into_words(self):
+        assert split_identifier("authService.verify") == ["authservice.verify", "authservice", "auth", "service", "verify"]
+        assert split_identifier("get_user_by_id") == ["get_user_by_id", "get", "user", "by", "id"]
+        assert split_identifier("HTTPClient") == ["httpclient", "http", "client"]
+
+    def test_free_text_is_tokenized(self):
+        assert "verify" in tokenize("How does authService.verify work?")
+
+
+class TestIdentifierIndex:
+
+    def test_exact_identifier_ranks_first(self):
+        index = IdentifierIndex()
+        index.build(_code_docs())
+
+        assert index.search("authService.verify", top_k=1)[0][0].id in {"verify", "mapper"}
+        assert index.search("getUserById", top_k=1)[0][0].id == "get_user"
+
+    def test_filter_is_applied(self):
+        index = IdentifierIndex()
+        index.build(_code_docs())
+
+        hits = index.search("verify", doc_filter=lambda d: d.meta["type"] == "code_mapper")
+        assert [d.id for d, _ in hits] == ["mapper"]
+
+
+class TestFusion:
+
+    def test_documents_in_both_lists_win(self):
+        a, b, c = (Document(id=x, content=x) for x in "abc")
+        fused = reciprocal_rank_fusion([[a, b], [c, b]], k=60)
+
+        assert fused[0].id == "b"
+        assert fused[0].score == 1 / 62 + 1 / 62
+
+
+class TestHybridRetriever:
+
+    def _retriever(self, tmp_path, store_docs):
+        store = Mock()
+        store.filter_documents.return_value = store_docs
+        vector = Mock()
+        # Embedding search alone misses the AuthService.verify method
+        vector.run.return_value = {"documents": [store_docs[1], store_docs[2]]}
+        version = IndexVersion(str(tmp_path / "index_version"))
+        return HybridRetriever(vector, store, version, top_k=3), store, version
+
+    def test_keyword_hits_are_fused_with_vector_hits(self, tmp_path):
+        retriever, _, _ = self._retriever(tmp_path, _code_docs())
+
+        docs = retriever.run(query="authService.verify", query_embedding=[0.1])["documents"]
+
+        assert len(docs) == 3
+        # Either AuthService.verify document (method body or mapper entry) is pulled in by keywords
+        assert {"verify", "mapper"} & {d.id for d in docs}
+
+    def test_keyword_index_rebuilds_after_index_writes(self, tmp_path):
+        retriever, store, version = self._retriever(tmp_path, _code_docs())
+
+        retriever.run(query="verify", query_embedding=[0.1])
+        retriever.run(query="verify", query_embedding=[0.1])
+        assert store.filter_documents.call_count == 1
+
+        version.bump()
+        retriever.run(query="verify", query_embedding=[0.1])
+        assert store.filter_documents.call_count == 2
@@ -0,0 +1,175 @@
+"""
+Tests for incremental re-documentation planning.
+"""
+
+import git
+import pytest
+
+from src.services.incremental import IncrementalPlan, RunManifestStore, class_hashes
+from src.services.input_handler import InputHandler
+
+
+def _class(name, methods):
+    return {
+        "class_name": name,
+        "methods": [
+            {"method_name": m, "method_definition": body, "is_api_route": name.endswith("Controller")}
+            for m, body in methods.items()
+        ]
+    }
+
+
+@pytest.fixture
+def previous_run():
+    ast_data = [
+        _class("AuthController", {"login": "login() { authService.verify(); }", "logout": "logout() {}"}),
+        _class("AuthService", {"verify": "verify() { return true; }"}),
+    ]
+    mapped = {
+        "AuthController": {"methods": [
+            {"method": "login", "dependencies": ["authService.verify"], "is_api_route": True},
+            {"method": "logout", "dependencies": [], "is_api_route": True},
+        ]},
+        "AuthService": {"methods": [{"method": "verify", "dependencies": [], "is_api_route": False}]},
+    }
+    files = {"src/AuthController.java": [ast_data[0]], "src/AuthService.java": [ast_data[1]]}
+    return IncrementalPlan.build_manifest("abc123", files, ast_data, mapped, [])
+
+
+class TestIncrementalPlan:
+
+    def test_full_run_extracts_everything(self):
+        plan = IncrementalPlan()
+        assert not plan.is_incremental
+        assert plan.needs_extraction("any/file.java")
+
+    def test_only_changed_or_new_files_are_extracted(self, previous_run):
+        plan = IncrementalPlan(previous_run, {"src/AuthService.java"})
+        assert plan.needs_extraction("src/AuthService.java")
+        assert plan.needs_extraction("src/NewController.java")
+        assert not plan.needs_extraction("src/AuthController.java")
+        assert plan.reused_chunks("src/AuthController.java")[0]["class_name"] == "AuthController"
+
+    def test_dependency_change_regenerates_dependent_endpoint(self, previous_run):
+        plan = IncrementalPlan(previous_run, {"src/AuthService.java"})
+        ast_data = [
+            _class("AuthController", {"login": "login() { authService.verify(); }", "logout": "logout() {}"}),
+            _class("AuthService", {"verify": "verify() { return false; }"}),
+        ]
+
+        to_map, reused = plan.split_classes(ast_data)
+        # AuthController calls into the changed class, so its mapping is redone too
+        assert [c["class_name"] for c in to_map] == ["AuthController", "AuthService"]
+        assert reused == {}
+
+        mapped = dict(previous_run["mapped"])
+        assert plan.changed_endpoints(ast_data, mapped) == ["AuthController.login"]
+
+    def test_classes_referencing_a_changed_class_are_remapped(self, previous_run):
+        health = _class("HealthController", {"ping": "ping() {}"})
+        previous_run["files"]["src/HealthController.java"] = [health]
+        previous_run["class_hashes"].update(class_hashes([health]))
+        previous_run["mapped"]["HealthController"] = {"methods": [
+            {"method": "ping", "dependencies": [], "is_api_route": True}
+        ]}
+        plan = IncrementalPlan(previous_run, {"src/AuthService.java"})
+        ast_data = [
+            _class("AuthController", {"login": "login() { authService.verify(); }", "logout": "logout() {}"}),
+            # verify was renamed; AuthController's own code is unchanged
+            _class("AuthService", {"check": "check() { return true; }"}),
+            _class("HealthController", {"ping": "ping() {}"}),
+        ]
+
+        to_map, reused = plan.split_classes(ast_data)
+
+        assert [c["class_name"] for c in to_map] == ["AuthController", "AuthService"]
+        assert set(reused) == {"HealthController"}
+
+    def test_unchanged_repo_regenerates_nothing(self, previous_run):
+        plan = IncrementalPlan(previous_run, set())
+        ast_data = [cls for chunks in previous_run["files"].values() for cls in chunks]
+
+        to_map, reused = plan.split_classes(ast_data)
+        assert to_map == []
+        assert plan.changed_endpoints(ast_data, reused) == []
+
+
+class TestRunManifestStore:
+
+    def test_round_trip_ignores_credentials_in_url(self, tmp_path, previous_run):
+        store = RunManifestStore(str(tmp_path))
+        store.save("https://token@github.com/acme/api.git", "abc123", previous_run)
+
+        loaded = store.load("https://github.com/acme/api", "abc123")
+        assert loaded["commit"] == "abc123"
+        assert store.load("https://github.com/acme/api", "other") is None
+
+
+def test_input_handler_changed_files(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    with repo.config_writer() as cfg:
+        cfg.set_value("user", "name", "test")
+        cfg.set_value("user", "email", "test@example.com")
+
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    (tmp_path / "c.py").write_text("c = 1\n" * 20)
+    repo.index.add(["a.py", "b.py", "c.py"])
+    base = repo.index.commit("base").hexsha
+
+    (tmp_path / "a.py").write_text("a = 2\n")
+    repo.index.remove(["b.py"], working_tree=True)
+    repo.git.mv("c.py", "d.py")
+    repo.index.add(["a.py"])
+    repo.index.commit("change")
+
+    handler = InputHandler()
+    changed, deleted = handler.changed_files(str(tmp_path), base)
+    assert changed == {"a.py", "d.py"}
+    assert deleted == {"b.py", "c.py"}
+    assert handler.get_head_commit(str(tmp_path)) == repo.head.commit.hexsha
+
+
+def test_pipeline_documents_only_changed_endpoints(tmp_path, make_config):
+    from unittest.mock import patch
+    from src.services import documentation_pipeline
+
+    repo = git.Repo.init(tmp_path / "repo")
+    with repo.config_writer() as cfg:
+        cfg.set_value("user", "name", "test")
+        cfg.set_value("user", "email", "test@example.com")
+    source = tmp_path / "repo" / "app.py"
+    source.write_text("class App:\n    def run(self):\n        return 1\n")
+    repo.index.add(["app.py"])
+    base = repo.index.commit("base").hexsha
+
+    config = make_config({
+        "save_ast": False,
+        "ast_cache": {"enabled": False},
+        "code_mapper": {"static_analysis": True},
+        "doc_creator": {"enabled": True},
+        "jobs": {"output_dir": str(tmp_path / "outputs")},
+        "incremental": {"state_dir": str(tmp_path / "runs")}
+    })
+    url = f"file://{tmp_path / 'repo'}"
+
+    def run_job(job_id, base_commit=None):
+        statuses = []
+        with patch.object(documentation_pipeline, "get_app_config", return_value=config), \
+                patch.object(documentation_pipeline, "DocumentationCreator") as creator:
+            creator.return_value.run.return_value = {"methods_processed": 0, "output_files": {}}
+            documentation_pipeline.process_documentation("git", url, None, job_id, base_commit, report=statuses.append)
+        assert statuses[-1]["status"] == "completed", statuses[-1].get("error")
+        return statuses[-1], creator.return_value.run.call_args.kwargs["endpoints"]
+
+    full, endpoints = run_job("job-1")
+    assert endpoints is None
+    assert full["documentation"] == {"methods_processed": 0}
+    assert full["progress"]["stages"][-1] == "document"
+
+    source.write_text("class App:\n    def run(self):\n        return 2\n")
+    repo.index.add(["app.py"])
+    repo.index.commit("change")
+    incremental, endpoints = run_job("job-2", base_commit=base)
+    assert incremental["incremental"] is True
+    assert endpoints == incremental["changed_endpoints"]
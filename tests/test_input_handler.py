@@ -1,4 +1,6 @@
 import os
+import subprocess
+import sys
 import pytest
 from src.services.input_handler import InputHandler
 
@@ -22,3 +24,72 @@ def test_input_handler_invalid_folder():
     handler = InputHandler()
     with pytest.raises(FileNotFoundError):
         handler.process_local_folder("/non/existent/path")
+
+def _source_tree(tmp_path):
+    source = tmp_path / "source"
+    (source / "src").mkdir(parents=True)
+    (source / "node_modules" / "lib").mkdir(parents=True)
+    (source / "build").mkdir()
+    (source / "build" / "Gen.java").write_text("class Gen {}")
+    (source / "src" / "App.java").write_text("class App {}")
+    (source / "README.md").write_text("readme")
+    (source / ".gitignore").write_text("build/")
+    (source / "node_modules" / "lib" / "index.js").write_text("module.exports = {}")
+    return source
+
+def test_input_handler_in_place_never_deletes_source(tmp_path):
+    source = _source_tree(tmp_path)
+
+    handler = InputHandler()
+    working_dir = handler.process_local_folder(str(source))
+    assert working_dir == str(source)
+    handler.cleanup()
+    assert os.path.exists(source / "src" / "App.java")
+
+def test_input_handler_snapshot_clones_filtered_files(tmp_path):
+    source = _source_tree(tmp_path)
+    (source / "src" / "Service.java").write_text("class Service {}")
+
+    handler = InputHandler(local_mode="snapshot")
+    try:
+        snapshot = handler.process_local_folder(str(source))
+        assert snapshot != str(source)
+        assert os.path.exists(os.path.join(snapshot, "src", "App.java"))
+        assert not os.path.exists(os.path.join(snapshot, "build"))
+        assert not os.path.exists(os.path.join(snapshot, "README.md"))
+        assert not os.path.exists(os.path.join(snapshot, "node_modules"))
+
+        # Neither replacing nor rewriting a file in place changes the snapshot
+        (source / "src" / "App.java.tmp").write_text("class App { void run() {} }")
+        os.replace(source / "src" / "App.java.tmp", source / "src" / "App.java")
+        with open(source / "src" / "Service.java", "r+") as f:
+            f.write("// edited")
+        for name, content in (("App.java", "class App {}"), ("Service.java", "class Service {}")):
+            with open(os.path.join(snapshot, "src", name)) as f:
+                assert f.read() == content
+    finally:
+        handler.cleanup()
+    assert not os.path.exists(snapshot)
+    assert os.path.exists(source / "src" / "App.java")
+
+def test_input_handler_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        InputHandler(local_mode="move")
+
+def test_input_handler_without_fcntl(tmp_path):
+    # Windows has no fcntl: snapshots fall back to plain copies
+    source = _source_tree(tmp_path)
+    result = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys; sys.modules['fcntl'] = None\n"
+            "from src.services.input_handler import InputHandler\n"
+            "from src.services.git_mirror import GitMirrorCache\n"
+            f"with GitMirrorCache({str(tmp_path / 'cache')!r})._locked('mirror') as acquired: assert acquired\n"
+            "handler = InputHandler(local_mode='snapshot')\n"
+            f"print(open(handler.process_local_folder({str(source)!r}) + '/src/App.java').read())\n"
+            "handler.cleanup()\n"
+        )],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "class App {}"
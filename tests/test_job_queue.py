@@ -0,0 +1,138 @@
+"""
+Unit tests for the durable job queue and its workers.
+"""
+
+import multiprocessing
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services.job_queue import JobQueue, QueueFullError
+from src.services.worker_pool import run_job
+
+
+def _claim_all(path, worker_id, results):
+    queue = JobQueue(path)
+    claimed = []
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            break
+        claimed.append(job["id"])
+    results.put(claimed)
+
+
+class TestJobQueue:
+
+    def test_priority_then_fifo(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        low = queue.enqueue({"path": "a"})
+        high = queue.enqueue({"path": "b"}, priority=5)
+        low2 = queue.enqueue({"path": "c"})
+
+        assert queue.get(low2)["position"] == 3
+        assert [queue.claim("w")["id"] for _ in range(3)] == [high, low, low2]
+        assert queue.claim("w") is None
+
+    def test_depth_limit(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_depth=2)
+        queue.enqueue({})
+        queue.enqueue({})
+        with pytest.raises(QueueFullError):
+            queue.enqueue({})
+
+        queue.claim("w")
+        queue.enqueue({})
+
+    def test_jobs_survive_reopen_and_credentials_stay_out_of_the_database(self, tmp_path):
+        path = str(tmp_path / "jobs.sqlite3")
+        job_id = JobQueue(path).enqueue({"path": "repo", "credentials": "token"})
+
+        queue = JobQueue(path)
+        for name in os.listdir(tmp_path):
+            if name.startswith("jobs.sqlite3") and os.path.isfile(tmp_path / name):
+                assert b"token" not in (tmp_path / name).read_bytes()
+                assert os.stat(tmp_path / name).st_mode & 0o077 == 0
+        assert os.stat(queue._secret_file(job_id)).st_mode & 0o777 == 0o600
+
+        job = queue.claim("w")
+        assert job["payload"]["credentials"] == "token"
+        queue.update(job_id, {"status": "completed", "results_file": "mapped.json"}, worker_id="w")
+
+        assert queue.get(job_id) == {"status": "completed", "results_file": "mapped.json"}
+        assert os.listdir(queue.secrets_path) == []
+
+    def test_stale_jobs_are_requeued_then_failed(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+        job_id = queue.enqueue({})
+
+        queue.claim("dead-worker")
+        assert queue.requeue_stale(timeout_seconds=-1) == [job_id]
+        assert queue.get(job_id)["status"] == "queued"
+        # The presumed-dead worker can no longer overwrite the job
+        assert not queue.update(job_id, {"status": "completed"}, worker_id="dead-worker")
+
+        queue.claim("w2")
+        assert queue.requeue_stale(timeout_seconds=-1) == []
+        assert queue.get(job_id)["status"] == "failed"
+
+    def test_concurrent_claims_never_share_a_job(self, tmp_path):
+        path = str(tmp_path / "jobs.sqlite3")
+        queue = JobQueue(path)
+        job_ids = {queue.enqueue({"n": i}) for i in range(60)}
+
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [context.Process(target=_claim_all, args=(path, f"w{i}", results)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        claimed = [job for _ in workers for job in results.get(timeout=30)]
+        for worker in workers:
+            worker.join()
+
+        assert len(claimed) == len(set(claimed)) == 60
+        assert set(claimed) == job_ids
+
+
+class TestRunJob:
+
+    def test_reported_status_is_stored(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        job_id = queue.enqueue({"source_type": "local", "path": "/src"})
+        job = queue.claim("w")
+
+        def fake_process(source_type, path, credentials, job_id, base_commit=None, report=None, **kwargs):
+            report({"status": "completed", "results_file": f"{path}/mapped.json"})
+
+        with patch("src.services.documentation_pipeline.process_documentation", fake_process):
+            run_job(queue, job, "w", heartbeat_interval=0.01)
+
+        assert queue.get(job_id) == {"status": "completed", "results_file": "/src/mapped.json"}
+
+    def test_crash_marks_job_failed(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        job_id = queue.enqueue({"source_type": "local", "path": "/src"})
+
+        with patch("src.services.documentation_pipeline.process_documentation", side_effect=MemoryError("oom")):
+            run_job(queue, queue.claim("w"), "w", heartbeat_interval=0.01)
+
+        assert queue.get(job_id)["status"] == "failed"
+
+
+class TestApi:
+
+    def test_generate_queues_and_status_reports(self, tmp_path):
+        from src.api import main
+
+        with patch.object(main, "_job_queue", JobQueue(str(tmp_path / "jobs.sqlite3"), max_depth=1)):
+            client = TestClient(main.app)
+            response = client.post("/generate", json={"source_type": "local", "path": "/src", "priority": 2})
+            job_id = response.json()["job_id"]
+
+            assert response.json()["status"] == "queued"
+            assert client.get(f"/status/{job_id}").json()["position"] == 1
+            assert client.post("/generate", json={"source_type": "local", "path": "/other"}).status_code == 429
+            assert client.get("/status/unknown").status_code == 404
+            assert client.get("/queue").json()["queued"] == 1
@@ -0,0 +1,101 @@
+"""
+Tests for the persistent LLM response cache.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+
+from src.utils.llm_cache import LLMResponseCache, CachedGenerator, generate
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=3600, max_entries=3)
+
+
+def _generator(reply):
+    generator = Mock(spec=["run"])
+    generator.run.return_value = {"replies": [reply], "meta": [{}]}
+    return generator
+
+
+class TestCachedGenerator:
+
+    def test_repeated_prompt_makes_one_llm_call(self, cache):
+        generator = _generator(json.dumps({"methods": []}))
+        cached = CachedGenerator(generator, cache, provider="ollama", model="llama3")
+
+        first = cached.run("map this class")
+        cached.remember("map this class", first["replies"][0])
+        second = cached.run("map this class")
+
+        assert generator.run.call_count == 1
+        assert second["replies"] == first["replies"]
+        assert second["meta"][0]["cached"] is True
+
+    def test_reply_is_not_cached_until_remembered(self, cache):
+        generator = _generator('{"methods": "not a list"}')
+        cached = CachedGenerator(generator, cache, provider="ollama", model="llama3")
+
+        cached.run("prompt")
+        cached.run("prompt")
+
+        assert generator.run.call_count == 2
+
+    def test_retries_bypass_the_cache(self, cache):
+        generator = _generator('{"fresh": true}')
+        cached = CachedGenerator(generator, cache, provider="ollama", model="llama3")
+        cached.remember("prompt", '{"stale": true}')
+
+        assert generate(cached, "prompt") == '{"stale": true}'
+        assert generate(cached, "prompt", attempt=1) == '{"fresh": true}'
+        assert generator.run.call_count == 1
+
+    def test_before_call_runs_only_on_cache_misses(self, cache):
+        cached = CachedGenerator(_generator('{"fresh": true}'), cache, provider="ollama", model="llama3")
+        cached.remember("hit", '{"cached": true}')
+        before_call = Mock()
+
+        generate(cached, "hit", before_call=before_call)
+        before_call.assert_not_called()
+        generate(cached, "miss", before_call=before_call)
+        generate(cached, "hit", attempt=1, before_call=before_call)
+        assert before_call.call_count == 2
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "llm.sqlite3")
+        first = CachedGenerator(_generator('{"ok": true}'), LLMResponseCache(path), "ollama", "llama3")
+        first.remember("p", first.run("p")["replies"][0])
+
+        generator = _generator('{"ok": false}')
+        result = CachedGenerator(generator, LLMResponseCache(path), "ollama", "llama3").run("p")
+
+        assert generator.run.call_count == 0
+        assert result["replies"] == ['{"ok": true}']
+
+
+class TestLLMResponseCache:
+
+    def test_key_includes_model_and_generation_kwargs(self):
+        base = LLMResponseCache.make_key("ollama", "llama3", "p", {})
+        assert base != LLMResponseCache.make_key("ollama", "mistral", "p", {})
+        assert base != LLMResponseCache.make_key("ollama", "llama3", "p", {"temperature": 0.1})
+        assert base != LLMResponseCache.make_key("googlegemini", "llama3", "p", {})
+
+    def test_expired_entries_are_ignored(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=0.01)
+        cache.put("k", "{}")
+        import time
+        time.sleep(0.02)
+        assert cache.get("k") is None
+
+    def test_max_entries_evicts_least_recently_used(self, cache):
+        for key in ("a", "b", "c"):
+            cache.put(key, "{}")
+        cache.get("a")  # refresh "a" so "b" becomes the oldest
+        cache.put("d", "{}")
+
+        assert cache.stats()["entries"] == 3
+        assert cache.get("b") is None
+        assert cache.get("a") == "{}"
@@ -0,0 +1,224 @@
+"""
+Unit tests for the embedded LocalDocumentStore.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from haystack import Document
+from haystack.document_stores.errors import DuplicateDocumentError
+from haystack.document_stores.types import DuplicatePolicy
+
+from src.core.config import AppConfig
+from src.utils.document_store import get_document_store, get_embedding_retriever
+from src.utils.local_document_store import LocalDocumentStore, LocalEmbeddingRetriever
+
+
+def _clustered(n, dim=16, clusters=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.2 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def _docs(vectors):
+    return [
+        Document(
+            id=f"d{i}",
+            content=f"method{i}() {{}}",
+            meta={"type": "ast_method" if i % 2 else "code_mapper", "method_name": f"method{i}"},
+            embedding=vector.tolist()
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def _exact_top(vectors, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [f"d{i}" for i in np.argsort(-(normed @ (query / np.linalg.norm(query))))[:k]]
+
+
+class TestWritesAndFilters:
+
+    def test_filters_use_haystack_syntax(self, tmp_path):
+        store = LocalDocumentStore(str(tmp_path))
+        store.write_documents(_docs(_clustered(20)))
+
+        mapper = store.filter_documents({"field": "meta.type", "operator": "==", "value": "code_mapper"})
+        named = store.filter_documents({
+            "operator": "AND",
+            "conditions": [
+                {"field": "meta.type", "operator": "==", "value": "ast_method"},
+                {"field": "meta.method_name", "operator": "in", "value": ["method1", "method2", "method3"]}
+            ]
+        })
+
+        assert len(mapper) == 10
+        assert sorted(d.id for d in named) == ["d1", "d3"]
+        assert named[0].embedding is not None
+
+    def test_duplicate_policies(self, tmp_path):
+        store = LocalDocumentStore(str(tmp_path))
+        docs = _docs(_clustered(3))
+        store.write_documents(docs)
+
+        changed = Document(id="d0", content="changed", embedding=docs[0].embedding)
+        assert store.write_documents([changed], policy=DuplicatePolicy.SKIP) == 0
+        with pytest.raises(DuplicateDocumentError):
+            store.write_documents([changed], policy=DuplicatePolicy.FAIL)
+        store.write_documents([changed], policy=DuplicatePolicy.OVERWRITE)
+
+        assert store.count_documents() == 3
+        assert store.filter_documents({"field": "id", "operator": "==", "value": "d0"})[0].content == "changed"
+
+    def test_deletes(self, tmp_path):
+        store = LocalDocumentStore(str(tmp_path))
+        store.write_documents(_docs(_clustered(10)))
+
+        store.delete_documents(["d0", "d1"])
+        deleted = store.delete_by_filter({"field": "meta.type", "operator": "==", "value": "code_mapper"})
+
+        assert deleted == 4
+        assert store.count_documents() == 4
+        store.delete_all_documents()
+        assert store.count_documents() == 0
+
+
+class TestRetrieval:
+
+    def test_exact_retrieval_matches_brute_force(self, tmp_path):
+        vectors = _clustered(200)
+        store = LocalDocumentStore(str(tmp_path))
+        store.write_documents(_docs(vectors))
+
+        hits = LocalEmbeddingRetriever(store, top_k=5).run(query_embedding=vectors[7].tolist())["documents"]
+
+        assert [d.id for d in hits] == _exact_top(vectors, vectors[7], 5)
+        assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+
+    def test_filtered_retrieval_only_returns_matches(self, tmp_path):
+        vectors = _clustered(50)
+        store = LocalDocumentStore(str(tmp_path))
+        store.write_documents(_docs(vectors))
+
+        hits = store._embedding_retrieval(
+            vectors[0].tolist(), filters={"field": "meta.type", "operator": "==", "value": "ast_method"}, top_k=5
+        )
+
+        assert len(hits) == 5
+        assert all(d.meta["type"] == "ast_method" for d in hits)
+
+    def test_ivf_recall_on_clustered_data(self, tmp_path):
+        vectors = _clustered(3000, dim=32, clusters=20)
+        store = LocalDocumentStore(str(tmp_path), ivf_min_rows=500, nprobe=6)
+        for start in range(0, len(vectors), 500):
+            store.write_documents(_docs(vectors)[start:start + 500])
+
+        rng = np.random.default_rng(3)
+        recalls = []
+        for i in rng.integers(0, len(vectors), 20):
+            query = vectors[i] + 0.05
+            got = {d.id for d in store._embedding_retrieval(query.tolist(), top_k=10)}
+            recalls.append(len(got & set(_exact_top(vectors, query, 10))) / 10)
+
+        assert (tmp_path / "ivf.json").exists()
+        assert np.mean(recalls) >= 0.9
+
+    def test_overwritten_rows_are_not_returned(self, tmp_path):
+        vectors = _clustered(600, dim=8)
+        store = LocalDocumentStore(str(tmp_path), ivf_min_rows=100)
+        store.write_documents(_docs(vectors))
+        store._embedding_retrieval(vectors[0].tolist(), top_k=3)  # builds the index
+
+        moved = Document(id="d0", content="moved", embedding=(-vectors[0]).tolist())
+        store.write_documents([moved], policy=DuplicatePolicy.OVERWRITE)
+        hits = store._embedding_retrieval(vectors[0].tolist(), top_k=3)
+
+        assert "d0" not in [d.id for d in hits]
+        assert len(hits) == 3
+
+
+class TestPersistence:
+
+    def test_reopen_and_cross_instance_reload(self, tmp_path):
+        vectors = _clustered(30)
+        writer = LocalDocumentStore(str(tmp_path))
+        writer.write_documents(_docs(vectors)[:20])
+        reader = LocalDocumentStore(str(tmp_path))
+        assert reader.count_documents() == 20
+
+        writer.write_documents(_docs(vectors)[20:])
+        writer.delete_documents(["d0"])
+
+        assert reader.count_documents() == 29
+        assert [d.id for d in reader._embedding_retrieval(vectors[25].tolist(), top_k=1)] == ["d25"]
+
+    def test_second_writer_waits_for_the_first(self, tmp_path):
+        import threading
+
+        vectors = _clustered(20)
+        # Separate instances stand in for separate processes sharing the directory
+        first, second = LocalDocumentStore(str(tmp_path)), LocalDocumentStore(str(tmp_path))
+        with first._writing():
+            writer = threading.Thread(target=second.write_documents, args=(_docs(vectors)[10:],))
+            writer.start()
+            writer.join(timeout=0.2)
+            assert writer.is_alive()
+            first.write_documents(_docs(vectors)[:10])
+        writer.join(timeout=5)
+
+        reopened = LocalDocumentStore(str(tmp_path))
+        assert reopened.count_documents() == 20
+        for i in (3, 15):
+            assert [d.id for d in reopened._embedding_retrieval(vectors[i].tolist(), top_k=1)] == [f"d{i}"]
+
+    def test_works_without_fcntl(self, tmp_path):
+        # Windows has no fcntl; writes are then only serialized in-process
+        result = subprocess.run(
+            [sys.executable, "-c", (
+                "import sys; sys.modules['fcntl'] = None\n"
+                "from haystack import Document\n"
+                "from src.utils.local_document_store import LocalDocumentStore\n"
+                f"store = LocalDocumentStore({str(tmp_path)!r})\n"
+                "store.write_documents([Document(id='a', content='x', embedding=[1.0, 0.0])])\n"
+                f"print(LocalDocumentStore({str(tmp_path)!r}).count_documents())\n"
+            )],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "1"
+
+    def test_compaction_preserves_documents(self, tmp_path):
+        vectors = _clustered(1500, dim=8)
+        store = LocalDocumentStore(str(tmp_path))
+        store.write_documents(_docs(vectors))
+        store.delete_documents([f"d{i}" for i in range(1000)])
+
+        assert store._file_rows() == 500
+        reopened = LocalDocumentStore(str(tmp_path))
+        assert reopened.count_documents() == 500
+        assert [d.id for d in reopened._embedding_retrieval(vectors[1200].tolist(), top_k=1)] == ["d1200"]
+
+
+class TestBackendSelection:
+
+    def test_local_backend_is_selected_from_config(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(f"document_store:\n  backend: local\n  path: {tmp_path / 'store'}\n")
+        config = AppConfig(str(config_path))
+
+        store = get_document_store(config)
+
+        assert isinstance(store, LocalDocumentStore)
+        assert get_document_store(config) is store
+        assert isinstance(get_embedding_retriever(store), LocalEmbeddingRetriever)
+
+    def test_unknown_backend_is_rejected(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("document_store:\n  backend: pinecone\n")
+
+        with pytest.raises(ValueError):
+            get_document_store(AppConfig(str(config_path)))
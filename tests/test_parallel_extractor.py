@@ -0,0 +1,56 @@
+"""
+Tests for ParallelASTExtractor.
+
+Parallel extraction must return exactly what the serial path returns,
+in the same order, regardless of the worker count.
+"""
+
+import os
+import pytest
+
+from src.core.config import AppConfig
+from src.components.extractor.parallel_extractor import ParallelASTExtractor
+
+APIS_TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "apis-test")
+
+
+@pytest.fixture
+def source_files():
+    paths = []
+    for root, dirs, files in os.walk(APIS_TEST_DIR):
+        dirs.sort()
+        for file in sorted(files):
+            paths.append(os.path.join(root, file))
+    return paths
+
+
+@pytest.fixture
+def quiet_config(tmp_path):
+    """Config that neither prints nor saves AST files."""
+    path = tmp_path / "config.yaml"
+    path.write_text("verbose: false\nsave_ast: false\nsave_ast_path: ast\n")
+    return AppConfig(str(path))
+
+
+class TestParallelASTExtractor:
+
+    def test_parallel_matches_serial_order(self, source_files, quiet_config):
+        serial = ParallelASTExtractor(workers=1, config=quiet_config).extract(source_files)
+        parallel = ParallelASTExtractor(workers=3, chunksize=1, config=quiet_config).extract(source_files)
+
+        assert serial, "expected the sample APIs to produce classes"
+        assert parallel == serial
+
+    def test_unsupported_files_are_skipped(self, tmp_path, quiet_config):
+        readme = tmp_path / "README.md"
+        readme.write_text("# not code")
+
+        results = list(ParallelASTExtractor(workers=2, config=quiet_config).iter_extract([str(readme)]))
+        assert results == []
+
+    def test_iter_extract_yields_input_order(self, source_files, quiet_config):
+        extractor = ParallelASTExtractor(workers=2, chunksize=2, config=quiet_config)
+        yielded_paths = [path for path, _ in extractor.iter_extract(source_files)]
+
+        expected = [p for p in source_files if extractor._supported(p)]
+        assert yielded_paths == expected
@@ -0,0 +1,119 @@
+"""
+Unit tests for job progress events and the SSE status stream.
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.services.job_queue import JobQueue
+from src.services.progress import ProgressTracker
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestProgressTracker:
+
+    def test_stage_transitions_are_published_with_history(self):
+        published = []
+        tracker = ProgressTracker(published.append, stages=["clone", "extract", "map"], min_interval=60)
+
+        tracker.start_stage("clone")
+        tracker.start_stage("extract", total=2)
+        tracker.advance()
+        tracker.advance()
+
+        assert [p["stage"] for p in published] == ["clone", "extract", "extract"]
+        last = published[-1]
+        assert last["stage_index"] == 1
+        assert (last["completed"], last["total"]) == (2, 2)
+        assert last["eta_seconds"] == 0
+        assert "clone" in last["history"]
+
+        final = tracker.finish()
+        assert set(final["history"]) == {"clone", "extract"}
+
+    def test_counter_updates_are_throttled(self):
+        published = []
+        tracker = ProgressTracker(published.append, min_interval=60)
+        tracker.start_stage("map", total=100)
+        for _ in range(50):
+            tracker.advance()
+
+        # Only the transition; the counters are published once the stage completes
+        assert len(published) == 1
+        tracker.update(100)
+        assert published[-1]["completed"] == 100
+
+    def test_eta_from_stage_rate(self):
+        tracker = ProgressTracker(lambda p: None)
+        tracker.start_stage("map", total=10)
+        tracker._stage_started -= 4.0
+        tracker.update(2)
+
+        assert 15.9 <= tracker.snapshot()["eta_seconds"] <= 16.5
+
+    def test_callback_accepts_component_progress(self):
+        published = []
+        tracker = ProgressTracker(published.append, min_interval=0)
+        tracker.start_stage("index")
+        tracker.callback()({"total_documents": 30, "batches": 3})
+        tracker.callback()({"completed": 5, "total": 8, "failed": 1})
+
+        assert published[-2]["completed"] == 30
+        assert (published[-1]["completed"], published[-1]["total"], published[-1]["failed"]) == (5, 8, 1)
+
+    def test_advance_is_thread_safe(self):
+        tracker = ProgressTracker(lambda p: None, min_interval=0)
+        tracker.start_stage("extract", total=400)
+        threads = [threading.Thread(target=lambda: [tracker.advance() for _ in range(100)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tracker.snapshot()["completed"] == 400
+
+
+class TestStatusStream:
+
+    def test_stream_emits_progress_then_terminal_event(self, tmp_path):
+        from src.api import main
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        job_id = queue.enqueue({"path": "repo"})
+        queue.claim("w")
+        queue.update(job_id, {"status": "processing", "progress": {"stage": "map", "completed": 1}}, worker_id="w")
+
+        real_get = queue.get
+        calls = []
+
+        def get(requested_id):
+            # The job finishes while the client is connected
+            calls.append(requested_id)
+            if len(calls) == 2:
+                queue.update(job_id, {"status": "completed", "results_file": "out.json"}, worker_id="w")
+            return real_get(requested_id)
+
+        with patch.object(main, "_job_queue", queue), patch.object(queue, "get", get), \
+                patch.object(main, "get_app_config") as get_config:
+            get_config.return_value.get = lambda key, default=None: 0.01 if key == "jobs.stream_interval" else default
+            client = TestClient(main.app)
+            response = client.get(f"/status/{job_id}/stream")
+
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = _events(response.text)
+            assert events[0] == ("progress", {"status": "processing", "progress": {"stage": "map", "completed": 1}})
+            assert events[-1] == ("completed", {"status": "completed", "results_file": "out.json"})
+            assert len(events) == 2
+
+            assert client.get("/status/unknown/stream").status_code == 404
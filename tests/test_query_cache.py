@@ -0,0 +1,92 @@
+"""
+Unit tests for the RAG query embedding and retrieval caches.
+"""
+
+from unittest.mock import Mock
+
+from haystack import Document
+
+from src.utils.query_cache import IndexVersion, LRUCache, CachedTextEmbedder, CachedRetriever
+
+
+def _retriever():
+    retriever = Mock()
+    retriever.top_k = 10
+    retriever.filters = None
+    retriever.run.side_effect = lambda query_embedding, **kwargs: {
+        "documents": [Document(content=f"hit for {query_embedding[0]}")]
+    }
+    return retriever
+
+
+class TestLRUCache:
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_hits_accumulate_saved_latency(self):
+        cache = LRUCache()
+        cache.put("a", 1, cost_seconds=0.25)
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 1
+        assert stats["saved_ms"] == 500
+
+
+class TestIndexVersion:
+
+    def test_bump_changes_version_seen_by_other_readers(self, tmp_path):
+        path = str(tmp_path / "index_version")
+        writer, reader = IndexVersion(path), IndexVersion(path)
+        assert reader.current() == ""
+
+        first = writer.bump()
+        assert reader.current() == first
+        second = writer.bump()
+        assert reader.current() == second != first
+
+
+class TestCachedComponents:
+
+    def test_repeated_query_is_embedded_once(self):
+        embedder = Mock()
+        embedder.run.return_value = {"embedding": [0.1, 0.2]}
+        cached = CachedTextEmbedder(embedder, LRUCache())
+
+        assert cached.run(text="how do I log in?")["embedding"] == [0.1, 0.2]
+        assert cached.run(text="how do I log in?")["embedding"] == [0.1, 0.2]
+        embedder.run.assert_called_once()
+
+    def test_retrieval_is_cached_until_index_changes(self, tmp_path):
+        version = IndexVersion(str(tmp_path / "index_version"))
+        retriever = _retriever()
+        cached = CachedRetriever(retriever, LRUCache(), version)
+
+        cached.run(query_embedding=[0.5, 0.1])
+        cached.run(query_embedding=[0.5, 0.1])
+        assert retriever.run.call_count == 1
+
+        version.bump()
+        cached.run(query_embedding=[0.5, 0.1])
+        assert retriever.run.call_count == 2
+
+    def test_top_k_and_filters_are_part_of_the_key(self, tmp_path):
+        retriever = _retriever()
+        cached = CachedRetriever(retriever, LRUCache(), IndexVersion(str(tmp_path / "v")))
+
+        cached.run(query_embedding=[0.5])
+        cached.run(query_embedding=[0.5], top_k=3)
+        cached.run(query_embedding=[0.5], filters={"field": "meta.type", "operator": "==", "value": "ast_method"})
+
+        assert retriever.run.call_count == 3
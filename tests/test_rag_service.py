@@ -0,0 +1,95 @@
+"""
+Unit tests for RAGService query pipeline reuse.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.config import settings
+from src.pipelines.rag import RAGService
+
+
+def _service():
+    # Only the document store connection is stubbed and Phoenix tracing is off;
+    # the query pipeline is patched per test
+    with patch.dict(settings.config, {"PHOENIX_ENABLED": False}), \
+            patch("src.pipelines.rag.get_document_store", return_value=Mock()):
+        return RAGService()
+
+
+@pytest.fixture
+def service():
+    RAGService.reset_query_pipeline()
+    yield _service()
+    RAGService.reset_query_pipeline()
+
+
+def _fake_pipeline():
+    pipeline = Mock()
+    pipeline.run.side_effect = lambda data: {"generator": {"replies": [f"answer to {data['text_embedder']['text']}"]}}
+    return pipeline
+
+
+class TestQueryPipelineReuse:
+
+    def test_pipeline_is_built_and_warmed_once(self, service):
+        pipeline = _fake_pipeline()
+        with patch.object(RAGService, "_build_query_pipeline", return_value=pipeline) as build:
+            assert service.search_and_generate("q1") == "answer to q1"
+            assert service.search_and_generate("q2") == "answer to q2"
+
+        build.assert_called_once()
+        pipeline.warm_up.assert_called_once()
+        assert pipeline.run.call_count == 2
+
+    def test_pipeline_is_shared_across_instances(self, service):
+        other = _service()
+        with patch.object(RAGService, "_build_query_pipeline", return_value=_fake_pipeline()) as build:
+            assert service.get_query_pipeline() is other.get_query_pipeline()
+        build.assert_called_once()
+
+    def test_concurrent_first_queries_build_once(self, service):
+        def slow_build(self):
+            time.sleep(0.05)
+            return _fake_pipeline()
+
+        answers = []
+        with patch.object(RAGService, "_build_query_pipeline", slow_build):
+            threads = [
+                threading.Thread(target=lambda i=i: answers.append(service.search_and_generate(f"q{i}")))
+                for i in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert len(RAGService._query_pipelines) == 1
+        assert sorted(answers) == sorted(f"answer to q{i}" for i in range(8))
+
+    def test_reset_forces_rebuild(self, service):
+        with patch.object(RAGService, "_build_query_pipeline", side_effect=lambda: _fake_pipeline()) as build:
+            first = service.get_query_pipeline()
+            RAGService.reset_query_pipeline()
+            second = service.get_query_pipeline()
+
+        assert first is not second
+        assert build.call_count == 2
+
+
+class TestResetKnowledgeBase:
+
+    def test_reset_is_disabled_by_default(self, service):
+        rag = {k: v for k, v in settings.config["rag"].items() if k != "allow_reset"}
+        with patch.dict(settings.config, {"rag": rag}):
+            assert service.reset_knowledge_base() == 0
+        service.document_store.delete_all_documents.assert_not_called()
+
+    def test_reset_when_allowed(self, service):
+        service.document_store.count_documents.return_value = 3
+        with patch.dict(settings.config["rag"], {"allow_reset": True}):
+            assert service.reset_knowledge_base() == 3
+        service.document_store.delete_all_documents.assert_called_once_with(recreate_index=True)
@@ -0,0 +1,147 @@
+"""
+Unit tests for request coalescing and the result cache.
+"""
+
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.core.config import AppConfig
+from src.services.job_queue import JobQueue
+from src.services.result_cache import ResultCache, request_key, result_cache_from_config
+
+
+def _config(tmp_path, **values):
+    path = tmp_path / "config.yaml"
+    path.write_text(json.dumps(values))
+    return AppConfig(str(path))
+
+
+class TestRequestKey:
+
+    def test_local_key_follows_content_and_config(self, tmp_path):
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "App.java").write_text("class App {}")
+        config = _config(tmp_path, jobs={"workers": 2}, code_mapper={"batch_max_classes": 8})
+
+        key, _ = request_key("local", str(source), None, None, config)
+        assert request_key("local", str(source), None, None, config)[0] == key
+
+        # Runtime-only settings do not change what a job produces
+        assert request_key("local", str(source), None, None, _config(tmp_path, jobs={"workers": 8},
+                           code_mapper={"batch_max_classes": 8}))[0] == key
+        assert request_key("local", str(source), None, None, _config(tmp_path, jobs={"workers": 2},
+                           code_mapper={"batch_max_classes": 1}))[0] != key
+
+        (source / "App.java").write_text("class App { void run() {} }")
+        assert request_key("local", str(source), None, None, config)[0] != key
+
+    def test_git_key_uses_remote_head_without_credentials(self, tmp_path):
+        config = _config(tmp_path)
+        handler = MagicMock()
+        handler.resolve_remote_head.return_value = "abc123"
+
+        key, revision = request_key("git", "https://host/repo.git", "token", None, config, handler)
+        assert revision == "abc123"
+        handler.resolve_remote_head.assert_called_once_with("https://host/repo.git", "token", None)
+        assert request_key("git", "https://host/repo.git", "other", None, config, handler)[0] == key
+        assert request_key("git", "https://host/repo.git", None, "base", config, handler)[0] != key
+
+    def test_unresolvable_sources_are_not_coalesced(self, tmp_path):
+        config = _config(tmp_path)
+        handler = MagicMock()
+        handler.resolve_remote_head.side_effect = RuntimeError("offline")
+
+        assert request_key("git", "https://host/repo.git", None, None, config, handler) is None
+        assert request_key("local", str(tmp_path / "missing"), None, None, config) is None
+
+
+class TestCoalescing:
+
+    def test_identical_jobs_attach_until_finished(self, tmp_path):
+        path = str(tmp_path / "jobs.sqlite3")
+        first = JobQueue(path).enqueue({"path": "a"}, dedup_key="k")
+
+        queue = JobQueue(path)
+        assert queue.enqueue({"path": "a"}, dedup_key="k") == first
+        queue.claim("w")
+        assert queue.enqueue({"path": "a"}, dedup_key="k") == first
+
+        queue.update(first, {"status": "completed"}, worker_id="w")
+        assert queue.enqueue({"path": "a"}, dedup_key="k") != first
+
+    def test_concurrent_insert_attaches_to_winner(self, tmp_path):
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        winner = queue.enqueue({"path": "a"}, dedup_key="k")
+
+        # The other process inserted between our lookup and our insert
+        lookups = iter([None, winner])
+        with patch.object(queue, "_active_job", lambda key: next(lookups)):
+            assert queue.enqueue({"path": "a"}, dedup_key="k") == winner
+        assert queue.stats()["queued"] == 1
+
+
+class TestResultCache:
+
+    def test_put_get_and_expiry(self, tmp_path):
+        output = tmp_path / "mapped_ast.json"
+        cache = ResultCache(str(tmp_path / "results"), retention_seconds=60)
+
+        assert cache.get("k") is None
+        cache.put("k", {"status": "completed", "results_file": str(output)}, {"App": {}})
+        # Another job overwriting the shared output file does not affect the cache
+        output.write_text('{"Other": {}}')
+
+        cached = cache.get("k")
+        assert cached["status"] == "completed"
+        with open(cached["results_file"]) as f:
+            assert json.load(f) == {"App": {}}
+
+        cache.retention_seconds = 0.01
+        time.sleep(0.02)
+        assert cache.get("k") is None
+        assert cache.prune() == 0
+        assert not os.path.exists(os.path.join(cache.path, "k"))
+
+    def test_disabled_cache_stores_nothing(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "results"), retention_seconds=0)
+
+        assert cache.put("k", {"status": "completed"}, {}) is None
+        assert not os.path.exists(cache.path)
+
+
+class TestApi:
+
+    def test_identical_requests_share_a_job_then_hit_the_cache(self, tmp_path):
+        from src.api import main
+
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "App.java").write_text("class App {}")
+        config = _config(tmp_path, jobs={"result_cache_path": str(tmp_path / "results")})
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+        body = {"source_type": "local", "path": str(source)}
+
+        with patch.object(main, "_job_queue", queue), patch.object(main, "get_app_config", return_value=config):
+            client = TestClient(main.app)
+            first = client.post("/generate", json=body).json()
+            second = client.post("/generate", json=body).json()
+            assert first["status"] == "queued"
+            assert second == {**second, "job_id": first["job_id"], "status": "coalesced"}
+
+            # The worker finishes and caches the result
+            job = queue.claim("w")
+            status = {"status": "completed", "results_file": str(tmp_path / "mapped_ast.json")}
+            result_cache_from_config(config).put(job["payload"]["dedup_key"], status, {})
+            queue.update(job["id"], status, worker_id="w")
+
+            third = client.post("/generate", json=body).json()
+            assert third["status"] == "completed"
+            assert third["job_id"] != first["job_id"]
+            cached = client.get(f"/status/{third['job_id']}").json()
+            assert cached["cached"] is True
+            assert cached["results_file"].startswith(str(tmp_path / "results"))
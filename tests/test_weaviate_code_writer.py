@@ -0,0 +1,268 @@
+"""
+Unit tests for WeaviateCodeWriter batching.
+"""
+
+import json
+import pytest
+import yaml
+from unittest.mock import Mock, patch
+
+from haystack import Document
+
+from src.components.WeaviateCodeWriter import WeaviateCodeWriter
+from src.core.config import AppConfig
+from src.utils.embedding_cache import CachedDocumentEmbedder
+
+
+def _write_inputs(tmp_path, methods_per_file=3, files=2):
+    ast_folder = tmp_path / "ast"
+    ast_folder.mkdir()
+    for f in range(files):
+        data = [{
+            "class_name": f"Class{f}",
+            "class_type": "Service",
+            "base_path": "/",
+            "methods": [
+                {"method_name": f"m{i}", "class_name": f"Class{f}", "is_api_route": False,
+                 "method_definition": f"m{i}() {{}}"}
+                for i in range(methods_per_file)
+            ]
+        }]
+        (ast_folder / f"file{f}.java.json").write_text(json.dumps(data))
+
+    mapped = {"Class0": {"methods": [{"method": "m0", "dependencies": ["x.y"]}]}}
+    mapped_path = tmp_path / "mapped_ast.json"
+    mapped_path.write_text(json.dumps(mapped))
+    return str(ast_folder), str(mapped_path)
+
+
+class FakeStore:
+    """Dict-backed stand-in for the Weaviate store (filters are ignored); records write batches."""
+
+    def __init__(self):
+        self.docs = {}
+        self.batches = []
+
+    def filter_documents(self, filters=None):
+        return list(self.docs.values())
+
+    def write_documents(self, documents, policy=None):
+        self.batches.append(len(documents))
+        for doc in documents:
+            self.docs[doc.id] = doc
+        return len(documents)
+
+    def delete_documents(self, document_ids):
+        for doc_id in document_ids:
+            self.docs.pop(doc_id, None)
+
+
+def _writer(tmp_path, batch_size, store=None, embedding=None, cache=None, **settings):
+    """Build a writer over the given store with a stub embedding model (no embedding cache unless given)."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"rag": {"embedding_cache": cache or {"enabled": False}}}))
+    embedder = Mock(spec=["run", "warm_up"])
+    embedder.run.side_effect = lambda documents: {
+        "documents": documents if embedding is None else [
+            Document(id=d.id, content=d.content, meta=d.meta, embedding=embedding) for d in documents
+        ]
+    }
+    module = "src.components.WeaviateCodeWriter"
+    with patch(f"{module}.get_document_store", return_value=store or FakeStore()), \
+            patch(f"{module}.SentenceTransformersDocumentEmbedder", return_value=embedder):
+        return WeaviateCodeWriter(
+            batch_size=batch_size,
+            index_version_path=str(tmp_path / "index_version"),
+            config=AppConfig(str(config_path)),
+            **settings
+        )
+
+
+class TestStreamingWrite:
+
+    def test_documents_are_written_in_batches(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        writer = _writer(tmp_path, batch_size=2)
+        progress = []
+
+        result = writer.run(ast_folder, mapped_path, progress_callback=progress.append)
+
+        assert result == {
+            "ast_documents_written": 6, "mapper_documents_written": 1, "total_documents": 7,
+            "documents_unchanged": 0, "documents_deleted": 0
+        }
+        assert writer.document_store.batches == [2, 2, 2, 1]
+        assert [p["batches"] for p in progress] == [1, 2, 3, 4]
+
+    def test_interrupted_run_keeps_completed_batches(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        writer = _writer(tmp_path, batch_size=3)
+        calls = {"n": 0}
+
+        def embed(documents):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise KeyboardInterrupt
+            return {"documents": documents}
+
+        writer.embedder.run.side_effect = embed
+
+        with pytest.raises(KeyboardInterrupt):
+            writer.run(ast_folder, mapped_path)
+
+        assert len(writer.document_store.batches) == 1
+
+    def test_empty_inputs_write_nothing(self, tmp_path):
+        writer = _writer(tmp_path, batch_size=2)
+        result = writer.run(str(tmp_path / "missing"), str(tmp_path / "missing.json"))
+
+        assert result["total_documents"] == 0
+        assert writer.document_store.batches == []
+
+
+class TestEmbeddingCacheConfig:
+
+    def test_cache_follows_config(self, tmp_path):
+        cached = _writer(tmp_path, batch_size=10, cache={"enabled": True, "path": str(tmp_path / "embeddings")})
+        assert isinstance(cached.embedder, CachedDocumentEmbedder)
+        assert cached.embedder.cache.cache_dir.startswith(str(tmp_path / "embeddings"))
+
+        uncached = _writer(tmp_path, batch_size=10, cache={"enabled": False})
+        assert not isinstance(uncached.embedder, CachedDocumentEmbedder)
+
+
+class TestIncrementalSync:
+
+    def test_document_ids_are_stable_across_runs(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        first, second = _writer(tmp_path, batch_size=10), _writer(tmp_path, batch_size=10)
+        first.run(ast_folder, mapped_path, repo="repo-a")
+        second.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert set(first.document_store.docs) == set(second.document_store.docs)
+        assert len(first.document_store.docs) == 7
+
+    def test_unchanged_documents_are_not_rewritten(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = FakeStore()
+        _writer(tmp_path, batch_size=10, store=store).run(ast_folder, mapped_path, repo="repo-a")
+
+        writer = _writer(tmp_path, batch_size=10, store=store)
+        result = writer.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert result["total_documents"] == 0
+        assert result["documents_unchanged"] == 7
+        writer.embedder.run.assert_not_called()
+
+    def test_changing_the_embedding_model_rewrites_everything(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = FakeStore()
+        _writer(tmp_path, batch_size=10, store=store).run(ast_folder, mapped_path, repo="repo-a")
+
+        writer = _writer(tmp_path, batch_size=10, store=store, embedding_model="other-model")
+        result = writer.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert result["total_documents"] == 7
+        assert result["documents_unchanged"] == 0
+        assert {d.meta["embedding_model"] for d in store.docs.values()} == {"other-model"}
+
+    def test_changed_documents_are_upserted_and_vanished_deleted(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = FakeStore()
+        _writer(tmp_path, batch_size=10, store=store).run(ast_folder, mapped_path, repo="repo-a")
+
+        # Change one method and drop another from Class1
+        path = tmp_path / "ast" / "file1.java.json"
+        data = json.loads(path.read_text())
+        data[0]["methods"][0]["method_definition"] = "m0() { return 1; }"
+        del data[0]["methods"][2]
+        path.write_text(json.dumps(data))
+
+        writer = _writer(tmp_path, batch_size=10, store=store)
+        result = writer.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert result["total_documents"] == 1
+        assert result["documents_unchanged"] == 5
+        assert result["documents_deleted"] == 1
+        assert len(store.docs) == 6
+        definitions = {d.meta.get("method_definition") for d in store.docs.values()}
+        assert "m0() { return 1; }" in definitions
+        assert "m2() {}" in definitions  # Class0.m2 is untouched
+
+    def test_overloads_get_distinct_ids(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path, methods_per_file=1, files=1)
+        path = tmp_path / "ast" / "file0.java.json"
+        data = json.loads(path.read_text())
+        overload = dict(data[0]["methods"][0], method_definition="m0(int x) {}")
+        data[0]["methods"].append(overload)
+        path.write_text(json.dumps(data))
+
+        writer = _writer(tmp_path, batch_size=10)
+        writer.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert len(writer.document_store.docs) == 3
+
+    def test_unreadable_store_rewrites_without_deleting(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = Mock()
+        store.filter_documents.side_effect = RuntimeError("weaviate down")
+        writer = _writer(tmp_path, batch_size=10, store=store)
+
+        result = writer.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert result["total_documents"] == 7
+        store.delete_documents.assert_not_called()
+
+    def test_index_version_is_bumped_only_when_something_changed(self, tmp_path):
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = FakeStore()
+        first = _writer(tmp_path, batch_size=10, store=store)
+        first.run(ast_folder, mapped_path, repo="repo-a")
+        version = first.index_version.current()
+        second = _writer(tmp_path, batch_size=10, store=store)
+        second.run(ast_folder, mapped_path, repo="repo-a")
+
+        assert version != ""
+        assert second.index_version.current() == version
+
+    def test_sync_against_local_document_store(self, tmp_path):
+        from src.utils.local_document_store import LocalDocumentStore
+
+        ast_folder, mapped_path = _write_inputs(tmp_path)
+        store = LocalDocumentStore(str(tmp_path / "store"))
+
+        def writer():
+            return _writer(tmp_path, batch_size=4, store=store, embedding=[1.0, 0.0])
+
+        writer().run(ast_folder, mapped_path, repo="repo-a")
+        writer().run(ast_folder, mapped_path, repo="repo-b")
+        result = writer().run(ast_folder, mapped_path, repo="repo-a")
+
+        assert result["documents_unchanged"] == 7
+        assert store.count_documents() == 14
+
+
+class TestFetchContentHashes:
+
+    def test_weaviate_walks_the_cursor_without_vectors(self):
+        from types import SimpleNamespace
+        from unittest.mock import PropertyMock
+        from haystack_integrations.document_stores.weaviate import WeaviateDocumentStore
+        from src.utils.weaviate_utils import fetch_content_hashes
+
+        def obj(doc_id, repo, doc_type):
+            return SimpleNamespace(properties={
+                "_original_id": doc_id, "content_hash": f"h-{doc_id}", "repo": repo, "type": doc_type
+            })
+
+        collection = Mock()
+        collection.iterator.return_value = iter([
+            obj("a", "repo-a", "ast_method"), obj("b", "repo-b", "ast_method"), obj("c", "repo-a", "other")
+        ])
+        store = WeaviateDocumentStore(url="http://127.0.0.1:1")
+        with patch.object(WeaviateDocumentStore, "collection", new_callable=PropertyMock, return_value=collection):
+            result = fetch_content_hashes(store, "repo-a", ["ast_method"])
+
+        assert result == {"a": "h-a"}
+        assert collection.iterator.call_args.kwargs["include_vector"] is False
+        collection.query.fetch_objects.assert_not_called()
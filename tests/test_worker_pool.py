@@ -0,0 +1,71 @@
+"""
+Integration test: a real job run by the worker processes of a WorkerPool.
+"""
+
+import json
+import time
+
+import yaml
+
+from src.core.config import AppConfig
+from src.services.job_queue import JobQueue, TERMINAL_STATUSES
+from src.services.worker_pool import WorkerPool
+
+
+def _wait_for(queue: JobQueue, job_id: str, timeout: float = 60.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.get(job_id)
+        if status and status.get("status") in TERMINAL_STATUSES:
+            return status
+        time.sleep(0.2)
+    raise AssertionError(f"Job {job_id} did not finish: {queue.get(job_id)}")
+
+
+class TestWorkerPool:
+
+    def test_job_runs_with_parallel_extraction(self, tmp_path, monkeypatch):
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "a.py").write_text("class A:\n    def run(self):\n        return 1\n")
+        (source / "b.py").write_text("class B:\n    def run(self):\n        return 2\n")
+
+        # Workers read config.yaml from their working directory
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "config.yaml").write_text(yaml.safe_dump({
+            "PHOENIX_ENABLED": False,
+            "save_ast": False,
+            "extraction": {"workers": 2, "chunksize": 1},
+            "code_mapper": {
+                "static_analysis": True,
+                "active_generator": "ollama",
+                "generators": {"ollama": {"url": "http://127.0.0.1:11434", "model": "stub"}}
+            },
+            "jobs": {
+                "path": str(tmp_path / "jobs.sqlite3"),
+                "output_dir": str(tmp_path / "outputs"),
+                "poll_interval": 0.1
+            }
+        }))
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "c.py").write_text("class C:\n    def run(self):\n        return 3\n")
+        pool = WorkerPool(workers=2, config=AppConfig(str(tmp_path / "config.yaml")))
+        pool.start()
+        try:
+            pool.queue.enqueue({"source_type": "local", "path": str(source)}, job_id="job-1")
+            pool.queue.enqueue({"source_type": "local", "path": str(other)}, job_id="job-2")
+            status = _wait_for(pool.queue, "job-1")
+            other_status = _wait_for(pool.queue, "job-2")
+        finally:
+            pool.stop()
+
+        assert status["status"] == "completed", status.get("error")
+        assert other_status["status"] == "completed", other_status.get("error")
+        # Every job has its own mapping file
+        assert status["results_file"] == str(tmp_path / "outputs" / "job-1.json")
+        with open(status["results_file"]) as f:
+            assert set(json.load(f)) == {"A", "B"}
+        with open(other_status["results_file"]) as f:
+            assert set(json.load(f)) == {"C"}
+        assert pool.alive() == 0